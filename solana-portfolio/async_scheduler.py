@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+asyncio scheduler for wallet jobs with a token-bucket rate limit per host
+
+The existing (blocking) fetch functions run on a thread pool; the event loop
+only decides when each job may start so every service is hit at a polite rate.
+"""
+
+import asyncio
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from browser_setup import create_driver
+from fetch_retry import make_error_row, fetch_with_retry
+
+# Requests per second and burst size for each service we talk to
+HOST_RATE_LIMITS = {
+    'jup.ag': (0.5, 2),
+    'api.mainnet-beta.solana.com': (2.0, 5),
+    'data.solanatracker.io': (1.0, 2),
+}
+DEFAULT_RATE_LIMIT = (1.0, 1)
+
+# Random extra delay (seconds) so jobs don't fire in lockstep
+DEFAULT_JITTER = 0.5
+
+class TokenBucket:
+    """
+    Token bucket: refills `rate` tokens per second up to `capacity`
+    """
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """
+        Wait until a token is available and take it
+        """
+        async with self.lock:
+            self.refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self.refill()
+            self.tokens -= 1
+
+def host_of(target):
+    """
+    Get the host from a URL or pass a bare host name through
+    """
+    if '://' in target:
+        return urlparse(target).hostname
+    return target
+
+def make_buckets(rate_limits):
+    """
+    One token bucket per host
+    """
+    return {host: TokenBucket(rate, capacity) for host, (rate, capacity) in rate_limits.items()}
+
+async def run_jobs_async(jobs, max_concurrency=4, rate_limits=None, jitter=DEFAULT_JITTER,
+                         executor=None):
+    """
+    Run blocking jobs under per-host rate limits and bounded concurrency
+
+    Each job is a dict with 'host' (host name or URL), 'function' and 'args'.
+    Returns the function results in job order; an exception becomes the
+    result for that job so one failure doesn't cancel the rest.
+    """
+    rate_limits = rate_limits or HOST_RATE_LIMITS
+    buckets = make_buckets(rate_limits)
+    semaphore = asyncio.Semaphore(max_concurrency)
+    loop = asyncio.get_running_loop()
+
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=max_concurrency)
+
+    def bucket_for(host):
+        if host not in buckets:
+            buckets[host] = TokenBucket(*DEFAULT_RATE_LIMIT)
+        return buckets[host]
+
+    async def run_one(job):
+        async with semaphore:
+            await bucket_for(host_of(job['host'])).acquire()
+            if jitter:
+                await asyncio.sleep(random.uniform(0, jitter))
+            try:
+                return await loop.run_in_executor(executor, job['function'], *job.get('args', ()))
+            except Exception as e:
+                return e
+
+    try:
+        return await asyncio.gather(*(run_one(job) for job in jobs))
+    finally:
+        if own_executor:
+            executor.shutdown(wait=True)
+
+def run_rate_limited_jobs(jobs, max_concurrency=4, rate_limits=None, jitter=DEFAULT_JITTER):
+    """
+    Blocking wrapper around run_jobs_async (e.g. for Solana RPC calls)
+    """
+    return asyncio.run(run_jobs_async(jobs, max_concurrency, rate_limits, jitter))
+
+def track_wallets_async(wallet_addresses, fetch_function, max_concurrency=2, driver_settings=None,
+                        error_columns=(), rate_limits=None, jitter=DEFAULT_JITTER):
+    """
+    Fetch wallets from jup.ag through the async scheduler
+
+    Every executor thread gets its own Chrome driver (drivers are not
+    shared between threads). Results come back in input order.
+    """
+    driver_settings = driver_settings or {}
+    thread_state = threading.local()
+    drivers = []
+    drivers_lock = threading.Lock()
+
+    def fetch_with_thread_driver(wallet_address):
+        if getattr(thread_state, 'driver', None) is None:
+            thread_state.driver = create_driver(**driver_settings)
+            with drivers_lock:
+                drivers.append(thread_state.driver)
+
+        row, driver = fetch_with_retry(fetch_function, wallet_address, thread_state.driver, driver_settings)
+        if driver is not thread_state.driver:
+            thread_state.driver = driver
+            with drivers_lock:
+                drivers.append(driver)
+        return row
+
+    jobs = [
+        {'host': 'jup.ag', 'function': fetch_with_thread_driver, 'args': (wallet,)}
+        for wallet in wallet_addresses
+    ]
+
+    print(f"⏱️ Scheduling {len(jobs)} wallets (concurrency {max_concurrency}, "
+          f"jup.ag limit {(rate_limits or HOST_RATE_LIMITS)['jup.ag'][0]}/s)...")
+
+    start_time = time.time()
+    try:
+        results = asyncio.run(run_jobs_async(jobs, max_concurrency, rate_limits, jitter))
+    finally:
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    rows = []
+    for wallet, result in zip(wallet_addresses, results):
+        if isinstance(result, Exception):
+            rows.append(make_error_row(wallet, result, error_columns))
+        else:
+            rows.append(result)
+
+    elapsed = time.time() - start_time
+    print(f"✅ {len(rows)} wallets in {elapsed:.1f}s ({len(rows) / max(elapsed, 1e-9) * 60:.1f} wallets/min)")
+    return rows
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Long-lived browser daemon that keeps warm Chrome drivers for wallet fetches
+
+Start it once:
+    python solana-portfolio/browser_daemon.py --drivers 3
+
+Then the trackers and the dashboard can send wallet jobs to it instead of
+starting a new Chrome every run.
+"""
+
+import argparse
+import collections
+import os
+import queue
+import secrets
+import tempfile
+import threading
+import time
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import AuthenticationError
+from multiprocessing.connection import Listener, Client
+
+from browser_setup import create_driver, driver_is_alive
+from driver_recycling import DriverRecycler, export_memory_samples
+from fetch_retry import make_error_row
+
+DAEMON_ADDRESS = ('localhost', 6071)
+
+# Connections are pickled, so only holders of this per-install key may talk to the daemon
+# (BROWSER_DAEMON_AUTHKEY overrides the key file)
+DAEMON_KEY_PATH = os.environ.get(
+    'BROWSER_DAEMON_KEY_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'browser_daemon.key')
+)
+
+# Seconds a job waits for a free driver before the client gets an error
+DRIVER_WAIT_TIMEOUT = 600
+
+# Memory samples kept for --memory-log (the daemon runs for days)
+MEMORY_LOG_MAX_SAMPLES = 100_000
+
+# Extra Chrome flags for daemon drivers (same as the popup tracker)
+CHROME_ARGUMENTS = ["--disable-blink-features=AutomationControlled"]
+
+def daemon_authkey(key_path=None):
+    """
+    The shared secret of daemon and clients, created on first use (file mode 0600)
+    """
+    key_path = key_path or DAEMON_KEY_PATH
+    if os.environ.get('BROWSER_DAEMON_AUTHKEY'):
+        return os.environ['BROWSER_DAEMON_AUTHKEY'].encode()
+
+    if not os.path.exists(key_path):
+        # Write to a private temp file and link it in: concurrent first runs agree on one key
+        descriptor, temp_path = tempfile.mkstemp(dir=os.path.dirname(key_path), prefix='.daemon_key_')
+        try:
+            with os.fdopen(descriptor, 'w') as f:
+                f.write(secrets.token_hex(32))
+            os.link(temp_path, key_path)
+        except FileExistsError:
+            pass
+        finally:
+            os.remove(temp_path)
+
+    with open(key_path) as f:
+        return f.read().strip().encode()
+
+def start_daemon_driver():
+    return create_driver(CHROME_ARGUMENTS, performance_logging=True, block_resources=True,
+                         persistent_profile=True)
+
+def load_fetch_function(mode):
+    """
+    Look up the fetch function for a job mode
+
+    Imports are done lazily so the daemon only loads what it needs
+    (the dashboard module pulls in streamlit).
+    """
+    if mode == 'basic':
+        from multi_wallet_tracker import get_single_wallet_data
+        return get_single_wallet_data
+    if mode == 'detailed':
+        from enhanced_wallet_tracker import get_detailed_wallet_data
+        return get_detailed_wallet_data
+    if mode == 'script':
+        from enhanced_wallet_tracker import get_detailed_wallet_data
+        return partial(get_detailed_wallet_data, extraction_mode='script')
+    if mode == 'periods':
+        from enhanced_wallet_tracker import get_detailed_wallet_data
+        return partial(get_detailed_wallet_data, extraction_mode='script', all_periods=True)
+    if mode == 'network':
+        from network_capture import get_network_wallet_data
+        return get_network_wallet_data
+    if mode == 'dashboard':
+        from portfolio_dashboard import get_wallet_data
+        return get_wallet_data
+    if mode == 'dashboard_script':
+        from portfolio_dashboard import get_wallet_data
+        return partial(get_wallet_data, extraction_mode='script')
+    raise ValueError(f"Unknown job mode: {mode}")
+
+def run_daemon(driver_count=2, address=DAEMON_ADDRESS, authkey=None, memory_log_path=None):
+    """
+    Start warm drivers and serve wallet jobs until a shutdown request
+
+    Drivers are recycled when they grow too big (see driver_recycling.py);
+    memory_log_path saves all drivers' RSS over time as CSV at shutdown.
+    """
+    authkey = authkey or daemon_authkey()
+    print(f"🔥 Starting {driver_count} warm Chrome drivers...")
+
+    # One slot per driver; a slot whose driver is None has to (re)start Chrome
+    idle_slots = queue.Queue()
+    running_drivers = set()
+    drivers_lock = threading.Lock()
+
+    def start_driver():
+        driver = start_daemon_driver()
+        with drivers_lock:
+            running_drivers.add(driver)
+        return driver
+
+    def quit_driver(driver):
+        with drivers_lock:
+            running_drivers.discard(driver)
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+    for number in range(driver_count):
+        idle_slots.put({
+            'driver': start_driver(),
+            'recycler': DriverRecycler(start_driver=start_driver, worker=f"daemon-{number}"),
+        })
+
+    stats_lock = threading.Lock()
+    stats = {
+        'started': time.time(),
+        'drivers': driver_count,
+        'busy_drivers': 0,
+        'busy_seconds': 0.0,
+        'jobs_completed': 0,
+        'jobs_failed': 0,
+        'drivers_replaced': 0,
+        'drivers_recycled': 0,
+        'peak_rss_mb': None,
+    }
+    memory_samples = collections.deque(maxlen=MEMORY_LOG_MAX_SAMPLES)
+    stop_event = threading.Event()
+
+    def recycle_if_needed(slot, driver):
+        """
+        Replace a driver that grew too big, recording its memory sample
+        """
+        recycler = slot['recycler']
+        try:
+            new_driver = recycler.check(driver)
+        except Exception as e:
+            # The old driver is gone; the dead driver check below starts a new one
+            print(f"⚠️ Could not recycle a driver: {e}")
+            new_driver = driver
+        samples = recycler.take_samples()
+
+        with stats_lock:
+            for sample in samples:
+                if sample['rss_mb'] is not None and (stats['peak_rss_mb'] is None
+                                                     or sample['rss_mb'] > stats['peak_rss_mb']):
+                    stats['peak_rss_mb'] = sample['rss_mb']
+            if new_driver is not driver:
+                stats['drivers_recycled'] += 1
+            memory_samples.extend(samples)
+
+        if new_driver is not driver:
+            with drivers_lock:
+                running_drivers.discard(driver)
+        return new_driver
+
+    def run_job(request):
+        """
+        Check out a driver, run one wallet fetch and return the driver
+        """
+        mode = request.get('mode', 'basic')
+        fetch_function = load_fetch_function(mode)
+        # The client's cache freshness (network fetches aren't cached)
+        if request.get('max_age') is not None and mode != 'network':
+            fetch_function = partial(fetch_function, max_age=request['max_age'])
+        try:
+            slot = idle_slots.get(timeout=DRIVER_WAIT_TIMEOUT)
+        except queue.Empty:
+            raise RuntimeError(f"no free driver within {DRIVER_WAIT_TIMEOUT}s")
+        start_time = time.time()
+
+        with stats_lock:
+            stats['busy_drivers'] += 1
+
+        driver = slot['driver']
+        try:
+            if driver is None:
+                driver = start_driver()
+                with stats_lock:
+                    stats['drivers_replaced'] += 1
+            result = fetch_function(request['wallet'], driver)
+            # Cache hits didn't load a page
+            if result.get('cache') != 'hit' and driver_is_alive(driver):
+                driver = recycle_if_needed(slot, driver)
+        finally:
+            # A crashed browser gets replaced before the next job uses it
+            if driver is not None and not driver_is_alive(driver):
+                quit_driver(driver)
+                try:
+                    driver = start_driver()
+                    with stats_lock:
+                        stats['drivers_replaced'] += 1
+                except Exception as e:
+                    # Keep the slot; the next job tries to start Chrome again
+                    print(f"⚠️ Could not replace a dead driver: {e}")
+                    driver = None
+            slot['driver'] = driver
+            idle_slots.put(slot)
+
+            with stats_lock:
+                stats['busy_drivers'] -= 1
+                stats['busy_seconds'] += time.time() - start_time
+
+        with stats_lock:
+            if str(result.get('status', '')).startswith('error'):
+                stats['jobs_failed'] += 1
+            else:
+                stats['jobs_completed'] += 1
+
+        return result
+
+    def current_stats():
+        """
+        Snapshot of health and utilisation numbers
+        """
+        with stats_lock:
+            uptime = time.time() - stats['started']
+            return {
+                'uptime_seconds': round(uptime, 1),
+                'drivers': stats['drivers'],
+                'busy_drivers': stats['busy_drivers'],
+                'idle_drivers': stats['drivers'] - stats['busy_drivers'],
+                'jobs_completed': stats['jobs_completed'],
+                'jobs_failed': stats['jobs_failed'],
+                'drivers_replaced': stats['drivers_replaced'],
+                'drivers_recycled': stats['drivers_recycled'],
+                'peak_rss_mb': stats['peak_rss_mb'],
+                'utilisation': round(stats['busy_seconds'] / max(uptime * stats['drivers'], 1e-9), 3),
+            }
+
+    def handle_connection(conn):
+        """
+        Answer requests from one client until it disconnects
+        """
+        try:
+            while True:
+                request = conn.recv()
+                action = request.get('action')
+
+                if action == 'fetch':
+                    try:
+                        conn.send({'ok': True, 'result': run_job(request)})
+                    except Exception as e:
+                        conn.send({'ok': False, 'error': str(e)})
+                elif action == 'health':
+                    conn.send({'ok': True, 'status': 'running'})
+                elif action == 'stats':
+                    conn.send({'ok': True, 'stats': current_stats()})
+                elif action == 'shutdown':
+                    conn.send({'ok': True})
+                    stop_event.set()
+                    break
+                else:
+                    conn.send({'ok': False, 'error': f"Unknown action: {action}"})
+        except EOFError:
+            pass
+        finally:
+            conn.close()
+
+    listener = Listener(address, authkey=authkey)
+    print(f"✅ Browser daemon listening on {address[0]}:{address[1]}")
+
+    def accept_loop():
+        while not stop_event.is_set():
+            try:
+                conn = listener.accept()
+            except AuthenticationError:
+                # A client without the key: refuse it and keep serving
+                print("⚠️ Rejected a connection with a wrong authkey")
+                continue
+            except OSError:
+                break
+            if stop_event.is_set():
+                conn.close()
+                break
+            threading.Thread(target=handle_connection, args=(conn,), daemon=True).start()
+
+    threading.Thread(target=accept_loop, daemon=True).start()
+
+    try:
+        while not stop_event.is_set():
+            stop_event.wait(1)
+    except KeyboardInterrupt:
+        print("\n🛑 Stopping browser daemon...")
+    finally:
+        listener.close()
+        # Busy drivers too: their jobs fail, but no Chrome is left behind
+        with drivers_lock:
+            drivers = list(running_drivers)
+        for driver in drivers:
+            quit_driver(driver)
+
+        if memory_log_path:
+            export_memory_samples(list(memory_samples), memory_log_path)
+
+    print(f"📊 Final stats: {current_stats()}")
+
+def send_request(request, address=DAEMON_ADDRESS, authkey=None):
+    """
+    Send one request to the daemon and return its reply
+    """
+    with Client(address, authkey=authkey or daemon_authkey()) as conn:
+        conn.send(request)
+        return conn.recv()
+
+def daemon_available(address=DAEMON_ADDRESS):
+    """
+    Check if a browser daemon is running
+    """
+    try:
+        return send_request({'action': 'health'}, address)['ok']
+    except (OSError, EOFError, AuthenticationError):
+        return False
+
+def get_daemon_stats(address=DAEMON_ADDRESS):
+    """
+    Get health and utilisation stats from the daemon
+    """
+    return send_request({'action': 'stats'}, address)['stats']
+
+def submit_wallet_job(wallet_address, mode='basic', error_columns=(), address=DAEMON_ADDRESS, max_age=None):
+    """
+    Fetch one wallet through the daemon and return its result row
+
+    max_age is the result cache freshness in seconds (None = RESULT_CACHE_TTL).
+    """
+    request = {'action': 'fetch', 'wallet': wallet_address, 'mode': mode, 'max_age': max_age}
+    try:
+        reply = send_request(request, address)
+    except (OSError, EOFError, AuthenticationError) as e:
+        reply = {'ok': False, 'error': f"daemon unreachable: {e}"}
+
+    if reply['ok']:
+        return reply['result']
+
+    return make_error_row(wallet_address, reply['error'], error_columns)
+
+def submit_wallet_jobs(wallet_addresses, mode='basic', error_columns=(), max_parallel=None,
+                       address=DAEMON_ADDRESS, max_age=None):
+    """
+    Fetch several wallets through the daemon, results in input order
+
+    Jobs are sent in parallel so every warm driver stays busy.
+    """
+    if max_parallel is None:
+        max_parallel = get_daemon_stats(address)['drivers']
+
+    with ThreadPoolExecutor(max_workers=max(1, max_parallel)) as executor:
+        return list(executor.map(
+            lambda wallet: submit_wallet_job(wallet, mode, error_columns, address, max_age),
+            wallet_addresses
+        ))
+
+def stop_daemon(address=DAEMON_ADDRESS):
+    """
+    Ask a running daemon to shut down
+    """
+    return send_request({'action': 'shutdown'}, address)['ok']
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Keep warm Chrome drivers for wallet fetches")
+    parser.add_argument('--drivers', type=int, default=2, help="number of warm Chrome drivers")
+    parser.add_argument('--port', type=int, default=DAEMON_ADDRESS[1], help="local port to listen on")
+    parser.add_argument('--memory-log', help="CSV file for the drivers' RSS over time (written at shutdown)")
+    args = parser.parse_args()
+
+    run_daemon(args.drivers, ('localhost', args.port), memory_log_path=args.memory_log)
@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Reusable Chrome profiles so Jupiter's JS bundles come from the disk cache
+
+A fresh webdriver.Chrome starts with an empty profile and downloads the
+whole app again. Here every driver borrows one of a few persistent profile
+slots instead. Chrome can't share a profile between two running browsers,
+so each slot is guarded by a file lock: pool workers and parallel runs
+simply take different slots. Cache folders are cleared least recently used
+first when all slots together grow past MAX_PROFILE_CACHE_MB.
+"""
+
+import atexit
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+PROFILE_ROOT = os.environ.get(
+    'CHROME_PROFILE_ROOT',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'chrome_profiles')
+)
+
+# At most this many slots (= browsers using a warm profile at the same time)
+MAX_PROFILE_SLOTS = 8
+
+# Disk cache budget for all slots together, and per Chrome instance
+MAX_PROFILE_CACHE_MB = 500
+CHROME_DISK_CACHE_MB = 100
+
+# Folders inside a profile that only hold cached downloads
+CACHE_FOLDERS = [
+    os.path.join('Default', 'Cache'),
+    os.path.join('Default', 'Code Cache'),
+    os.path.join('Default', 'GPUCache'),
+    'ShaderCache',
+    'GrShaderCache',
+]
+
+# Slots held by this process: profile path -> (lock file, driver)
+held_slots = {}
+held_slots_lock = threading.Lock()
+
+# Throwaway profiles (all slots were busy); deleted once their driver is gone
+temp_profiles = set()
+
+def try_lock(lock_file):
+    """
+    Take an exclusive lock without waiting, return True on success
+    """
+    try:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+        return True
+    except OSError:
+        return False
+
+def unlock(lock_file):
+    try:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        else:
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+    except OSError:
+        pass
+    lock_file.close()
+
+def folder_size_mb(path):
+    total = 0
+    for folder, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(folder, name))
+            except OSError:
+                continue
+    return total / 1024 / 1024
+
+def profile_cache_mb(profile_dir):
+    """
+    Size of the cache folders of one profile
+    """
+    return sum(folder_size_mb(os.path.join(profile_dir, folder)) for folder in CACHE_FOLDERS)
+
+def clear_profile_cache(profile_dir):
+    for folder in CACHE_FOLDERS:
+        shutil.rmtree(os.path.join(profile_dir, folder), ignore_errors=True)
+
+def release_dead_slots():
+    """
+    Give back slots whose driver has quit (drivers are usually quit directly)
+    """
+    with held_slots_lock:
+        for profile_dir, (lock_file, driver) in list(held_slots.items()):
+            if driver is None:
+                continue
+            try:
+                driver.current_url
+            except Exception:
+                del held_slots[profile_dir]
+                free_slot(profile_dir, lock_file)
+
+def free_slot(profile_dir, lock_file):
+    """
+    Unlock a slot, or delete a temp profile (caller already removed it from held_slots)
+    """
+    if lock_file is not None:
+        unlock(lock_file)
+    if profile_dir in temp_profiles:
+        temp_profiles.discard(profile_dir)
+        shutil.rmtree(profile_dir, ignore_errors=True)
+
+def remove_temp_profiles():
+    """
+    Delete this process's temp profiles that are still around at exit
+    """
+    with held_slots_lock:
+        for profile_dir in list(temp_profiles):
+            held_slots.pop(profile_dir, None)
+            free_slot(profile_dir, None)
+
+atexit.register(remove_temp_profiles)
+
+def acquire_profile(max_slots=MAX_PROFILE_SLOTS):
+    """
+    Lock a free profile slot and return its folder
+
+    Falls back to a throwaway temp profile if every slot is busy.
+    """
+    release_dead_slots()
+    os.makedirs(PROFILE_ROOT, exist_ok=True)
+
+    for slot in range(max_slots):
+        profile_dir = os.path.join(PROFILE_ROOT, f"slot_{slot}")
+        with held_slots_lock:
+            if profile_dir in held_slots:
+                continue
+
+        lock_file = open(os.path.join(PROFILE_ROOT, f"slot_{slot}.lock"), 'a+')
+        if not try_lock(lock_file):
+            lock_file.close()
+            continue
+
+        # Chrome leaves these behind when it is killed; the file lock says nobody uses the slot
+        for name in ('SingletonLock', 'SingletonSocket', 'SingletonCookie'):
+            path = os.path.join(profile_dir, name)
+            if os.path.lexists(path):
+                os.remove(path)
+
+        os.makedirs(profile_dir, exist_ok=True)
+        os.utime(lock_file.name)
+        with held_slots_lock:
+            held_slots[profile_dir] = (lock_file, None)
+        return profile_dir
+
+    print(f"   ⚠️ All {max_slots} Chrome profile slots busy, using a cold temp profile")
+    profile_dir = tempfile.mkdtemp(prefix='chrome_profile_')
+    with held_slots_lock:
+        held_slots[profile_dir] = (None, None)
+        temp_profiles.add(profile_dir)
+    return profile_dir
+
+def attach_driver(profile_dir, driver):
+    """
+    Remember which driver uses a slot, so the slot is freed once it quits
+    """
+    with held_slots_lock:
+        if profile_dir in held_slots:
+            held_slots[profile_dir] = (held_slots[profile_dir][0], driver)
+
+def release_profile(profile_dir):
+    """
+    Unlock a slot (or delete a temp profile) right away, after driver.quit()
+    """
+    with held_slots_lock:
+        held = held_slots.pop(profile_dir, None)
+        if held:
+            free_slot(profile_dir, held[0])
+
+def evict_profile_caches(max_total_mb=MAX_PROFILE_CACHE_MB):
+    """
+    Clear cache folders of idle slots, least recently used first, until under budget
+
+    Slots in use by any process are skipped (their lock can't be taken).
+    """
+    if not os.path.isdir(PROFILE_ROOT):
+        return 0
+
+    slots = []
+    for name in os.listdir(PROFILE_ROOT):
+        profile_dir = os.path.join(PROFILE_ROOT, name)
+        if os.path.isdir(profile_dir):
+            lock_path = f"{profile_dir}.lock"
+            last_used = os.path.getmtime(lock_path) if os.path.exists(lock_path) else 0
+            slots.append((last_used, profile_dir, profile_cache_mb(profile_dir)))
+
+    total_mb = sum(size for _, _, size in slots)
+    cleared = 0
+    for _, profile_dir, size in sorted(slots):
+        if total_mb <= max_total_mb:
+            break
+        with held_slots_lock:
+            if profile_dir in held_slots:
+                continue
+        lock_file = open(f"{profile_dir}.lock", 'a+')
+        if try_lock(lock_file):
+            clear_profile_cache(profile_dir)
+            total_mb -= size
+            cleared += 1
+            print(f"   🧹 Cleared {size:.0f} MB browser cache of {os.path.basename(profile_dir)}")
+            unlock(lock_file)
+        else:
+            lock_file.close()
+    return cleared
+
+def profile_arguments(profile_dir):
+    """
+    Chrome arguments for a persistent profile with a capped disk cache
+    """
+    return [
+        f"--user-data-dir={profile_dir}",
+        f"--disk-cache-size={CHROME_DISK_CACHE_MB * 1024 * 1024}",
+    ]
+
+def profile_report():
+    """
+    Cache size and last use of every slot
+    """
+    report = []
+    if not os.path.isdir(PROFILE_ROOT):
+        return report
+    for name in sorted(os.listdir(PROFILE_ROOT)):
+        profile_dir = os.path.join(PROFILE_ROOT, name)
+        if os.path.isdir(profile_dir):
+            lock_path = f"{profile_dir}.lock"
+            report.append({
+                'slot': name,
+                'cache_mb': round(profile_cache_mb(profile_dir), 1),
+                'last_used': time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(os.path.getmtime(lock_path)))
+                             if os.path.exists(lock_path) else None,
+                'in_use_here': profile_dir in held_slots,
+            })
+    return report
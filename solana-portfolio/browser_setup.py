@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Shared Chrome setup for all Jupiter scraping scripts
+"""
+
+import os
+import time
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+
+from browser_profiles import (acquire_profile, attach_driver, release_profile,
+                              evict_profile_caches, profile_arguments)
+
+# Where the portfolio pages come from (override with JUPITER_PORTFOLIO_URL,
+# e.g. http://localhost:8765/portfolio for the stand-in in jupiter_standin.py)
+DEFAULT_PORTFOLIO_URL = "https://jup.ag/portfolio"
+
+# The arguments every tracker used to build by hand
+DEFAULT_CHROME_ARGUMENTS = [
+    "--headless",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+]
+
+# Requests we never need for reading text and numbers off jup.ag/portfolio
+BLOCKED_URL_PATTERNS = [
+    # Images and icons
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico",
+    # Fonts
+    "*.woff", "*.woff2", "*.ttf", "*.otf",
+    # Media
+    "*.mp4", "*.webm", "*.mp3", "*.wav",
+    # Analytics and error tracking
+    "*google-analytics.com*", "*googletagmanager.com*", "*segment.io*", "*segment.com*",
+    "*sentry.io*", "*hotjar.com*", "*mixpanel.com*", "*amplitude.com*", "*datadoghq*",
+    # Wallet adapter / connect scripts (we never connect a wallet)
+    "*walletconnect*", "*web3modal*", "*reown.com*",
+]
+
+# Chrome content settings: 2 = block
+BLOCKING_PREFS = {
+    "profile.managed_default_content_settings.images": 2,
+    "profile.managed_default_content_settings.media_stream": 2,
+    "profile.managed_default_content_settings.notifications": 2,
+}
+
+# Navigation timing, transferred bytes, disk-cache hits and JS heap of the current page
+PAGE_LOAD_STATS_SCRIPT = """
+const nav = performance.getEntriesByType('navigation')[0] || {};
+const resources = performance.getEntriesByType('resource');
+let transferBytes = nav.transferSize || 0;
+let cachedRequests = 0;
+let measurableRequests = 0;
+for (const entry of resources) {
+    transferBytes += entry.transferSize || 0;
+    // Sizes are only visible for same-origin / Timing-Allow-Origin responses
+    if (entry.decodedBodySize > 0) {
+        measurableRequests += 1;
+        if (entry.transferSize === 0) {
+            cachedRequests += 1;
+        }
+    }
+}
+return {
+    requests: resources.length + 1,
+    transfer_bytes: transferBytes,
+    cached_requests: cachedRequests,
+    cache_hit_rate: measurableRequests ? cachedRequests / measurableRequests : null,
+    dom_content_loaded_ms: Math.round(nav.domContentLoadedEventEnd || 0),
+    load_ms: Math.round(nav.loadEventEnd || 0),
+    js_heap_bytes: performance.memory ? performance.memory.usedJSHeapSize : null
+};
+"""
+
+def portfolio_url(wallet_address, base_url=None):
+    """
+    URL of a wallet's portfolio page
+
+    base_url wins over the JUPITER_PORTFOLIO_URL environment variable, which
+    wins over jup.ag. The environment variable also reaches pool workers.
+    """
+    base_url = base_url or os.environ.get('JUPITER_PORTFOLIO_URL') or DEFAULT_PORTFOLIO_URL
+    return f"{base_url.rstrip('/')}/{wallet_address}"
+
+def create_chrome_options(extra_arguments=None, performance_logging=False, block_resources=False):
+    """
+    Build the standard headless Chrome options used for scraping
+
+    performance_logging turns on the DevTools performance log, which
+    network_capture.py reads to get Jupiter's JSON responses.
+    block_resources adds the content settings of the tuned scraping profile.
+    """
+    chrome_options = Options()
+    for argument in DEFAULT_CHROME_ARGUMENTS:
+        chrome_options.add_argument(argument)
+
+    for argument in extra_arguments or []:
+        if argument not in DEFAULT_CHROME_ARGUMENTS:
+            chrome_options.add_argument(argument)
+
+    if performance_logging:
+        chrome_options.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+
+    if block_resources:
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_experimental_option("prefs", BLOCKING_PREFS)
+
+    return chrome_options
+
+def enable_resource_blocking(driver, patterns=None):
+    """
+    Block images, fonts, media, analytics and wallet scripts through CDP
+
+    Applies to the driver's current tab and stays active across navigations.
+    """
+    driver.execute_cdp_cmd('Network.enable', {})
+    driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': patterns or BLOCKED_URL_PATTERNS})
+
+def create_driver(extra_arguments=None, performance_logging=False, block_resources=False,
+                  persistent_profile=False):
+    """
+    Start a new headless Chrome driver with the standard options
+
+    block_resources=True gives the tuned scraping profile that skips
+    everything we don't read (see BLOCKED_URL_PATTERNS).
+    persistent_profile=True borrows a warm profile slot so JS bundles and
+    config come from Chrome's disk cache (see browser_profiles.py).
+    """
+    profile_dir = None
+    if persistent_profile:
+        evict_profile_caches()
+        profile_dir = acquire_profile()
+        extra_arguments = list(extra_arguments or []) + profile_arguments(profile_dir)
+
+    chrome_options = create_chrome_options(extra_arguments, performance_logging, block_resources)
+    try:
+        driver = webdriver.Chrome(options=chrome_options)
+    except Exception:
+        if profile_dir:
+            release_profile(profile_dir)
+        raise
+
+    if profile_dir:
+        attach_driver(profile_dir, driver)
+
+    if block_resources:
+        enable_resource_blocking(driver)
+
+    return driver
+
+def driver_is_alive(driver):
+    """
+    Check if a Chrome driver still responds
+    """
+    try:
+        driver.current_url
+        return True
+    except Exception:
+        return False
+
+def get_page_load_stats(driver):
+    """
+    Requests, transferred bytes, load timings and JS heap of the loaded page
+    """
+    return driver.execute_script(PAGE_LOAD_STATS_SCRIPT)
+
+def print_page_load_stats(driver):
+    """
+    One-line load report for the debug scripts
+    """
+    try:
+        stats = get_page_load_stats(driver)
+    except Exception as e:
+        print(f"⚠️ No page load stats: {e}")
+        return
+    print(f"📦 Page load: {stats['requests']} requests, {stats['transfer_bytes'] / 1024:.0f} KB, "
+          f"DOM ready {stats['dom_content_loaded_ms']} ms, load {stats['load_ms']} ms")
+
+def measure_page_load(wallet_address, block_resources, base_url=None, persistent_profile=False):
+    """
+    Load one portfolio page in a fresh driver and return its load stats
+    """
+    from page_readiness import wait_for_net_worth
+
+    driver = create_driver(block_resources=block_resources, persistent_profile=persistent_profile)
+    try:
+        start_time = time.time()
+        driver.get(portfolio_url(wallet_address, base_url))
+        wait_for_net_worth(driver)
+        stats = get_page_load_stats(driver)
+        stats['time_to_data_ms'] = round((time.time() - start_time) * 1000)
+        return stats
+    finally:
+        driver.quit()
+
+def compare_scraping_profiles(wallet_address):
+    """
+    Load the same page with and without resource blocking and report savings
+    """
+    standard = measure_page_load(wallet_address, block_resources=False)
+    blocked = measure_page_load(wallet_address, block_resources=True)
+
+    savings = {
+        'bytes_saved': standard['transfer_bytes'] - blocked['transfer_bytes'],
+        'requests_saved': standard['requests'] - blocked['requests'],
+        'time_to_data_saved_ms': standard['time_to_data_ms'] - blocked['time_to_data_ms'],
+        'load_ms_saved': standard['load_ms'] - blocked['load_ms'],
+    }
+    if standard['js_heap_bytes'] and blocked['js_heap_bytes']:
+        savings['js_heap_saved_bytes'] = standard['js_heap_bytes'] - blocked['js_heap_bytes']
+
+    return {'standard': standard, 'blocked': blocked, 'savings': savings}
+
+def compare_cold_warm_profile(wallet_address, block_resources=True):
+    """
+    Time to first data with an empty profile vs. a warm persistent profile
+
+    The warm profile is primed with one load first, like a second run.
+    """
+    cold = measure_page_load(wallet_address, block_resources)
+    measure_page_load(wallet_address, block_resources, persistent_profile=True)
+    warm = measure_page_load(wallet_address, block_resources, persistent_profile=True)
+
+    return {
+        'cold': cold,
+        'warm': warm,
+        'time_to_data_saved_ms': cold['time_to_data_ms'] - warm['time_to_data_ms'],
+        'bytes_saved': cold['transfer_bytes'] - warm['transfer_bytes'],
+    }
+
+if __name__ == "__main__":
+    wallet = "A1N45nJh8eRn2zhXxP7SkqNKvR6rPXhbVgKzBGBxKEm8"
+    print(f"⚖️ Comparing standard vs. resource-blocking profile for {wallet[:8]}...")
+
+    comparison = compare_scraping_profiles(wallet)
+
+    for profile in ['standard', 'blocked']:
+        stats = comparison[profile]
+        print(f"\n{profile.upper()}:")
+        print(f"  Requests: {stats['requests']}")
+        print(f"  Transferred: {stats['transfer_bytes'] / 1024:.0f} KB")
+        print(f"  Time to data: {stats['time_to_data_ms']} ms")
+        print(f"  JS heap: {(stats['js_heap_bytes'] or 0) / 1024 / 1024:.1f} MB")
+
+    savings = comparison['savings']
+    print(f"\n💾 Saved per page: {savings['bytes_saved'] / 1024:.0f} KB, "
+          f"{savings['requests_saved']} requests, {savings['time_to_data_saved_ms']} ms to first data")
+
+    print(f"\n🔥 Comparing cold vs. warm persistent profile...")
+    profiles = compare_cold_warm_profile(wallet)
+    for name in ['cold', 'warm']:
+        stats = profiles[name]
+        hit_rate = f"{stats['cache_hit_rate']:.0%}" if stats['cache_hit_rate'] is not None else "n/a"
+        print(f"  {name.upper()}: {stats['time_to_data_ms']} ms to data, "
+              f"{stats['transfer_bytes'] / 1024:.0f} KB, disk-cache hit rate {hit_rate}")
+    print(f"💾 Warm profile saves {profiles['time_to_data_saved_ms']} ms and "
+          f"{profiles['bytes_saved'] / 1024:.0f} KB per first page")
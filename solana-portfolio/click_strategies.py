@@ -0,0 +1,343 @@
+#!/usr/bin/env python3
+"""
+Learn which selector and click method opens the Holdings PnL popup
+
+Every XPath scan over the whole document costs a WebDriver round trip, and
+most selectors never match anything useful. This module remembers for each
+selector + click method how often it worked and how long it took, tries the
+best one first on the next page and saves the stats to JSON, so later runs
+go straight to the winner.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from multiprocessing.util import Finalize
+from selenium.webdriver.common.by import By
+
+from process_local import ProcessSingleton
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+STRATEGY_STATS_PATH = os.environ.get(
+    'CLICK_STRATEGY_STATS',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'click_strategy_stats.json')
+)
+
+# Counted in every entry of the stats file
+COUNT_FIELDS = ('successes', 'failures', 'total_ms')
+
+# Candidate selectors per click target, in the order we try them without stats
+CLICK_TARGETS = {
+    'holdings_pnl': {
+        'selectors': [
+            "//*[normalize-space(text())='Holdings PnL']",
+            "//*[contains(text(), 'Holdings PnL')]",
+            "//*[text()='Holdings PnL']/..",
+            "//*[contains(text(), '$') and contains(text(), 'PnL')]",
+            "//div[contains(@class, 'pnl') or contains(@class, 'holdings')]",
+        ],
+        # The click only counts once the popup is really there
+        'verify_script': "return document.body.innerText.includes('Trader PnL');",
+    },
+}
+
+CLICK_METHODS = ['js', 'native']
+
+# How long to wait for the popup after a click before trying the next strategy
+CLICK_VERIFY_TIMEOUT = 5
+
+# Give up after this many clicks that didn't open anything (e.g. a wallet without PnL)
+MAX_CLICK_ATTEMPTS = 3
+
+# Strategies that failed this often without a single success are skipped,
+# except for one retry every RETRY_HOPELESS_EVERY clicks in case the site changed
+GIVE_UP_AFTER_FAILURES = 3
+RETRY_HOPELESS_EVERY = 25
+
+# Buffered counts are merged into the stats file after this many clicks or
+# seconds (and at exit), so workers don't queue on the file lock every click
+SAVE_EVERY_RECORDS = 20
+SAVE_INTERVAL = 60
+
+class StrategyStats:
+    """
+    Success / failure counts and latency per target, selector and click method
+    """
+
+    def __init__(self, path=STRATEGY_STATS_PATH):
+        self.path = path
+        self.lock = threading.Lock()
+        self.clicks = 0
+        # Counts not yet merged into the file (other workers write it too)
+        self.pending = {}
+        self.pending_records = 0
+        self.last_save = time.time()
+        self.stats = self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def entry(self, target, selector, method):
+        key = f"{method} {selector}"
+        return self.stats.setdefault(target, {}).setdefault(
+            key, {'successes': 0, 'failures': 0, 'total_ms': 0}
+        )
+
+    def is_hopeless(self, target, selector, method):
+        entry = self.entry(target, selector, method)
+        return entry['successes'] == 0 and entry['failures'] >= GIVE_UP_AFTER_FAILURES
+
+    def score(self, target, selector, method):
+        """
+        Sort key: likely to work first, then fast; hopeless strategies last
+        """
+        entry = self.entry(target, selector, method)
+        hopeless = self.is_hopeless(target, selector, method)
+        # Smoothed success rate so an untried strategy sits between good and bad
+        success_rate = (entry['successes'] + 1) / (entry['successes'] + entry['failures'] + 2)
+        avg_ms = entry['total_ms'] / entry['successes'] if entry['successes'] else float('inf')
+        return (hopeless, -success_rate, avg_ms)
+
+    def ranked(self, target, include_hopeless=True):
+        """
+        (selector, method) pairs of a target, best first
+        """
+        selectors = CLICK_TARGETS[target]['selectors']
+        pairs = [(selector, method) for selector in selectors for method in CLICK_METHODS]
+        with self.lock:
+            if not include_hopeless:
+                pairs = [pair for pair in pairs if not self.is_hopeless(target, *pair)]
+            return sorted(pairs, key=lambda pair: self.score(target, *pair))
+
+    def next_click(self):
+        """
+        Count a click; True when hopeless strategies get another chance
+        """
+        with self.lock:
+            self.clicks += 1
+            return self.clicks % RETRY_HOPELESS_EVERY == 0
+
+    def record(self, target, selector, method, success, elapsed_ms=0):
+        with self.lock:
+            key = f"{method} {selector}"
+            delta = self.pending.setdefault(target, {}).setdefault(key, dict.fromkeys(COUNT_FIELDS, 0))
+            for counts in (self.entry(target, selector, method), delta):
+                if success:
+                    counts['successes'] += 1
+                    counts['total_ms'] += round(elapsed_ms)
+                else:
+                    counts['failures'] += 1
+            self.pending_records += 1
+            if (self.pending_records >= SAVE_EVERY_RECORDS
+                    or time.time() - self.last_save >= SAVE_INTERVAL):
+                self.save()
+
+    def flush(self):
+        """
+        Write buffered counts now (at exit, or before a pool worker quits)
+        """
+        with self.lock:
+            if self.pending:
+                self.save()
+
+    def save(self):
+        """
+        Add this process's new counts to the file (re-read under a lock, so no worker's counts get lost)
+        """
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        try:
+            with open(f"{self.path}.lock", 'a') as lock_file:
+                lock_exclusive(lock_file)
+                merged = self.load()
+                for target, entries in self.pending.items():
+                    for key, delta in entries.items():
+                        counts = merged.setdefault(target, {}).setdefault(key, dict.fromkeys(COUNT_FIELDS, 0))
+                        for field in COUNT_FIELDS:
+                            counts[field] += delta[field]
+                with open(temp_path, 'w') as f:
+                    json.dump(merged, f, indent=2)
+                os.replace(temp_path, self.path)
+            # The lock is released when the lock file closes
+            self.pending = {}
+            self.pending_records = 0
+            self.last_save = time.time()
+            self.stats = merged
+        except OSError as e:
+            print(f"   ⚠️ Could not save click strategy stats: {e}")
+
+    def report(self, target='holdings_pnl'):
+        """
+        Stats of a target as a list, best strategy first
+        """
+        rows = []
+        for selector, method in self.ranked(target):
+            entry = self.entry(target, selector, method)
+            rows.append({
+                'selector': selector,
+                'method': method,
+                'successes': entry['successes'],
+                'failures': entry['failures'],
+                'avg_ms': round(entry['total_ms'] / entry['successes']) if entry['successes'] else None,
+            })
+        return rows
+
+def lock_exclusive(lock_file):
+    """
+    Block until this process holds the stats file lock
+    """
+    if fcntl is not None:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+    else:
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+
+def new_strategy_stats():
+    stats = StrategyStats()
+    # multiprocessing children skip atexit; this runs when they exit normally
+    Finalize(None, flush_strategy_stats, exitpriority=10)
+    return stats
+
+shared_stats = ProcessSingleton(new_strategy_stats)
+
+def get_strategy_stats():
+    return shared_stats.get()
+
+def flush_strategy_stats():
+    """
+    Save this process's buffered click counts, if it clicked anything
+    """
+    if shared_stats.instance is not None:
+        shared_stats.instance.flush()
+
+atexit.register(flush_strategy_stats)
+
+def wait_for_verification(driver, script, timeout):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if driver.execute_script(script):
+                return True
+        except Exception:
+            pass
+        time.sleep(0.1)
+    return False
+
+def click_element(driver, element, method):
+    if method == 'js':
+        driver.execute_script("arguments[0].click();", element)
+    else:
+        element.click()
+
+def click_with_learned_strategy(driver, target='holdings_pnl', verify_timeout=CLICK_VERIFY_TIMEOUT):
+    """
+    Click a target using the best known selector + click method first
+
+    Each selector is scanned at most once per call and strategies that
+    never worked are skipped. Returns True once the target's verify script
+    sees the result of the click.
+    """
+    stats = get_strategy_stats()
+    verify_script = CLICK_TARGETS[target]['verify_script']
+    found_elements = {}
+    attempts = 0
+
+    for selector, method in stats.ranked(target, include_hopeless=stats.next_click()):
+        if attempts >= MAX_CLICK_ATTEMPTS:
+            break
+        start_time = time.time()
+
+        if selector not in found_elements:
+            try:
+                found_elements[selector] = driver.find_elements(By.XPATH, selector)
+            except Exception:
+                found_elements[selector] = []
+
+        clicked = False
+        for element in found_elements[selector]:
+            if attempts >= MAX_CLICK_ATTEMPTS:
+                break
+            try:
+                if not (element.is_displayed() and element.is_enabled()):
+                    continue
+                click_element(driver, element, method)
+            except Exception:
+                continue
+            attempts += 1
+            if wait_for_verification(driver, verify_script, verify_timeout):
+                clicked = True
+                break
+
+        elapsed_ms = (time.time() - start_time) * 1000
+        stats.record(target, selector, method, clicked, elapsed_ms)
+        if clicked:
+            return True
+
+    return False
+
+def start_click(driver, target='holdings_pnl', skip=()):
+    """
+    Click with the best known strategy not in skip, without waiting for the result
+
+    For callers that poll several tabs: returns the attempt to pass to
+    check_click, or None if no strategy found anything to click.
+    """
+    stats = get_strategy_stats()
+    include_hopeless = stats.next_click() if not skip else False
+
+    for selector, method in stats.ranked(target, include_hopeless=include_hopeless):
+        if (selector, method) in skip:
+            continue
+        try:
+            elements = driver.find_elements(By.XPATH, selector)
+        except Exception:
+            elements = []
+
+        for element in elements:
+            try:
+                if not (element.is_displayed() and element.is_enabled()):
+                    continue
+                click_element(driver, element, method)
+            except Exception:
+                continue
+            return {'target': target, 'selector': selector, 'method': method, 'started': time.time()}
+
+        stats.record(target, selector, method, False)
+
+    return None
+
+def check_click(driver, attempt, verify_timeout=CLICK_VERIFY_TIMEOUT):
+    """
+    Poll a click from start_click once
+
+    Returns True when the target's verify script sees it, False once
+    verify_timeout has passed, None while it is still open.
+    """
+    try:
+        verified = driver.execute_script(CLICK_TARGETS[attempt['target']]['verify_script'])
+    except Exception:
+        verified = False
+
+    elapsed_ms = (time.time() - attempt['started']) * 1000
+    if verified or elapsed_ms > verify_timeout * 1000:
+        get_strategy_stats().record(attempt['target'], attempt['selector'], attempt['method'],
+                                    bool(verified), elapsed_ms)
+        return bool(verified)
+    return None
+
+if __name__ == "__main__":
+    print("📊 Holdings PnL click strategies (best first):")
+    for row in get_strategy_stats().report():
+        print(f"  {row['method']:<6} {row['successes']:>4} ok {row['failures']:>4} failed "
+              f"{row['avg_ms'] or '-':>6} ms  {row['selector']}")
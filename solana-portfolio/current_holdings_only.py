@@ -3,108 +3,41 @@
 Extract ONLY current holdings - no historical data
 """
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-import time
-import re
+
+from browser_setup import create_driver, portfolio_url, print_page_load_stats
+from page_readiness import wait_for_portfolio_page, wait_for_pnl_popup
+from page_regions import popup_region
+from pnl_table_parser import parse_pnl_table, format_holdings
+from popup_extraction import click_holdings_pnl
 
 def extract_only_current_holdings(popup_content):
     """
     Extract ONLY tokens with current meaningful balances
     Exclude sold positions and tiny amounts
     """
-    current_holdings = []
-    lines = popup_content.split('\n')
-
-    # Strategy: Look for tokens that are NOT marked as "Sold all"
-    # and have a Balance column value > $10
-    i = 0
-    while i < len(lines) - 15:
-        line = lines[i].strip()
-
-        # Find token names
-        if (line.isupper() and
-            2 <= len(line) <= 10 and
-            line.isalpha() and
-            line not in ['USD', 'ALL', 'NEW', 'HOLDING', 'SOLD', 'PRICE', 'LAST', 'BALANCE', 'TOTAL']):
-
-            token_name = line
-
-            # Check the next several lines for "Sold all" indicator
-            is_sold = False
-            current_balance = None
-
-            # Look ahead for status and balance
-            for j in range(1, 20):
-                if i + j >= len(lines):
-                    break
-
-                check_line = lines[i + j].strip()
-
-                # If we find "Sold all", this token has no current holdings
-                if 'sold all' in check_line.lower():
-                    is_sold = True
-                    break
-
-                # Look for the balance amount in the Balance column
-                # This should be a standalone $X.XX amount
-                if re.match(r'^\$[0-9,.]+[KMB]?$', check_line):
-                    balance_amount = check_line
-
-                    # Extract numeric value
-                    amount_str = balance_amount.replace('$', '').replace(',', '')
-                    try:
-                        if 'K' in amount_str:
-                            numeric_value = float(amount_str.replace('K', '')) * 1000
-                        elif 'M' in amount_str:
-                            numeric_value = float(amount_str.replace('M', '')) * 1000000
-                        else:
-                            numeric_value = float(amount_str)
-
-                        # Only consider meaningful current balances
-                        if numeric_value > 50:  # More than $50 to filter out dust
-                            current_balance = balance_amount
-                            break
-
-                    except ValueError:
-                        continue
-
-            # Only add if not sold and has meaningful current balance
-            if not is_sold and current_balance:
-                current_holdings.append(f"{token_name}: {current_balance}")
-
-        i += 1
-
-    return current_holdings
-
-def test_current_holdings_only(wallet_address):
+    # Not "Sold all" and more than $50 in the Balance column (filters out dust)
+    return format_holdings(parse_pnl_table(popup_content), min_balance=50)
+
+def test_current_holdings_only(wallet_address, base_url=None):
     """
     Test extraction of current holdings only
     """
-    url = f"https://jup.ag/portfolio/{wallet_address}"
-
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
+    url = portfolio_url(wallet_address, base_url)
 
     try:
-        driver = webdriver.Chrome(options=chrome_options)
+        driver = create_driver(block_resources=True)
         driver.get(url)
-        time.sleep(8)
+        wait_for_portfolio_page(driver)
+        print_page_load_stats(driver)
+        basic_text = driver.find_element(By.TAG_NAME, "body").text
 
         # Click Holdings PnL for detailed view
-        pnl_elements = driver.find_elements(By.XPATH, "//*[contains(text(), 'Holdings PnL')]")
-        if pnl_elements:
-            for element in pnl_elements:
-                if element.is_enabled() and element.is_displayed():
-                    driver.execute_script("arguments[0].click();", element)
-                    time.sleep(8)
-                    break
-
-        # Get detailed content
-        popup_content = driver.find_element(By.TAG_NAME, "body").text
+        if click_holdings_pnl(driver):
+            wait_for_pnl_popup(driver)
+
+        # Get detailed content (popup only)
+        popup_content = popup_region(driver.find_element(By.TAG_NAME, "body").text, basic_text)
 
         print("=== DEBUGGING: Looking for current holdings only ===")
 
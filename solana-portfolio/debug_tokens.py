@@ -3,27 +3,25 @@
 Debug token detection - see what Jupiter actually shows
 """
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-import time
 import re
 
-def debug_token_detection(wallet_address):
+from browser_setup import create_driver, portfolio_url, print_page_load_stats
+from page_readiness import wait_for_portfolio_page
+
+def debug_token_detection(wallet_address, base_url=None):
     """
     Debug what content we get from Jupiter for token detection
     """
-    url = f"https://jup.ag/portfolio/{wallet_address}"
-
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
+    url = portfolio_url(wallet_address, base_url)
 
     try:
-        driver = webdriver.Chrome(options=chrome_options)
+        driver = create_driver(block_resources=True)
         driver.get(url)
-        time.sleep(10)
+        wait_timings = {}
+        wait_for_portfolio_page(driver, timings=wait_timings)
+        print_page_load_stats(driver)
+        print(f"⏱️ Page ready after: {wait_timings}")
 
         # Get page content
         page_text = driver.find_element(By.TAG_NAME, "body").text
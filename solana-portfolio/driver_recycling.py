@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Recycle Chrome drivers before they grow past a memory budget
+
+Headless Chrome keeps growing when one driver visits hundreds of Jupiter
+pages in a row. The recycler checks the browser's RSS and page count after
+every wallet and swaps in a fresh driver when a threshold is crossed.
+"""
+
+import csv
+from datetime import datetime
+
+from browser_setup import create_driver
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Recycle when the browser uses more than this (MB) or has loaded this many pages
+MAX_BROWSER_RSS_MB = 1500
+MAX_PAGES_PER_DRIVER = 150
+
+# Columns of the memory log CSV ('worker' is set when several drivers share one log)
+MEMORY_LOG_FIELDS = ['timestamp', 'worker', 'pages', 'rss_mb', 'recycled']
+
+def browser_rss_mb(driver):
+    """
+    Resident memory of chromedriver plus all Chrome processes it started
+
+    Falls back to the page's JS heap when psutil is not installed.
+    """
+    if psutil is not None:
+        try:
+            root = psutil.Process(driver.service.process.pid)
+            processes = [root] + root.children(recursive=True)
+            total = 0
+            for process in processes:
+                try:
+                    total += process.memory_info().rss
+                except psutil.NoSuchProcess:
+                    continue
+            return round(total / 1024 / 1024, 1)
+        except (AttributeError, psutil.Error):
+            pass
+
+    try:
+        heap = driver.execute_script("return performance.memory ? performance.memory.usedJSHeapSize : null;")
+        return round(heap / 1024 / 1024, 1) if heap else None
+    except Exception:
+        return None
+
+def browser_pids(driver):
+    """
+    PIDs of chromedriver and the Chrome processes it has started so far
+
+    Without psutil only chromedriver's PID is known (Chrome usually exits with it).
+    """
+    try:
+        root_pid = driver.service.process.pid
+    except AttributeError:
+        return []
+    if psutil is None:
+        return [root_pid]
+    try:
+        return [root_pid] + [child.pid for child in psutil.Process(root_pid).children(recursive=True)]
+    except psutil.Error:
+        return [root_pid]
+
+class DriverRecycler:
+    """
+    Tracks pages and memory of the current driver and replaces it when needed
+    """
+
+    def __init__(self, driver_settings=None, max_rss_mb=MAX_BROWSER_RSS_MB,
+                 max_pages=MAX_PAGES_PER_DRIVER, worker=None, start_driver=None):
+        self.driver_settings = driver_settings or {}
+        # start_driver replaces create_driver(**driver_settings) for callers with their own setup
+        self.start_driver = start_driver or (lambda: create_driver(**self.driver_settings))
+        self.worker = worker
+        self.max_rss_mb = max_rss_mb
+        self.max_pages = max_pages
+        self.current_driver = None
+        self.pages = 0
+        self.recycles = 0
+        self.samples = []
+
+    def check(self, driver):
+        """
+        Call after each wallet; returns the driver to use for the next one
+        """
+        # fetch_with_retry may already have replaced a crashed driver
+        if driver is not self.current_driver:
+            self.current_driver = driver
+            self.pages = 0
+
+        self.pages += 1
+        rss_mb = browser_rss_mb(driver)
+
+        too_big = self.max_rss_mb and rss_mb is not None and rss_mb > self.max_rss_mb
+        too_old = self.max_pages and self.pages >= self.max_pages
+
+        self.samples.append({
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'worker': self.worker,
+            'pages': self.pages,
+            'rss_mb': rss_mb,
+            'recycled': bool(too_big or too_old),
+        })
+
+        if too_big or too_old:
+            reason = f"{rss_mb} MB RSS" if too_big else f"{self.pages} pages"
+            print(f"   🔄 Recycling Chrome driver ({reason})...")
+            try:
+                driver.quit()
+            except Exception:
+                pass
+            driver = self.start_driver()
+            self.current_driver = driver
+            self.pages = 0
+            self.recycles += 1
+
+        return driver
+
+    def peak_rss_mb(self):
+        return peak_rss_mb(self.samples)
+
+    def take_samples(self):
+        """
+        Return the samples collected so far and start a new list (for sending them elsewhere)
+        """
+        samples, self.samples = self.samples, []
+        return samples
+
+    def export_samples(self, path):
+        """
+        Write RSS over time to a CSV file
+        """
+        export_memory_samples(self.samples, path)
+
+def peak_rss_mb(samples):
+    values = [s['rss_mb'] for s in samples if s['rss_mb'] is not None]
+    return max(values) if values else None
+
+def export_memory_samples(samples, path):
+    """
+    Write RSS samples (of one or several drivers) to a CSV file
+    """
+    samples = sorted(samples, key=lambda s: s['timestamp'])
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=MEMORY_LOG_FIELDS)
+        writer.writeheader()
+        writer.writerows(samples)
+    recycles = sum(1 for s in samples if s['recycled'])
+    print(f"💾 Browser memory log saved to: {path} (peak {peak_rss_mb(samples)} MB, {recycles} recycles)")
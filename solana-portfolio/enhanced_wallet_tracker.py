@@ -3,27 +3,63 @@
 Enhanced multi-wallet tracker that clicks PnL popup for detailed data
 """
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import time
+from functools import partial
 import pandas as pd
 from datetime import datetime
 
-def get_detailed_wallet_data(wallet_address, driver):
+from browser_setup import portfolio_url
+from label_index import LabelIndex
+from result_cache import cache_kind, cache_lookup, cache_store
+from page_readiness import wait_for_portfolio_page, wait_for_pnl_popup, total_wait_seconds
+from wallet_pool import track_wallets_in_pool
+from network_capture import get_network_wallet_data
+from browser_daemon import daemon_available, submit_wallet_jobs
+from async_scheduler import track_wallets_async
+from fetch_retry import track_wallets_with_retry
+from popup_extraction import click_holdings_pnl, extract_popup_data, extract_all_periods
+from history_store import append_history, history_available, HISTORY_ROOT
+from snapshot_db import record_snapshots
+
+# Extra Chrome flags for the popup tracker
+CHROME_ARGUMENTS = ["--disable-blink-features=AutomationControlled"]
+
+# Columns filled with 'ERROR' when a wallet cannot be fetched
+ERROR_COLUMNS = ('net_worth', 'holdings_pnl', 'jup_holdings', 'detailed_pnl_data')
+NETWORK_ERROR_COLUMNS = ('net_worth', 'holdings_pnl', 'jup_holdings')
+
+def get_detailed_wallet_data(wallet_address, driver, extraction_mode='text', base_url=None,
+                             max_age=None, all_periods=False):
     """
     Get detailed portfolio data by clicking on Holdings PnL popup
+
+    extraction_mode='script' reads the popup with one execute_script call
+    and stores compact pnl_summary / pnl_rows instead of the page text.
+    A cached result younger than max_age seconds is reused (see result_cache.py).
+    all_periods=True (script mode) also switches the popup through 1d/7d/30d/All
+    and stores each period in pnl_periods.
     """
-    url = f"https://jup.ag/portfolio/{wallet_address}"
+    url = portfolio_url(wallet_address, base_url)
+
+    kind = cache_kind(f'detailed_{extraction_mode}' + ('_periods' if all_periods else ''), base_url)
+    cached = cache_lookup(wallet_address, kind, max_age)
+    if cached is not None:
+        return cached
 
     try:
         print(f"📊 Loading wallet: {wallet_address[:8]}...")
 
         driver.get(url)
-        time.sleep(8)  # Wait for main page to load
+        wait_timings = {}
+        wait_for_portfolio_page(driver, timings=wait_timings)
+
+        if extraction_mode == 'script':
+            portfolio_data = get_scripted_wallet_data(wallet_address, driver, wait_timings, all_periods)
+            popup_read = bool(portfolio_data['pnl_summary'] or portfolio_data['pnl_rows'])
+            return cache_store(wallet_address, kind, portfolio_data, max_age, complete=popup_read)
 
         # Get basic page text first
         basic_text = driver.find_element(By.TAG_NAME, "body").text
@@ -35,63 +71,48 @@ def get_detailed_wallet_data(wallet_address, driver):
             'holdings_pnl': 'N/A',
             'jup_holdings': 'N/A',
             'detailed_pnl_data': 'N/A',
+            'page_wait_seconds': 0,
             'status': 'success'
         }
 
         # Extract basic data
-        lines = basic_text.split('\n')
-        for i, line in enumerate(lines):
-            if 'Net Worth' in line and i+1 < len(lines):
-                portfolio_data['net_worth'] = lines[i+1].strip()
-            elif 'Holdings PnL' in line and i+1 < len(lines):
-                portfolio_data['holdings_pnl'] = lines[i+1].strip()
-            elif 'JUP Holdings' in line and i+1 < len(lines):
-                portfolio_data['jup_holdings'] = lines[i+1].strip()
+        labels = LabelIndex(basic_text)
+        portfolio_data['net_worth'] = labels.text('Net Worth')
+        portfolio_data['holdings_pnl'] = labels.text('Holdings PnL')
+        portfolio_data['jup_holdings'] = labels.text('JUP Holdings')
 
         # Now try to click on Holdings PnL for detailed data
         print(f"🔍 Looking for Holdings PnL clickable element...")
 
         try:
-            # Try different ways to find the Holdings PnL clickable element
-            pnl_elements = driver.find_elements(By.XPATH, "//*[contains(text(), 'Holdings PnL')]")
-
-            if pnl_elements:
-                print(f"   Found {len(pnl_elements)} PnL elements, trying to click...")
-
-                # Try clicking the first clickable one
-                for element in pnl_elements:
-                    try:
-                        # Check if element is clickable
-                        if element.is_enabled() and element.is_displayed():
-                            print(f"   Clicking on PnL element...")
-                            driver.execute_script("arguments[0].click();", element)
-                            time.sleep(5)  # Wait for popup
-
-                            # Get the updated page content (should include popup)
-                            popup_content = driver.find_element(By.TAG_NAME, "body").text
-
-                            # Extract detailed PnL info
-                            if len(popup_content) > len(basic_text):
-                                print(f"   ✅ Got detailed popup data! ({len(popup_content)} vs {len(basic_text)} chars)")
-                                portfolio_data['detailed_pnl_data'] = popup_content
-
-                                # Show first 500 chars of new content
-                                new_content = popup_content[len(basic_text):]
-                                print(f"   📝 New popup content preview: {new_content[:200]}...")
-                            else:
-                                print(f"   ⚠️ No additional content detected")
-
-                            break
-                    except Exception as click_error:
-                        print(f"   ❌ Click failed: {click_error}")
-                        continue
+            if click_holdings_pnl(driver):
+                wait_for_pnl_popup(driver, timings=wait_timings)
+
+                # Get the updated page content (should include popup)
+                popup_content = driver.find_element(By.TAG_NAME, "body").text
+
+                # Extract detailed PnL info
+                if len(popup_content) > len(basic_text):
+                    print(f"   ✅ Got detailed popup data! ({len(popup_content)} vs {len(basic_text)} chars)")
+                    portfolio_data['detailed_pnl_data'] = popup_content
+
+                    # Show first 500 chars of new content
+                    new_content = popup_content[len(basic_text):]
+                    print(f"   📝 New popup content preview: {new_content[:200]}...")
+                else:
+                    print(f"   ⚠️ No additional content detected")
             else:
                 print(f"   ⚠️ No Holdings PnL elements found")
 
         except Exception as popup_error:
             print(f"   ❌ Popup extraction failed: {popup_error}")
 
-        return portfolio_data
+        portfolio_data['page_wait_seconds'] = total_wait_seconds(wait_timings)
+        print(f"   ⏱️ Waited {portfolio_data['page_wait_seconds']}s: {wait_timings}")
+
+        # Without the popup the row is only partial: don't cache it
+        popup_read = portfolio_data['detailed_pnl_data'] != 'N/A'
+        return cache_store(wallet_address, kind, portfolio_data, max_age, complete=popup_read)
 
     except Exception as e:
         print(f"❌ Error with wallet {wallet_address[:8]}: {e}")
@@ -105,43 +126,135 @@ def get_detailed_wallet_data(wallet_address, driver):
             'status': f'error: {str(e)}'
         }
 
-def track_wallets_with_popup_data(wallet_addresses):
+def get_scripted_wallet_data(wallet_address, driver, wait_timings, all_periods=False):
     """
-    Track multiple wallets with detailed popup data
+    Popup data through popup_extraction.py (one small WebDriver transfer)
     """
-    print(f"🚀 Starting enhanced tracking for {len(wallet_addresses)} wallets...")
-
-    # Set up Chrome driver
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-
-    results = []
-
-    try:
-        driver = webdriver.Chrome(options=chrome_options)
-
-        for i, wallet in enumerate(wallet_addresses, 1):
-            print(f"\n[{i}/{len(wallet_addresses)}] Processing wallet...")
-            wallet_data = get_detailed_wallet_data(wallet, driver)
-            results.append(wallet_data)
-
-            # Small delay between requests
-            time.sleep(3)
-
-        driver.quit()
+    portfolio_data = {
+        'wallet': wallet_address,
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'net_worth': 'N/A',
+        'holdings_pnl': 'N/A',
+        'jup_holdings': 'N/A',
+        'detailed_pnl_data': 'N/A',
+        'pnl_summary': {},
+        'pnl_rows': [],
+        'page_wait_seconds': 0,
+        'status': 'success'
+    }
+
+    if click_holdings_pnl(driver):
+        wait_for_pnl_popup(driver, timings=wait_timings)
+    else:
+        print(f"   ⚠️ No Holdings PnL elements found")
+
+    popup_data = extract_popup_data(driver)
+    portfolio_data['net_worth'] = popup_data['header'].get('Net Worth', 'N/A')
+    portfolio_data['holdings_pnl'] = popup_data['header'].get('Holdings PnL', 'N/A')
+    portfolio_data['jup_holdings'] = popup_data['header'].get('JUP Holdings', 'N/A')
+    portfolio_data['pnl_summary'] = popup_data['summary']
+    portfolio_data['pnl_rows'] = popup_data['rows']
+
+    if popup_data['found']:
+        print(f"   ✅ Got {len(popup_data['rows'])} PnL rows and {len(popup_data['summary'])} summary stats")
+        if all_periods:
+            # Same popup, other periods: no extra page loads
+            portfolio_data['pnl_periods'] = extract_all_periods(driver, timings=wait_timings)
+            print(f"   📅 Captured periods: {', '.join(portfolio_data['pnl_periods']) or 'none'}")
+    else:
+        print(f"   ⚠️ PnL popup not found")
+
+    portfolio_data['page_wait_seconds'] = total_wait_seconds(wait_timings)
+    return portfolio_data
+
+def track_wallets_with_popup_data(wallet_addresses, workers=1, fetch_mode='popup', use_daemon=False,
+                                  use_async=False, memory_log_path=None):
+    """
+    Track multiple wallets with detailed popup data
 
-    except Exception as e:
-        print(f"❌ Driver error: {e}")
-        try:
-            driver.quit()
-        except:
-            pass
+    With workers > 1 the wallets are spread over a pool of browser
+    processes, each with its own Chrome driver. With use_daemon=True the
+    jobs go to a running browser_daemon.py instead (if there is one).
+    With use_async=True an asyncio scheduler runs `workers` drivers in
+    threads and paces requests with a per-host rate limit.
+
+    fetch_mode='popup' reads the rendered popup text, fetch_mode='script'
+    reads the popup with one execute_script call (pnl_summary / pnl_rows),
+    fetch_mode='periods' does the same for 1d/7d/30d/All (pnl_periods),
+    fetch_mode='network' reads the JSON responses behind it (holdings and
+    pnl_records columns).
+
+    memory_log_path writes the browser's RSS over time (serial and pool mode).
+    If WALLET_SNAPSHOT_DB is set, the results are also inserted there
+    (see snapshot_db.py).
+    """
+    print(f"🚀 Starting enhanced tracking for {len(wallet_addresses)} wallets ({fetch_mode} mode)...")
+
+    if use_daemon:
+        if daemon_available():
+            print("🔥 Using warm drivers from the browser daemon")
+            if fetch_mode == 'network':
+                results = submit_wallet_jobs(wallet_addresses, 'network', NETWORK_ERROR_COLUMNS)
+            elif fetch_mode in ('script', 'periods'):
+                results = submit_wallet_jobs(wallet_addresses, fetch_mode, ERROR_COLUMNS)
+            else:
+                results = submit_wallet_jobs(wallet_addresses, 'detailed', ERROR_COLUMNS)
+            return pd.DataFrame(record_snapshots(results, fetch_mode))
+        print("⚠️ Browser daemon not running, starting a local Chrome")
+
+    if fetch_mode == 'network':
+        fetch_function = get_network_wallet_data
+        error_columns = NETWORK_ERROR_COLUMNS
+        driver_settings = {'extra_arguments': CHROME_ARGUMENTS, 'performance_logging': True,
+                           'block_resources': True, 'persistent_profile': True}
+    elif fetch_mode == 'script':
+        fetch_function = partial(get_detailed_wallet_data, extraction_mode='script')
+        error_columns = ERROR_COLUMNS
+        driver_settings = {'extra_arguments': CHROME_ARGUMENTS, 'block_resources': True,
+                           'persistent_profile': True}
+    elif fetch_mode == 'periods':
+        fetch_function = partial(get_detailed_wallet_data, extraction_mode='script', all_periods=True)
+        error_columns = ERROR_COLUMNS
+        driver_settings = {'extra_arguments': CHROME_ARGUMENTS, 'block_resources': True,
+                           'persistent_profile': True}
+    else:
+        fetch_function = get_detailed_wallet_data
+        error_columns = ERROR_COLUMNS
+        driver_settings = {'extra_arguments': CHROME_ARGUMENTS, 'block_resources': True,
+                           'persistent_profile': True}
+
+    if use_async:
+        results = track_wallets_async(
+            wallet_addresses,
+            fetch_function,
+            max_concurrency=workers,
+            driver_settings=driver_settings,
+            error_columns=error_columns
+        )
+        return pd.DataFrame(record_snapshots(results, fetch_mode))
+
+    if workers > 1:
+        results = track_wallets_in_pool(
+            wallet_addresses,
+            fetch_function,
+            workers=workers,
+            driver_settings=driver_settings,
+            error_columns=error_columns,
+            memory_log_path=memory_log_path
+        )
+        return pd.DataFrame(record_snapshots(results, fetch_mode))
+
+    results = track_wallets_with_retry(
+        wallet_addresses,
+        fetch_function,
+        driver_settings=driver_settings,
+        error_columns=error_columns,
+        delay_between=3,
+        memory_log_path=memory_log_path
+    )
 
     # Convert to DataFrame
-    df = pd.DataFrame(results)
+    df = pd.DataFrame(record_snapshots(results, fetch_mode))
     return df
 
 def display_enhanced_summary(df):
@@ -161,8 +274,16 @@ def display_enhanced_summary(df):
         print(f"   Checked: {row['timestamp']}")
 
         # Show if we got detailed data
-        if row['detailed_pnl_data'] != 'N/A' and row['detailed_pnl_data'] != 'ERROR':
-            print(f"   ✅ Got detailed PnL data ({len(str(row['detailed_pnl_data']))} chars)")
+        detailed_data = row.get('detailed_pnl_data', 'N/A')
+        if isinstance(row.get('pnl_periods'), dict):
+            periods = ', '.join(f"{p}: {len(data['rows'])} rows" for p, data in row['pnl_periods'].items())
+            print(f"   ✅ Got PnL for all periods ({periods})")
+        elif isinstance(row.get('pnl_rows'), list):
+            print(f"   ✅ Got {len(row['pnl_rows'])} PnL rows (script extraction)")
+        elif isinstance(row.get('holdings'), list):
+            print(f"   ✅ Got {len(row['holdings'])} holdings and {len(row['pnl_records'])} PnL records")
+        elif detailed_data != 'N/A' and detailed_data != 'ERROR':
+            print(f"   ✅ Got detailed PnL data ({len(str(detailed_data))} chars)")
         else:
             print(f"   ⚠️ No detailed PnL data")
 
@@ -174,8 +295,9 @@ if __name__ == "__main__":
         "61rVn8zeoikzFuT2cuXAd3Qv9RxhMDvG52xL4LHLv7Nu",  # The one with $2.2M PnL
     ]
 
-    # Track all wallets with popup data
-    results_df = track_wallets_with_popup_data(wallets_to_track)
+    # Track all wallets with popup data (and log browser memory)
+    memory_log = f"browser_memory_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
+    results_df = track_wallets_with_popup_data(wallets_to_track, memory_log_path=memory_log)
 
     # Display results
     display_enhanced_summary(results_df)
@@ -185,9 +307,14 @@ if __name__ == "__main__":
     results_df.to_csv(csv_filename, index=False)
     print(f"\n💾 Results saved to: {csv_filename}")
 
+    # Append to the Parquet history (typed, partitioned by date / wallet)
+    if history_available():
+        written = append_history(results_df)
+        print(f"🗃️ History: {written['snapshots']} snapshots, {written['tokens']} token rows added to {HISTORY_ROOT}")
+
     # Show sample of detailed data if available
     for index, row in results_df.iterrows():
-        if row['detailed_pnl_data'] != 'N/A' and row['detailed_pnl_data'] != 'ERROR':
+        if row.get('detailed_pnl_data', 'N/A') not in ('N/A', 'ERROR'):
             print(f"\n📋 Sample detailed data for {row['wallet'][:8]}:")
             print("-" * 50)
             print(str(row['detailed_pnl_data'])[:1000] + "...")
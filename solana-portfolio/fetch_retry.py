@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Retry with exponential backoff, driver replacement and a per-host circuit breaker
+"""
+
+import random
+import time
+from datetime import datetime
+from selenium.common.exceptions import WebDriverException
+
+from browser_setup import create_driver, driver_is_alive
+from driver_recycling import DriverRecycler
+
+MAX_ATTEMPTS = 3
+BASE_DELAY = 2.0
+
+# Pause a host after this many failures in a row
+FAILURE_THRESHOLD = 4
+COOLDOWN_SECONDS = 60
+
+class CircuitBreaker:
+    """
+    Stops hitting a host for a while after repeated failures
+
+    After the cooldown one trial request goes through; a success closes
+    the breaker again, a failure opens it for another cooldown.
+    """
+
+    def __init__(self, host, failure_threshold=FAILURE_THRESHOLD, cooldown=COOLDOWN_SECONDS):
+        self.host = host
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+
+    def remaining_pause(self):
+        if self.opened_at is None:
+            return 0
+        return max(0, self.cooldown - (time.time() - self.opened_at))
+
+    def wait_if_open(self):
+        """
+        Sleep until the cooldown is over (no-op while the breaker is closed)
+        """
+        pause = self.remaining_pause()
+        if pause > 0:
+            print(f"   ⛔ {self.host} paused after {self.failures} failures, waiting {pause:.0f}s...")
+            time.sleep(pause)
+
+    def record_success(self):
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self):
+        self.failures += 1
+        if self.failures >= self.failure_threshold:
+            self.opened_at = time.time()
+
+# One breaker per host, shared by everything in this process
+host_breakers = {}
+
+def get_breaker(host):
+    """
+    Get (or create) the circuit breaker for a host
+    """
+    if host not in host_breakers:
+        host_breakers[host] = CircuitBreaker(host)
+    return host_breakers[host]
+
+def make_error_row(wallet_address, error, error_columns=()):
+    """
+    Build a result row for a wallet that could not be fetched
+    """
+    row = {
+        'wallet': wallet_address,
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+    }
+    for column in error_columns:
+        row[column] = 'ERROR'
+    row['status'] = f'error: {error}'
+    return row
+
+def is_error_row(row):
+    """
+    Fetch functions catch their own errors and return a row with an error status
+    """
+    return str(row.get('status', '')).startswith('error')
+
+def replace_driver(driver, driver_settings):
+    """
+    Quit a broken driver and start a fresh one
+    """
+    print("   ♻️ Replacing crashed Chrome driver...")
+    try:
+        driver.quit()
+    except Exception:
+        pass
+    return create_driver(**driver_settings)
+
+def fetch_with_retry(fetch_function, wallet_address, driver, driver_settings=None,
+                     max_attempts=MAX_ATTEMPTS, base_delay=BASE_DELAY, host='jup.ag'):
+    """
+    Fetch one wallet, retrying with exponential backoff
+
+    Returns (row, driver) - the driver is a new one if the old one died.
+    """
+    driver_settings = driver_settings or {}
+    breaker = get_breaker(host)
+
+    for attempt in range(1, max_attempts + 1):
+        breaker.wait_if_open()
+
+        try:
+            row = fetch_function(wallet_address, driver)
+        except WebDriverException as e:
+            row = make_error_row(wallet_address, e)
+
+        row['attempts'] = attempt
+        if not is_error_row(row):
+            breaker.record_success()
+            return row, driver
+
+        breaker.record_failure()
+
+        if not driver_is_alive(driver):
+            driver = replace_driver(driver, driver_settings)
+
+        if attempt < max_attempts:
+            delay = base_delay * 2 ** (attempt - 1) + random.uniform(0, base_delay)
+            print(f"   🔁 Attempt {attempt} failed for {wallet_address[:8]}, retrying in {delay:.1f}s...")
+            time.sleep(delay)
+
+    return row, driver
+
+def track_wallets_with_retry(wallet_addresses, fetch_function, driver_settings=None,
+                             error_columns=(), delay_between=2, memory_log_path=None):
+    """
+    Serial tracking loop that survives Chrome crashes
+
+    Every wallet gets a row: if Chrome can't even be restarted, the
+    remaining wallets get error rows and the results so far are kept.
+    The driver is recycled between wallets when it gets too big (see
+    driver_recycling.py); memory_log_path saves RSS over time as CSV.
+    """
+    driver_settings = driver_settings or {}
+    recycler = DriverRecycler(driver_settings)
+    results = []
+    driver = None
+
+    try:
+        driver = create_driver(**driver_settings)
+
+        for i, wallet in enumerate(wallet_addresses, 1):
+            print(f"\n[{i}/{len(wallet_addresses)}] Processing wallet...")
+            wallet_data, driver = fetch_with_retry(fetch_function, wallet, driver, driver_settings)
+
+            if is_error_row(wallet_data):
+                for column in error_columns:
+                    wallet_data.setdefault(column, 'ERROR')
+            results.append(wallet_data)
+
+            # Small delay between requests (cache hits didn't load a page)
+            if i < len(wallet_addresses) and wallet_data.get('cache') != 'hit':
+                driver = recycler.check(driver)
+                time.sleep(delay_between)
+
+    except Exception as e:
+        print(f"❌ Driver error: {e}")
+        for wallet in wallet_addresses[len(results):]:
+            results.append(make_error_row(wallet, e, error_columns))
+
+    finally:
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+        if memory_log_path:
+            recycler.export_samples(memory_log_path)
+
+    return results
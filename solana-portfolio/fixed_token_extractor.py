@@ -3,29 +3,28 @@
 Fixed token extractor that properly gets the detailed popup data
 """
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-import time
-import re
 
-def extract_detailed_portfolio_data(wallet_address):
+from browser_setup import create_driver, portfolio_url, print_page_load_stats
+from page_readiness import wait_for_portfolio_page, wait_for_pnl_popup
+from page_regions import popup_region
+from pnl_table_parser import parse_pnl_table, format_holdings
+from popup_extraction import click_holdings_pnl
+
+def extract_detailed_portfolio_data(wallet_address, base_url=None):
     """
     Extract detailed portfolio data including token holdings
     """
-    url = f"https://jup.ag/portfolio/{wallet_address}"
-
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
+    url = portfolio_url(wallet_address, base_url)
 
     try:
-        driver = webdriver.Chrome(options=chrome_options)
+        driver = create_driver(block_resources=True)
         driver.get(url)
-        time.sleep(8)
+        wait_timings = {}
+        wait_for_portfolio_page(driver, timings=wait_timings)
+        print_page_load_stats(driver)
 
         # Get basic page content first
         basic_content = driver.find_element(By.TAG_NAME, "body").text
@@ -36,62 +35,20 @@ def extract_detailed_portfolio_data(wallet_address):
         print("\n=== ATTEMPTING TO CLICK HOLDINGS PNL ===")
 
         try:
-            # Try multiple selectors to find the clickable PnL element
-            possible_selectors = [
-                "//*[contains(text(), 'Holdings PnL')]",
-                "//*[contains(text(), '$') and contains(text(), 'PnL')]",
-                "//div[contains(@class, 'pnl') or contains(@class, 'holdings')]",
-                "//*[text()='Holdings PnL']/..",
-            ]
-
-            clicked = False
-            for selector in possible_selectors:
-                try:
-                    elements = driver.find_elements(By.XPATH, selector)
-                    print(f"Found {len(elements)} elements with selector: {selector}")
-
-                    for i, element in enumerate(elements):
-                        try:
-                            if element.is_displayed() and element.is_enabled():
-                                print(f"Attempting to click element {i+1}")
-
-                                # Try different click methods
-                                try:
-                                    element.click()
-                                    clicked = True
-                                    print("✅ Standard click successful!")
-                                    break
-                                except:
-                                    try:
-                                        driver.execute_script("arguments[0].click();", element)
-                                        clicked = True
-                                        print("✅ JavaScript click successful!")
-                                        break
-                                    except:
-                                        print("❌ Click failed")
-                                        continue
-                        except Exception as e:
-                            print(f"❌ Element {i+1} click error: {e}")
-                            continue
-
-                    if clicked:
-                        break
-
-                except Exception as e:
-                    print(f"❌ Selector error: {e}")
-                    continue
+            clicked = click_holdings_pnl(driver)
 
             if clicked:
                 print("🎉 Successfully clicked! Waiting for popup...")
-                time.sleep(10)  # Give more time for popup to load
+                wait_for_pnl_popup(driver, timings=wait_timings)
+                print(f"⏱️ Wait timings: {wait_timings}")
 
                 # Get updated page content
                 detailed_content = driver.find_element(By.TAG_NAME, "body").text
                 print("\n=== DETAILED POPUP CONTENT ===")
                 print(detailed_content)
 
-                # Extract token holdings from detailed content
-                tokens = extract_tokens_from_content(detailed_content)
+                # Extract token holdings from the popup only (nav text gives false matches)
+                tokens = extract_tokens_from_content(popup_region(detailed_content, basic_content))
                 return {
                     'basic_content': basic_content,
                     'detailed_content': detailed_content,
@@ -129,28 +86,11 @@ def extract_detailed_portfolio_data(wallet_address):
 def extract_tokens_from_content(content):
     """
     Extract token holdings from the detailed content
+
+    The old "SYMBOL $value" regexes never matched the popup's one-value-per-line
+    table, so the shared PnL table parser is used.
     """
-    tokens = []
-
-    # Look for patterns like "GIGA $2.61K", "JTO $67.59", etc.
-    patterns = [
-        r'([A-Z]{2,10})\s*\$([0-9,.]+[KMB]?)',  # "GIGA $2.61K"
-        r'\$([0-9,.]+[KMB]?)\s*([A-Z]{2,10})',  # "$2.61K GIGA"
-        r'([A-Z]{2,10})\s*([0-9,.]+)\s*\$',     # "GIGA 1000 $"
-    ]
-
-    for pattern in patterns:
-        matches = re.findall(pattern, content)
-        for match in matches:
-            if len(match) == 2:
-                # Format: (token, amount) or (amount, token)
-                if match[0].replace('.', '').replace(',', '').isdigit():
-                    tokens.append(f"{match[1]}: ${match[0]}")
-                else:
-                    tokens.append(f"{match[0]}: ${match[1]}")
-
-    # Remove duplicates
-    return list(set(tokens))
+    return format_holdings(parse_pnl_table(content))
 
 if __name__ == "__main__":
     # Test with the wallet from the screenshot
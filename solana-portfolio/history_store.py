@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Columnar history of tracking results (Parquet, partitioned by date and wallet)
+
+Every tracker run used to leave one more timestamped CSV behind, and the
+enhanced ones carry kilobytes of raw page text per row. Here results are
+appended as typed Parquet files under history/snapshots and history/tokens,
+in date=YYYY-MM-DD/wallet=<address> folders. Reads filter on wallet and
+time range before touching any data (partition pruning + predicate
+pushdown) and load only the requested columns. Needs pyarrow.
+"""
+
+import argparse
+import glob
+import os
+import time
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+
+from token_rows import token_table_from_results
+from value_parser import parse_values
+
+HISTORY_ROOT = os.environ.get(
+    'WALLET_HISTORY_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'history')
+)
+
+# Snapshot columns stored as float64 (parsed from the page strings)
+SNAPSHOT_VALUE_COLUMNS = ['net_worth', 'holdings_pnl', 'jup_holdings', 'win_rate', 'total_txns',
+                          'avg_pnl_per_asset', 'page_wait_seconds']
+
+# Partition folders per dataset: date=YYYY-MM-DD/wallet=<address>
+PARTITION_COLUMNS = ['date', 'wallet']
+
+def require_pyarrow():
+    if pa is None:
+        raise ImportError("pyarrow is not installed (pip install pyarrow)")
+
+def partitioning():
+    return ds.partitioning(pa.schema([(column, pa.string()) for column in PARTITION_COLUMNS]), flavor='hive')
+
+def history_available():
+    return pa is not None
+
+def new_records(results):
+    """
+    Successful results that aren't already stored (cache hits were stored when first fetched)
+    """
+    records = results.to_dict('records') if isinstance(results, pd.DataFrame) else list(results)
+    return [record for record in records if record.get('status') == 'success' and record.get('cache') != 'hit']
+
+def snapshot_table(records):
+    """
+    One typed row per result: numbers instead of '$2.23M' strings, no raw page text
+    """
+    frame = pd.DataFrame(records)
+    timestamps = pd.to_datetime(frame['timestamp'])
+    columns = {
+        'date': timestamps.dt.strftime('%Y-%m-%d'),
+        'wallet': frame['wallet'].astype(str),
+        'timestamp': timestamps.astype('datetime64[s]'),
+    }
+    for column in SNAPSHOT_VALUE_COLUMNS:
+        columns[column] = parse_values(frame[column]) if column in frame else float('nan')
+    columns['token_count'] = frame['token_count'].fillna(0).astype('int64') if 'token_count' in frame else 0
+    return pa.Table.from_pandas(pd.DataFrame(columns), preserve_index=False)
+
+def token_table(records):
+    """
+    Token rows of the results (from TokenTable), with the snapshot time added
+    """
+    record_numbers = []
+    tokens = token_table_from_results(records, record_numbers)
+    if not len(tokens):
+        return None
+
+    # Per record, not per wallet: a batch can hold several snapshots of one wallet
+    wallets = tokens.column('wallet')
+    times = pd.to_datetime(pd.Series([records[number]['timestamp'] for number in record_numbers]))
+
+    table = tokens.to_arrow()
+    table = table.set_column(table.schema.get_field_index('wallet'), 'wallet',
+                             pa.array(wallets, type=pa.string()))
+    table = table.append_column('timestamp', pa.array(times.astype('datetime64[s]')))
+    return table.append_column('date', pa.array(times.dt.strftime('%Y-%m-%d')))
+
+def write_partitioned(table, dataset_path):
+    # A new uniquely named file per partition and call: appends never rewrite old files
+    ds.write_dataset(
+        table, dataset_path, format='parquet',
+        partitioning=partitioning(),
+        basename_template=f"part-{time.time_ns()}-{os.getpid()}-{{i}}.parquet",
+        existing_data_behavior='overwrite_or_ignore',
+    )
+
+def append_history(results, root=HISTORY_ROOT):
+    """
+    Append new successful tracker results (DataFrame or list of dicts)
+
+    Returns how many snapshot and token rows were written.
+    """
+    require_pyarrow()
+    records = new_records(results)
+    if not records:
+        return {'snapshots': 0, 'tokens': 0}
+
+    write_partitioned(snapshot_table(records), os.path.join(root, 'snapshots'))
+    tokens = token_table(records)
+    if tokens is not None:
+        write_partitioned(tokens, os.path.join(root, 'tokens'))
+    return {'snapshots': len(records), 'tokens': tokens.num_rows if tokens is not None else 0}
+
+def read_history(kind='snapshots', wallets=None, start=None, end=None, columns=None,
+                 symbols=None, root=HISTORY_ROOT):
+    """
+    DataFrame of stored rows, filtered before reading
+
+    kind is 'snapshots' or 'tokens'. wallets and the start / end times
+    prune whole partition folders; the timestamp and symbol filters are
+    pushed down to the Parquet row groups. columns=None reads all columns.
+    """
+    require_pyarrow()
+    dataset_path = os.path.join(root, kind)
+    if not os.path.isdir(dataset_path):
+        return pd.DataFrame(columns=columns or [])
+
+    dataset = ds.dataset(dataset_path, format='parquet', partitioning=partitioning())
+    conditions = []
+    if wallets is not None:
+        conditions.append(ds.field('wallet').isin(list(wallets)))
+    if start is not None:
+        start = pd.Timestamp(start)
+        conditions.append(ds.field('date') >= start.strftime('%Y-%m-%d'))
+        conditions.append(ds.field('timestamp') >= pa.scalar(start.to_pydatetime(), pa.timestamp('s')))
+    if end is not None:
+        end = pd.Timestamp(end)
+        conditions.append(ds.field('date') <= end.strftime('%Y-%m-%d'))
+        conditions.append(ds.field('timestamp') <= pa.scalar(end.to_pydatetime(), pa.timestamp('s')))
+    if symbols is not None:
+        conditions.append(ds.field('symbol').isin(list(symbols)))
+
+    condition = None
+    for part in conditions:
+        condition = part if condition is None else condition & part
+
+    frame = dataset.to_table(columns=columns, filter=condition).to_pandas()
+    return frame.sort_values('timestamp', ignore_index=True) if 'timestamp' in frame else frame
+
+def read_snapshots(wallets=None, start=None, end=None, columns=None, root=HISTORY_ROOT):
+    return read_history('snapshots', wallets, start, end, columns, root=root)
+
+def read_tokens(wallets=None, start=None, end=None, columns=None, symbols=None, root=HISTORY_ROOT):
+    return read_history('tokens', wallets, start, end, columns, symbols, root=root)
+
+def compact_history(kind='snapshots', root=HISTORY_ROOT):
+    """
+    Merge the small files of each partition folder into one (appends add a file per run)
+    """
+    require_pyarrow()
+    merged = 0
+    for folder, _, files in os.walk(os.path.join(root, kind)):
+        parts = sorted(name for name in files if name.endswith('.parquet'))
+        if len(parts) < 2:
+            continue
+        table = pa.concat_tables(pq.read_table(os.path.join(folder, name)) for name in parts)
+        temp_path = os.path.join(folder, 'compacted.tmp')
+        pq.write_table(table, temp_path)
+        for name in parts:
+            os.remove(os.path.join(folder, name))
+        os.replace(temp_path, os.path.join(folder, f"part-{time.time_ns()}-compacted.parquet"))
+        merged += 1
+    return merged
+
+def import_csv_history(paths, root=HISTORY_ROOT):
+    """
+    Load old portfolio_tracking_*.csv / enhanced_portfolio_tracking_*.csv exports
+    """
+    totals = {'snapshots': 0, 'tokens': 0}
+    for path in paths:
+        written = append_history(pd.read_csv(path, dtype=str, keep_default_na=False), root)
+        totals['snapshots'] += written['snapshots']
+        totals['tokens'] += written['tokens']
+        print(f"   📥 {os.path.basename(path)}: {written['snapshots']} snapshots, {written['tokens']} token rows")
+    return totals
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Parquet history of wallet tracking results")
+    parser.add_argument('--import', dest='import_files', nargs='+', metavar='CSV',
+                        help="append old tracker CSV exports to the history")
+    parser.add_argument('--wallet', help="show the stored net worth / PnL of a wallet")
+    parser.add_argument('--days', type=int, default=90)
+    parser.add_argument('--compact', action='store_true', help="merge small files per partition")
+    args = parser.parse_args()
+
+    if args.import_files:
+        paths = [path for pattern in args.import_files for path in sorted(glob.glob(pattern))]
+        totals = import_csv_history(paths)
+        print(f"✅ Imported {totals['snapshots']} snapshots and {totals['tokens']} token rows into {HISTORY_ROOT}")
+
+    if args.compact:
+        merged = sum(compact_history(kind) for kind in ('snapshots', 'tokens'))
+        print(f"🧹 Compacted {merged} partitions")
+
+    if args.wallet:
+        history = read_snapshots([args.wallet], start=datetime.now() - timedelta(days=args.days),
+                                 columns=['timestamp', 'net_worth', 'holdings_pnl'])
+        print(history.to_string(index=False) if len(history) else "No history for this wallet")
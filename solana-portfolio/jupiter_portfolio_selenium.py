@@ -3,33 +3,30 @@
 Get Jupiter portfolio data using Selenium - the working version!
 """
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 import time
 
-def get_jupiter_portfolio_data(wallet_address):
+from browser_setup import create_driver, portfolio_url, print_page_load_stats
+from label_index import LabelIndex
+from page_readiness import wait_for_portfolio_page
+
+def get_jupiter_portfolio_data(wallet_address, base_url=None):
     """
     Get portfolio data from Jupiter using Selenium (with all PnL and values)
     """
-    url = f"https://jup.ag/portfolio/{wallet_address}"
-
-    # Set up Chrome options
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")  # Run in background
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
+    url = portfolio_url(wallet_address, base_url)
 
     try:
         print(f"📊 Fetching portfolio data for: {wallet_address}")
         print(f"🔗 URL: {url}")
 
-        driver = webdriver.Chrome(options=chrome_options)
+        driver = create_driver(block_resources=True)
         driver.get(url)
 
         # Wait for portfolio data to load
         print("⏳ Waiting for portfolio data to load...")
-        time.sleep(10)
+        wait_for_portfolio_page(driver)
+        print_page_load_stats(driver)
 
         # Extract portfolio data
         page_text = driver.find_element(By.TAG_NAME, "body").text
@@ -47,14 +44,10 @@ def get_jupiter_portfolio_data(wallet_address):
                 portfolio_values.append(text)
 
         # Extract specific metrics from visible text
-        lines = page_text.split('\n')
-        for i, line in enumerate(lines):
-            if 'Net Worth' in line and i+1 < len(lines):
-                portfolio_data['net_worth'] = lines[i+1]
-            elif 'Holdings PnL' in line and i+1 < len(lines):
-                portfolio_data['holdings_pnl'] = lines[i+1]
-            elif 'JUP Holdings' in line and i+1 < len(lines):
-                portfolio_data['jup_holdings'] = lines[i+1]
+        labels = LabelIndex(page_text)
+        portfolio_data['net_worth'] = labels.text('Net Worth')
+        portfolio_data['holdings_pnl'] = labels.text('Holdings PnL')
+        portfolio_data['jup_holdings'] = labels.text('JUP Holdings')
 
         portfolio_data['all_dollar_values'] = portfolio_values
         portfolio_data['wallet'] = wallet_address
@@ -0,0 +1,337 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for jup.ag/portfolio that serves recorded pages
+
+Makes the scraping pipeline testable offline and benchmarks repeatable:
+every wallet gets the same page, with a fixed server latency, a delay
+before the page "renders" and a delay before the Holdings PnL popup
+fills in. Pages are seeded from the CSV exports in data/ and from JSON
+fixtures recorded with record_fixture().
+
+Point the trackers at it with base_url or the environment variable:
+    JUPITER_PORTFOLIO_URL=http://localhost:8765/portfolio
+"""
+
+import argparse
+import csv
+import glob
+import json
+import os
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+STANDIN_PORT = 8765
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+
+# Default timings (seconds)
+DEFAULT_LATENCY = 0.2
+DEFAULT_RENDER_DELAY = 1.0
+DEFAULT_POPUP_DELAY = 0.5
+
+# What jup.ag shows for a wallet without assets
+EMPTY_FIXTURE = {
+    'page_lines': ['Portfolio', 'Net Worth', '$0.00', '0.00 SOL', 'Holdings PnL', '$0.00',
+                   'JUP Holdings', '0.00', 'No asset detected'],
+    'popup_lines': [],
+}
+
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html>
+<head><meta charset="utf-8"><title>Portfolio | Jupiter (stand-in)</title></head>
+<body>
+<div id="app">Loading...</div>
+<script>
+const fixture = __FIXTURE__;
+const renderDelay = __RENDER_DELAY__;
+const popupDelay = __POPUP_DELAY__;
+
+function fillLines(element, lines) {
+    element.innerHTML = '';
+    for (const line of lines) {
+        const div = document.createElement('div');
+        div.textContent = line;
+        element.appendChild(div);
+    }
+}
+
+function openPopup() {
+    if (document.querySelector('[role="dialog"]') || fixture.popup_lines.length === 0) {
+        return;
+    }
+    const dialog = document.createElement('div');
+    dialog.setAttribute('role', 'dialog');
+    dialog.textContent = 'Loading...';
+    document.body.appendChild(dialog);
+    setTimeout(function() { fillLines(dialog, fixture.popup_lines); }, popupDelay);
+}
+
+setTimeout(function() {
+    const app = document.getElementById('app');
+    fillLines(app, fixture.page_lines);
+    for (const div of app.children) {
+        if (div.textContent === 'Holdings PnL') {
+            div.style.cursor = 'pointer';
+            div.addEventListener('click', openPopup);
+        }
+    }
+}, renderDelay);
+</script>
+</body>
+</html>
+"""
+
+def split_page_text(text):
+    """
+    Split recorded page text (with the popup open) into page and popup lines
+
+    The popup is appended after the page and starts with the "Trader"
+    card right before "Trader PnL".
+    """
+    lines = [line.strip() for line in text.split('\n') if line.strip()]
+    if 'Trader PnL' not in lines:
+        return lines, []
+
+    start = lines.index('Trader PnL')
+    for i in range(start - 1, -1, -1):
+        if lines[i] == 'Trader':
+            start = i
+            break
+    return lines[:start], lines[start:]
+
+def load_csv_fixtures(data_dir=DATA_DIR):
+    """
+    Build fixtures from the tracker CSV exports (newest snapshot per wallet)
+
+    enhanced_portfolio_tracking_*.csv has the full page text including the
+    popup; portfolio_tracking_*.csv only has the header values, so those
+    wallets get a page without popup. The detailed snapshot always wins.
+    """
+    csv.field_size_limit(2 ** 31 - 1)
+    fixtures = {}
+
+    basic_files = sorted(glob.glob(os.path.join(data_dir, 'portfolio_tracking_*.csv')))
+    detailed_files = sorted(glob.glob(os.path.join(data_dir, 'enhanced_portfolio_tracking_*.csv')))
+
+    for path in basic_files + detailed_files:
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                if row.get('status') != 'success':
+                    continue
+
+                page_text = row.get('detailed_pnl_data', '')
+                if page_text and page_text != 'N/A':
+                    page_lines, popup_lines = split_page_text(page_text)
+                else:
+                    page_lines = ['Portfolio', 'Net Worth', row['net_worth'], 'Holdings PnL',
+                                  row['holdings_pnl'], 'JUP Holdings', row['jup_holdings']]
+                    popup_lines = []
+
+                fixtures[row['wallet']] = {'page_lines': page_lines, 'popup_lines': popup_lines}
+
+    return fixtures
+
+def load_json_fixtures(fixture_dir):
+    """
+    Load fixtures recorded with record_fixture()
+    """
+    fixtures = {}
+    for path in sorted(glob.glob(os.path.join(fixture_dir, '*.json'))):
+        with open(path, encoding='utf-8') as f:
+            fixture = json.load(f)
+        fixtures[fixture['wallet']] = {
+            'page_lines': fixture['page_lines'],
+            'popup_lines': fixture['popup_lines'],
+        }
+    return fixtures
+
+def record_fixture(wallet_address, fixture_dir, driver):
+    """
+    Save the live jup.ag page and popup of a wallet as a JSON fixture
+    """
+    from selenium.webdriver.common.by import By
+    from browser_setup import DEFAULT_PORTFOLIO_URL
+    from page_readiness import wait_for_portfolio_page, wait_for_pnl_popup
+    from popup_extraction import click_holdings_pnl
+
+    driver.get(f"{DEFAULT_PORTFOLIO_URL}/{wallet_address}")
+    wait_for_portfolio_page(driver)
+    if click_holdings_pnl(driver):
+        wait_for_pnl_popup(driver)
+
+    page_lines, popup_lines = split_page_text(driver.find_element(By.TAG_NAME, "body").text)
+
+    os.makedirs(fixture_dir, exist_ok=True)
+    path = os.path.join(fixture_dir, f"{wallet_address}.json")
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'wallet': wallet_address,
+            'recorded_at': time.strftime('%Y-%m-%d %H:%M:%S'),
+            'page_lines': page_lines,
+            'popup_lines': popup_lines,
+        }, f, indent=2, ensure_ascii=False)
+
+    print(f"💾 Fixture saved: {path} ({len(page_lines)} page lines, {len(popup_lines)} popup lines)")
+    return path
+
+def render_page(fixture, render_delay, popup_delay):
+    """
+    HTML page that shows the fixture after the render delay
+    """
+    fixture_json = json.dumps(fixture).replace('</', '<\\/')
+    return (PAGE_TEMPLATE
+            .replace('__FIXTURE__', fixture_json)
+            .replace('__RENDER_DELAY__', str(int(render_delay * 1000)))
+            .replace('__POPUP_DELAY__', str(int(popup_delay * 1000))))
+
+class StandinHandler(BaseHTTPRequestHandler):
+    """
+    GET /portfolio/<wallet> returns the recorded page, anything else 404
+    """
+
+    def do_GET(self):
+        server = self.server
+        time.sleep(server.latency)
+
+        parts = self.path.split('?')[0].strip('/').split('/')
+        if len(parts) != 2 or parts[0] != 'portfolio':
+            self.send_error(404)
+            return
+
+        wallet = parts[1]
+        fixture = server.fixtures.get(wallet, EMPTY_FIXTURE)
+        with server.stats_lock:
+            server.stats['requests'] += 1
+            server.stats['known' if wallet in server.fixtures else 'unknown'] += 1
+
+        body = render_page(fixture, server.render_delay, server.popup_delay).encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+def create_standin_server(fixtures, port=STANDIN_PORT, latency=DEFAULT_LATENCY,
+                          render_delay=DEFAULT_RENDER_DELAY, popup_delay=DEFAULT_POPUP_DELAY):
+    """
+    Build the HTTP server (call serve_forever() or use start_standin_server)
+    """
+    server = ThreadingHTTPServer(('localhost', port), StandinHandler)
+    server.daemon_threads = True
+    server.fixtures = fixtures
+    server.latency = latency
+    server.render_delay = render_delay
+    server.popup_delay = popup_delay
+    server.stats = {'requests': 0, 'known': 0, 'unknown': 0}
+    server.stats_lock = threading.Lock()
+    return server
+
+def start_standin_server(fixtures=None, port=STANDIN_PORT, **timings):
+    """
+    Run the stand-in in a background thread and return (server, base_url)
+
+    Stop it with server.shutdown().
+    """
+    if fixtures is None:
+        fixtures = load_csv_fixtures()
+    server = create_standin_server(fixtures, port, **timings)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://localhost:{server.server_address[1]}/portfolio"
+
+def benchmark_trackers(wallet_addresses, base_url, backends=None, use_cache=False):
+    """
+    Run the basic tracker backends against a base_url and compare throughput
+
+    backends maps a name to keyword arguments for track_multiple_wallets.
+    The result cache is off unless use_cache=True; otherwise later backends
+    would mostly read the rows cached by the first one.
+    """
+    import result_cache
+    from multi_wallet_tracker import track_multiple_wallets
+
+    backends = backends or {
+        'serial': {},
+        'pool x2': {'workers': 2},
+        'tabs x4': {'tabs': 4},
+    }
+
+    # The environment variable also reaches pool workers and their drivers
+    previous = os.environ.get('JUPITER_PORTFOLIO_URL')
+    os.environ['JUPITER_PORTFOLIO_URL'] = base_url
+    previous_ttl = os.environ.get('WALLET_CACHE_TTL'), result_cache.RESULT_CACHE_TTL
+    if not use_cache:
+        # Module value for this process and forked workers, variable for spawned ones
+        os.environ['WALLET_CACHE_TTL'] = '0'
+        result_cache.RESULT_CACHE_TTL = 0
+
+    report = []
+    try:
+        for name, options in backends.items():
+            start_time = time.time()
+            results_df = track_multiple_wallets(wallet_addresses, **options)
+            elapsed = time.time() - start_time
+
+            succeeded = (results_df['status'] == 'success').sum()
+            report.append({
+                'backend': name,
+                'wallets': len(wallet_addresses),
+                'succeeded': int(succeeded),
+                'seconds': round(elapsed, 1),
+                'wallets_per_min': round(len(wallet_addresses) / max(elapsed, 1e-9) * 60, 1),
+                'avg_page_wait': round(results_df['page_wait_seconds'].mean(), 2)
+                                 if 'page_wait_seconds' in results_df else None,
+            })
+    finally:
+        if previous is None:
+            os.environ.pop('JUPITER_PORTFOLIO_URL', None)
+        else:
+            os.environ['JUPITER_PORTFOLIO_URL'] = previous
+        if previous_ttl[0] is None:
+            os.environ.pop('WALLET_CACHE_TTL', None)
+        else:
+            os.environ['WALLET_CACHE_TTL'] = previous_ttl[0]
+        result_cache.RESULT_CACHE_TTL = previous_ttl[1]
+
+    return report
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local jup.ag/portfolio stand-in")
+    parser.add_argument('--port', type=int, default=STANDIN_PORT)
+    parser.add_argument('--latency', type=float, default=DEFAULT_LATENCY, help="server delay per request (s)")
+    parser.add_argument('--render-delay', type=float, default=DEFAULT_RENDER_DELAY, help="delay until the page shows data (s)")
+    parser.add_argument('--popup-delay', type=float, default=DEFAULT_POPUP_DELAY, help="delay until the popup shows data (s)")
+    parser.add_argument('--data-dir', default=DATA_DIR, help="folder with tracker CSV exports")
+    parser.add_argument('--fixtures', help="folder with recorded JSON fixtures")
+    parser.add_argument('--benchmark', type=int, metavar='N', help="run the trackers on N wallets and exit")
+    args = parser.parse_args()
+
+    fixtures = load_csv_fixtures(args.data_dir)
+    if args.fixtures:
+        fixtures.update(load_json_fixtures(args.fixtures))
+    print(f"📼 Loaded {len(fixtures)} wallet fixtures")
+
+    timings = {'latency': args.latency, 'render_delay': args.render_delay, 'popup_delay': args.popup_delay}
+
+    if args.benchmark:
+        server, base_url = start_standin_server(fixtures, args.port, **timings)
+        known = list(fixtures) or ['unknown_wallet']
+        wallets = [known[i % len(known)] for i in range(args.benchmark)]
+
+        report = benchmark_trackers(wallets, base_url)
+        server.shutdown()
+
+        print("\n📊 BENCHMARK (stand-in)")
+        for entry in report:
+            print(f"  {entry['backend']:<10} {entry['succeeded']}/{entry['wallets']} ok, "
+                  f"{entry['seconds']}s, {entry['wallets_per_min']} wallets/min, "
+                  f"avg page wait {entry['avg_page_wait']}s")
+    else:
+        server = create_standin_server(fixtures, args.port, **timings)
+        print(f"🧪 Stand-in running at http://localhost:{args.port}/portfolio/<wallet>")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            print("\n👋 Stand-in stopped")
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+One-pass index of the labelled values on a Jupiter page
+
+Net Worth, Holdings PnL, the popup's Summary Stats and the Distribution
+buckets are all "label, value[, more values]" on consecutive lines. Instead
+of scanning every line once per label, LabelIndex walks the text once and
+keeps the cells of every known label, so each lookup is a dict access.
+"""
+
+import re
+
+from value_parser import parse_value
+
+# Labels whose value is on the next line in the page header / popup summary
+HEADER_LABELS = ['Net Worth', 'Holdings PnL', 'JUP Holdings']
+SUMMARY_LABELS = [
+    'Holdings', 'Unrealised PnL', 'Total PnL', 'Win Rate', 'Realised PnL',
+    'Txns', 'Avg PnL per Asset', 'Avg Buy Value',
+]
+
+# Lines that belong to a label: 'Total PnL' -> '+$2.23M', '+108.84%'
+LABEL_CELLS = {
+    'Net Worth': 2,          # USD, SOL
+    'Holdings PnL': 1,
+    'JUP Holdings': 1,
+    'JUP Staked': 1,
+    'Holdings': 1,
+    'Unrealised PnL': 2,     # USD, %
+    'Total PnL': 2,
+    'Win Rate': 1,
+    'Realised PnL': 2,
+    'Txns': 4,               # total, buys, '/', sells
+    'Avg PnL per Asset': 1,
+    'Avg Buy Value': 1,
+}
+
+# Distribution section: bucket, count, '(rate%)' after this line
+DISTRIBUTION_START = 'Count (Rate)'
+BUCKET_PATTERN = re.compile(r'^(?:[<>]\s*-?\d+%|-?\d+% - -?\d+%)$')
+
+class LabelIndex:
+    """
+    Cells of every known label and the Distribution buckets of one page text
+    """
+
+    def __init__(self, text):
+        self.label_cells = {}
+        self.distribution = {}
+
+        lines = [line.strip() for line in text.split('\n')]
+        lines = [line for line in lines if line]
+        i = 0
+        while i < len(lines):
+            line = lines[i]
+            if line == DISTRIBUTION_START:
+                i = self.read_distribution(lines, i + 1)
+                continue
+
+            cell_count = LABEL_CELLS.get(line)
+            # First occurrence with a number wins ('Total PnL' is also a table column header)
+            if cell_count and line not in self.label_cells:
+                cells = lines[i + 1:i + 1 + cell_count]
+                if cells and parse_value(cells[0]) is not None:
+                    self.label_cells[line] = cells
+            i += 1
+
+    def read_distribution(self, lines, i):
+        """
+        Read bucket / count / (rate) triples; returns the index after the section
+        """
+        while i + 2 < len(lines) and BUCKET_PATTERN.match(lines[i]):
+            self.distribution[lines[i]] = {
+                'count': int(parse_value(lines[i + 1], 0)),
+                'rate': parse_value(lines[i + 2]),
+            }
+            i += 3
+        return i
+
+    def __contains__(self, label):
+        return label in self.label_cells
+
+    def text(self, label, default='N/A'):
+        """
+        The label's value as shown on the page ('+$2.23M')
+        """
+        cells = self.label_cells.get(label)
+        return cells[0] if cells else default
+
+    def value(self, label, default=None):
+        """
+        The label's value as a number (2230000.0)
+        """
+        cells = self.label_cells.get(label)
+        return parse_value(cells[0], default) if cells else default
+
+    def cells(self, label):
+        """
+        All lines of a label ('Total PnL' -> ['+$2.23M', '+108.84%'])
+        """
+        return list(self.label_cells.get(label, []))
+
+    def values(self, label):
+        """
+        All cells of a label as numbers (None where a cell isn't one)
+        """
+        return [parse_value(cell) for cell in self.label_cells.get(label, [])]
+
+    def summary(self, labels=SUMMARY_LABELS):
+        """
+        {label: text} for the labels found, like popup_extraction's summary
+        """
+        return {label: self.label_cells[label][0] for label in labels if label in self.label_cells}
+
+    def as_dict(self):
+        """
+        Every found label as a number, plus the Distribution buckets
+        """
+        typed = {label: self.value(label) for label in self.label_cells}
+        typed['distribution'] = dict(self.distribution)
+        return typed
+
+if __name__ == "__main__":
+    import csv
+    import glob
+    import os
+
+    csv.field_size_limit(2 ** 31 - 1)
+    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+    for path in sorted(glob.glob(os.path.join(data_dir, 'enhanced_portfolio_tracking_*.csv'))):
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                if row.get('detailed_pnl_data', 'N/A') not in ('N/A', 'ERROR'):
+                    print(f"🔹 {row['wallet'][:8]}")
+                    for label, value in LabelIndex(row['detailed_pnl_data']).as_dict().items():
+                        print(f"   {label}: {value}")
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Load several wallets at once in tabs of a single Chrome instance
+
+Most of the time per wallet is spent waiting for jup.ag to send data. Instead
+of starting more Chrome processes, one driver keeps K tabs loading in parallel,
+harvests each tab as soon as it is ready and reuses it for the next wallet.
+"""
+
+import time
+from datetime import datetime
+
+from browser_setup import create_driver, enable_resource_blocking, portfolio_url
+from page_readiness import NET_WORTH_SCRIPT, DOM_QUIET_SCRIPT, DOM_QUIET_PERIOD, PNL_TABLE_SCRIPT
+from popup_extraction import extract_popup_data
+from click_strategies import MAX_CLICK_ATTEMPTS, start_click, check_click
+from fetch_retry import make_error_row
+
+# Give up on a wallet after this many seconds in one state
+TAB_TIMEOUT = 30
+
+def poll_tab(driver, script):
+    """
+    Run one readiness check on the current tab (no waiting)
+    """
+    try:
+        return driver.execute_script(f"return (function() {{ {script} }})();")
+    except Exception:
+        return None
+
+def start_wallet(driver, tab, wallet_address, base_url):
+    """
+    Point a tab at a wallet without waiting for the page to load
+    """
+    driver.switch_to.window(tab['handle'])
+    driver.execute_script("window.location.href = arguments[0];", portfolio_url(wallet_address, base_url))
+    tab['wallet'] = wallet_address
+    tab['state'] = 'loading'
+    tab['clicks'] = []
+    tab['started'] = time.time()
+    tab['state_started'] = time.time()
+
+def start_popup(driver, tab):
+    """
+    Click Holdings PnL in the current tab; False if there was nothing to click
+
+    The click is verified later by polling, so a tab without a popup doesn't
+    hold up the others.
+    """
+    tried = [(attempt['selector'], attempt['method']) for attempt in tab.get('clicks', [])]
+    attempt = start_click(driver, 'holdings_pnl', skip=tried)
+    if attempt is None:
+        return False
+    tab.setdefault('clicks', []).append(attempt)
+    tab['state'] = 'popup'
+    tab['state_started'] = time.time()
+    tab['popup_open'] = False
+    return True
+
+def harvest_row(wallet_address, popup_data, started, with_popup):
+    """
+    Build a result row from the extracted page data
+    """
+    header = popup_data['header']
+    row = {
+        'wallet': wallet_address,
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'net_worth': header.get('Net Worth', 'N/A'),
+        'holdings_pnl': header.get('Holdings PnL', 'N/A'),
+        'jup_holdings': header.get('JUP Holdings', 'N/A'),
+        'page_wait_seconds': round(time.time() - started, 2),
+        'status': 'success'
+    }
+    if with_popup:
+        row['pnl_summary'] = popup_data['summary']
+        row['pnl_rows'] = popup_data['rows']
+    return row
+
+def track_wallets_in_tabs(wallet_addresses, tabs=4, with_popup=False, driver_settings=None,
+                          error_columns=(), base_url=None):
+    """
+    Fetch wallets with K concurrently loading tabs in one driver
+
+    with_popup=True also opens the Holdings PnL popup in each tab and
+    returns its summary and rows. Results come back in input order; if
+    Chrome can't start or crashes, the unfinished wallets get error rows.
+    """
+    driver_settings = driver_settings or {}
+    tabs = max(1, min(tabs, len(wallet_addresses)))
+    print(f"🗂️ Loading {len(wallet_addresses)} wallets in {tabs} tabs of one Chrome...")
+
+    results = {}
+    queue = list(enumerate(wallet_addresses))
+    driver = None
+    error = 'not fetched'
+
+    try:
+        driver = create_driver(**driver_settings)
+
+        # Open the tabs (blocking rules are per tab)
+        open_tabs = [{'handle': driver.current_window_handle}]
+        for _ in range(tabs - 1):
+            driver.switch_to.new_window('tab')
+            if driver_settings.get('block_resources'):
+                enable_resource_blocking(driver)
+            open_tabs.append({'handle': driver.current_window_handle})
+
+        for tab in open_tabs:
+            tab['state'] = 'idle'
+            if queue:
+                tab['index'], wallet = queue.pop(0)
+                start_wallet(driver, tab, wallet, base_url)
+
+        start_time = time.time()
+        while any(tab['state'] != 'idle' for tab in open_tabs):
+            for tab in open_tabs:
+                if tab['state'] == 'idle':
+                    continue
+
+                driver.switch_to.window(tab['handle'])
+                wallet = tab['wallet']
+                finished = False
+
+                if time.time() - tab['state_started'] > TAB_TIMEOUT:
+                    print(f"   ❌ {wallet[:8]} timed out while {tab['state']}")
+                    results[tab['index']] = make_error_row(wallet, f"timeout while {tab['state']}", error_columns)
+                    finished = True
+
+                elif tab['state'] == 'loading':
+                    # Until the navigation commits, the tab still shows the previous wallet
+                    if not driver.current_url.rstrip('/').endswith(wallet):
+                        continue
+                    net_worth = poll_tab(driver, NET_WORTH_SCRIPT)
+                    quiet_ms = poll_tab(driver, DOM_QUIET_SCRIPT) or 0
+                    if net_worth and quiet_ms >= DOM_QUIET_PERIOD * 1000:
+                        if not (with_popup and start_popup(driver, tab)):
+                            results[tab['index']] = harvest_row(
+                                wallet, extract_popup_data(driver), tab['started'], with_popup
+                            )
+                            finished = True
+
+                elif tab['state'] == 'popup':
+                    if not tab['popup_open']:
+                        verified = check_click(driver, tab['clicks'][-1])
+                        if verified:
+                            tab['popup_open'] = True
+                        elif verified is False and not (len(tab['clicks']) < MAX_CLICK_ATTEMPTS
+                                                        and start_popup(driver, tab)):
+                            # No popup for this wallet: keep the page values
+                            results[tab['index']] = harvest_row(
+                                wallet, extract_popup_data(driver), tab['started'], with_popup
+                            )
+                            finished = True
+                    elif poll_tab(driver, PNL_TABLE_SCRIPT):
+                        results[tab['index']] = harvest_row(
+                            wallet, extract_popup_data(driver), tab['started'], with_popup
+                        )
+                        finished = True
+
+                if finished:
+                    print(f"   ✅ [{len(results)}/{len(wallet_addresses)}] {wallet[:8]} done")
+                    if queue:
+                        tab['index'], next_wallet = queue.pop(0)
+                        start_wallet(driver, tab, next_wallet, base_url)
+                    else:
+                        tab['state'] = 'idle'
+
+            time.sleep(0.2)
+
+        elapsed = time.time() - start_time
+        print(f"✅ {len(results)} wallets in {elapsed:.1f}s with {tabs} tabs")
+
+    except Exception as e:
+        print(f"❌ Driver error: {e}")
+        error = e
+
+    finally:
+        if driver is not None:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+    # Wallets that never finished (Chrome didn't start or crashed) still get a row
+    return [
+        results.get(i, make_error_row(wallet, error, error_columns))
+        for i, wallet in enumerate(wallet_addresses)
+    ]
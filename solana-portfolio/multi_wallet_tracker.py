@@ -3,24 +3,49 @@
 Track multiple Solana wallets using Jupiter portfolio data
 """
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-import time
 import pandas as pd
 from datetime import datetime
 
-def get_single_wallet_data(wallet_address, driver):
+from browser_setup import portfolio_url
+from label_index import LabelIndex
+from result_cache import cache_kind, cache_lookup, cache_store
+from page_readiness import wait_for_portfolio_page, total_wait_seconds
+from wallet_pool import track_wallets_in_pool
+from browser_daemon import daemon_available, submit_wallet_jobs
+from async_scheduler import track_wallets_async
+from fetch_retry import track_wallets_with_retry
+from multi_tab_tracker import track_wallets_in_tabs
+from history_store import append_history, history_available, HISTORY_ROOT
+from snapshot_db import record_snapshots
+
+# Columns filled with 'ERROR' when a wallet cannot be fetched
+ERROR_COLUMNS = ('net_worth', 'holdings_pnl', 'jup_holdings')
+
+# Tuned scraping profile: skip images, fonts, media and tracking scripts,
+# and reuse a warm Chrome profile so the app's JS comes from the disk cache
+DRIVER_SETTINGS = {'block_resources': True, 'persistent_profile': True}
+
+def get_single_wallet_data(wallet_address, driver, base_url=None, max_age=None):
     """
     Get portfolio data for a single wallet using existing driver
+
+    A cached result younger than max_age seconds (default RESULT_CACHE_TTL)
+    is returned without loading the page.
     """
-    url = f"https://jup.ag/portfolio/{wallet_address}"
+    url = portfolio_url(wallet_address, base_url)
+
+    kind = cache_kind('basic', base_url)
+    cached = cache_lookup(wallet_address, kind, max_age)
+    if cached is not None:
+        return cached
 
     try:
         print(f"📊 Checking wallet: {wallet_address[:8]}...")
 
         driver.get(url)
-        time.sleep(8)  # Wait for data to load
+        wait_timings = {}
+        wait_for_portfolio_page(driver, timings=wait_timings)
 
         # Get page text
         page_text = driver.find_element(By.TAG_NAME, "body").text
@@ -32,20 +57,17 @@ def get_single_wallet_data(wallet_address, driver):
             'net_worth': 'N/A',
             'holdings_pnl': 'N/A',
             'jup_holdings': 'N/A',
+            'page_wait_seconds': total_wait_seconds(wait_timings),
             'status': 'success'
         }
 
         # Parse the text to find values
-        lines = page_text.split('\n')
-        for i, line in enumerate(lines):
-            if 'Net Worth' in line and i+1 < len(lines):
-                portfolio_data['net_worth'] = lines[i+1].strip()
-            elif 'Holdings PnL' in line and i+1 < len(lines):
-                portfolio_data['holdings_pnl'] = lines[i+1].strip()
-            elif 'JUP Holdings' in line and i+1 < len(lines):
-                portfolio_data['jup_holdings'] = lines[i+1].strip()
+        labels = LabelIndex(page_text)
+        portfolio_data['net_worth'] = labels.text('Net Worth')
+        portfolio_data['holdings_pnl'] = labels.text('Holdings PnL')
+        portfolio_data['jup_holdings'] = labels.text('JUP Holdings')
 
-        return portfolio_data
+        return cache_store(wallet_address, kind, portfolio_data, max_age)
 
     except Exception as e:
         print(f"❌ Error with wallet {wallet_address[:8]}: {e}")
@@ -58,42 +80,71 @@ def get_single_wallet_data(wallet_address, driver):
             'status': f'error: {str(e)}'
         }
 
-def track_multiple_wallets(wallet_addresses):
+def track_multiple_wallets(wallet_addresses, workers=1, use_daemon=False, use_async=False,
+                           memory_log_path=None, tabs=1):
     """
     Track multiple wallets and return results as DataFrame
+
+    With workers > 1 the wallets are spread over a pool of browser
+    processes, each with its own Chrome driver. With use_daemon=True the
+    jobs go to a running browser_daemon.py instead (if there is one).
+    With use_async=True an asyncio scheduler runs `workers` drivers in
+    threads and paces requests with a per-host rate limit.
+    memory_log_path writes the browser's RSS over time (serial and pool mode).
+    With tabs > 1 one Chrome loads that many wallets at once in tabs.
+    If WALLET_SNAPSHOT_DB is set, the results are also inserted there
+    (see snapshot_db.py).
     """
     print(f"🚀 Starting tracking for {len(wallet_addresses)} wallets...")
 
-    # Set up Chrome driver
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
-
-    results = []
-
-    try:
-        driver = webdriver.Chrome(options=chrome_options)
-
-        for i, wallet in enumerate(wallet_addresses, 1):
-            print(f"\n[{i}/{len(wallet_addresses)}] Processing wallet...")
-            wallet_data = get_single_wallet_data(wallet, driver)
-            results.append(wallet_data)
-
-            # Small delay between requests
-            time.sleep(2)
-
-        driver.quit()
-
-    except Exception as e:
-        print(f"❌ Driver error: {e}")
-        try:
-            driver.quit()
-        except:
-            pass
+    if use_daemon:
+        if daemon_available():
+            print("🔥 Using warm drivers from the browser daemon")
+            results = submit_wallet_jobs(wallet_addresses, 'basic', ERROR_COLUMNS)
+            return pd.DataFrame(record_snapshots(results, 'basic'))
+        print("⚠️ Browser daemon not running, starting a local Chrome")
+
+    if tabs > 1:
+        results = track_wallets_in_tabs(
+            wallet_addresses,
+            tabs=tabs,
+            driver_settings=DRIVER_SETTINGS,
+            error_columns=ERROR_COLUMNS
+        )
+        return pd.DataFrame(record_snapshots(results, 'basic'))
+
+    if use_async:
+        results = track_wallets_async(
+            wallet_addresses,
+            get_single_wallet_data,
+            max_concurrency=workers,
+            driver_settings=DRIVER_SETTINGS,
+            error_columns=ERROR_COLUMNS
+        )
+        return pd.DataFrame(record_snapshots(results, 'basic'))
+
+    if workers > 1:
+        results = track_wallets_in_pool(
+            wallet_addresses,
+            get_single_wallet_data,
+            workers=workers,
+            driver_settings=DRIVER_SETTINGS,
+            error_columns=ERROR_COLUMNS,
+            memory_log_path=memory_log_path
+        )
+        return pd.DataFrame(record_snapshots(results, 'basic'))
+
+    results = track_wallets_with_retry(
+        wallet_addresses,
+        get_single_wallet_data,
+        driver_settings=DRIVER_SETTINGS,
+        error_columns=ERROR_COLUMNS,
+        delay_between=2,
+        memory_log_path=memory_log_path
+    )
 
     # Convert to DataFrame for nice display
-    df = pd.DataFrame(results)
+    df = pd.DataFrame(record_snapshots(results, 'basic'))
     return df
 
 def display_portfolio_summary(df):
@@ -127,8 +178,8 @@ if __name__ == "__main__":
         # Add more wallet addresses here
     ]
 
-    # Track all wallets
-    results_df = track_multiple_wallets(wallets_to_track)
+    # Track all wallets (raise workers to fetch in parallel)
+    results_df = track_multiple_wallets(wallets_to_track, workers=2)
 
     # Display results
     display_portfolio_summary(results_df)
@@ -136,4 +187,9 @@ if __name__ == "__main__":
     # Save to CSV
     csv_filename = f"portfolio_tracking_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv"
     results_df.to_csv(csv_filename, index=False)
-    print(f"\n💾 Results saved to: {csv_filename}")
\ No newline at end of file
+    print(f"\n💾 Results saved to: {csv_filename}")
+
+    # Append to the Parquet history (typed, partitioned by date / wallet)
+    if history_available():
+        written = append_history(results_df)
+        print(f"🗃️ History: {written['snapshots']} snapshots, {written['tokens']} token rows added to {HISTORY_ROOT}")
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Read Jupiter's JSON API responses from Chrome's network log instead of page text
+
+The driver must be started with performance logging enabled:
+    driver = create_driver(performance_logging=True)
+"""
+
+import json
+import time
+from datetime import datetime
+from urllib.parse import urlparse
+from selenium.common.exceptions import WebDriverException
+
+from browser_setup import portfolio_url
+from page_readiness import wait_for_net_worth
+from popup_extraction import click_holdings_pnl
+
+# Only look at responses from these hosts (the portfolio page calls several APIs)
+JSON_HOST_HINTS = ['jup.ag', 'jupiter']
+
+# Only these API paths carry the wallet's own holdings / PnL; price feeds,
+# quotes and token lists from the same hosts also have symbol + value fields
+PORTFOLIO_PATH_HINTS = ['portfolio', 'holdings', 'balances', 'positions', 'pnl']
+
+# Seconds without a new JSON response before we treat the page as loaded
+NETWORK_QUIET_PERIOD = 1.5
+NETWORK_TIMEOUT = 25
+
+# Give up early if not a single matching JSON response arrived by then
+NETWORK_FIRST_RESPONSE_TIMEOUT = 5
+
+# Field names seen for the same value across Jupiter API payloads
+SYMBOL_KEYS = ['symbol', 'tokenSymbol', 'ticker']
+MINT_KEYS = ['mint', 'address', 'tokenAddress']
+AMOUNT_KEYS = ['amount', 'balance', 'uiAmount', 'tokenAmount']
+VALUE_KEYS = ['value', 'valueUsd', 'usdValue', 'balanceUsd', 'totalValue']
+PRICE_KEYS = ['price', 'priceUsd', 'usdPrice']
+PNL_KEYS = {
+    'unrealised_pnl': ['unrealizedPnl', 'unrealisedPnl', 'unrealizedPnlUsd'],
+    'realised_pnl': ['realizedPnl', 'realisedPnl', 'realizedPnlUsd'],
+    'total_pnl': ['totalPnl', 'pnl', 'totalPnlUsd'],
+    'avg_buy_price': ['avgBuyPrice', 'averageBuyPrice'],
+    'avg_sell_price': ['avgSellPrice', 'averageSellPrice'],
+    'last_traded': ['lastTradedAt', 'lastTradeTime', 'lastTraded'],
+}
+
+def read_network_events(driver):
+    """
+    Drain the performance log and return the Network.* events in it
+    """
+    events = []
+    for entry in driver.get_log('performance'):
+        try:
+            message = json.loads(entry['message'])['message']
+        except (KeyError, ValueError):
+            continue
+        if message.get('method', '').startswith('Network.'):
+            events.append(message)
+    return events
+
+def is_json_response(event):
+    """
+    Check if a Network.responseReceived event is an XHR/fetch JSON response
+    """
+    if event['method'] != 'Network.responseReceived':
+        return False
+
+    params = event.get('params', {})
+    response = params.get('response', {})
+    if params.get('type') not in ('XHR', 'Fetch'):
+        return False
+    if 'json' not in response.get('mimeType', ''):
+        return False
+    return any(hint in response.get('url', '') for hint in JSON_HOST_HINTS)
+
+def wait_for_json_responses(driver, quiet_period=NETWORK_QUIET_PERIOD, timeout=NETWORK_TIMEOUT,
+                            first_response_timeout=NETWORK_FIRST_RESPONSE_TIMEOUT):
+    """
+    Collect JSON response events until the network has been quiet for a while
+
+    Returns early (empty) when no matching response arrives within
+    first_response_timeout, instead of waiting the full timeout.
+    """
+    responses = {}
+    loaded = set()
+    start_time = time.time()
+    last_new_response = start_time
+
+    while time.time() - start_time < timeout:
+        for event in read_network_events(driver):
+            request_id = event.get('params', {}).get('requestId')
+            if is_json_response(event):
+                responses[request_id] = event['params']['response']['url']
+                last_new_response = time.time()
+            elif event['method'] == 'Network.loadingFinished':
+                loaded.add(request_id)
+
+        waiting_for_body = [r for r in responses if r not in loaded]
+        if responses and not waiting_for_body and time.time() - last_new_response >= quiet_period:
+            break
+        if not responses and time.time() - start_time >= first_response_timeout:
+            break
+        time.sleep(0.25)
+
+    return {request_id: url for request_id, url in responses.items() if request_id in loaded}
+
+def fetch_response_bodies(driver, responses):
+    """
+    Get the JSON body of each captured response through CDP
+    """
+    payloads = []
+    for request_id, url in responses.items():
+        try:
+            body = driver.execute_cdp_cmd('Network.getResponseBody', {'requestId': request_id})
+            payloads.append({'url': url, 'data': json.loads(body.get('body', ''))})
+        except (WebDriverException, ValueError):
+            # Body already evicted or not valid JSON
+            continue
+    return payloads
+
+def first_value(record, keys):
+    """
+    Return the first present value among alternative field names
+    """
+    for key in keys:
+        if key in record and record[key] is not None:
+            return record[key]
+    return None
+
+def walk_records(data):
+    """
+    Yield every dict nested anywhere inside a JSON payload
+    """
+    if isinstance(data, dict):
+        yield data
+        for value in data.values():
+            yield from walk_records(value)
+    elif isinstance(data, list):
+        for item in data:
+            yield from walk_records(item)
+
+def is_portfolio_payload(url):
+    path = urlparse(url).path.lower()
+    return any(hint in path for hint in PORTFOLIO_PATH_HINTS)
+
+def extract_token_records(payloads):
+    """
+    Turn captured JSON payloads into holdings and PnL records
+
+    Only payloads from portfolio endpoints are read. A dict with a token
+    symbol, a balance and a USD value becomes a holding; a dict with a token
+    symbol and any PnL field becomes a PnL record.
+    """
+    holdings = {}
+    pnl_records = {}
+
+    for payload in payloads:
+        if not is_portfolio_payload(payload['url']):
+            continue
+        for record in walk_records(payload['data']):
+            symbol = first_value(record, SYMBOL_KEYS)
+            if not isinstance(symbol, str):
+                continue
+            mint = first_value(record, MINT_KEYS) or symbol
+
+            amount = first_value(record, AMOUNT_KEYS)
+            value_usd = first_value(record, VALUE_KEYS)
+            # Both, or a price quote (value only) would be counted into net worth
+            if amount is not None and value_usd is not None:
+                holdings[mint] = {
+                    'symbol': symbol,
+                    'mint': mint,
+                    'amount': amount,
+                    'value_usd': value_usd,
+                    'price_usd': first_value(record, PRICE_KEYS),
+                }
+
+            pnl = {name: first_value(record, keys) for name, keys in PNL_KEYS.items()}
+            if any(value is not None for value in pnl.values()):
+                pnl_records[mint] = {'symbol': symbol, 'mint': mint, **pnl}
+
+    return list(holdings.values()), list(pnl_records.values())
+
+def sum_field(records, field):
+    """
+    Add up a numeric field over records, skipping missing or invalid values
+    """
+    total = 0
+    for record in records:
+        try:
+            total += float(record[field] or 0)
+        except (TypeError, ValueError):
+            pass
+    return total
+
+def get_network_wallet_data(wallet_address, driver, base_url=None):
+    """
+    Get holdings and PnL records for a wallet from Jupiter's API responses
+    """
+    url = portfolio_url(wallet_address, base_url)
+
+    try:
+        print(f"📡 Capturing network data for: {wallet_address[:8]}...")
+
+        # Throw away events from the previous wallet
+        read_network_events(driver)
+
+        driver.get(url)
+        wait_for_net_worth(driver)
+        responses = wait_for_json_responses(driver)
+
+        # The PnL data is requested when the popup opens, we don't need it painted
+        if click_holdings_pnl(driver):
+            responses.update(wait_for_json_responses(driver))
+
+        payloads = fetch_response_bodies(driver, responses)
+        holdings, pnl_records = extract_token_records(payloads)
+
+        # Nothing matched: don't report a made-up $0 portfolio
+        if not payloads or not holdings:
+            problem = 'no JSON responses captured' if not payloads else 'no holdings in the JSON responses'
+            print(f"   ⚠️ {problem}")
+            return {
+                'wallet': wallet_address,
+                'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+                'net_worth': 'N/A',
+                'holdings_pnl': 'N/A',
+                'jup_holdings': 'N/A',
+                'holdings': holdings,
+                'pnl_records': pnl_records,
+                'json_responses': len(payloads),
+                'status': f'error: {problem}'
+            }
+
+        total_value = sum_field(holdings, 'value_usd')
+        holdings_pnl = sum_field(pnl_records, 'unrealised_pnl')
+        jup_amount = sum_field([h for h in holdings if h['symbol'] == 'JUP'], 'amount')
+
+        print(f"   ✅ {len(payloads)} JSON responses, {len(holdings)} holdings, {len(pnl_records)} PnL records")
+
+        return {
+            'wallet': wallet_address,
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'net_worth': f"${total_value:,.2f}",
+            # No PnL records (popup data missing) is unknown, not zero
+            'holdings_pnl': f"{'+' if holdings_pnl >= 0 else '-'}${abs(holdings_pnl):,.2f}" if pnl_records else 'N/A',
+            'jup_holdings': f"{jup_amount:,.2f}",
+            'holdings': holdings,
+            'pnl_records': pnl_records,
+            'json_responses': len(payloads),
+            'status': 'success'
+        }
+
+    except Exception as e:
+        print(f"❌ Error with wallet {wallet_address[:8]}: {e}")
+        return {
+            'wallet': wallet_address,
+            'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'net_worth': 'ERROR',
+            'holdings_pnl': 'ERROR',
+            'jup_holdings': 'ERROR',
+            'holdings': [],
+            'pnl_records': [],
+            'json_responses': 0,
+            'status': f'error: {str(e)}'
+        }
+
+if __name__ == "__main__":
+    from browser_setup import create_driver
+
+    wallet = "A1N45nJh8eRn2zhXxP7SkqNKvR6rPXhbVgKzBGBxKEm8"
+    driver = create_driver(performance_logging=True)
+
+    try:
+        result = get_network_wallet_data(wallet, driver)
+    finally:
+        driver.quit()
+
+    print(f"\n💰 Holdings for {wallet[:8]}:")
+    for holding in result['holdings']:
+        print(f"  - {holding['symbol']}: {holding['amount']} (${holding['value_usd']})")
+
+    print(f"\n📈 PnL records:")
+    for record in result['pnl_records']:
+        print(f"  - {record['symbol']}: total {record['total_pnl']}, realised {record['realised_pnl']}")
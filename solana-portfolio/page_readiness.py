@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Wait for Jupiter portfolio pages to be ready instead of sleeping a fixed time
+"""
+
+import time
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+# Default timeouts (seconds) for each readiness condition
+NET_WORTH_TIMEOUT = 20
+PNL_TABLE_TIMEOUT = 20
+DOM_STABLE_TIMEOUT = 10
+DOM_QUIET_PERIOD = 1.0
+
+# Returns the value shown under "Net Worth" once it has been rendered
+NET_WORTH_SCRIPT = """
+const text = document.body ? document.body.innerText : '';
+const match = text.match(/Net Worth\\n\\s*([^\\n]+)/);
+if (match && /[0-9]/.test(match[1])) {
+    return match[1].trim();
+}
+return null;
+"""
+
+# Counts PnL table rows (token + value lines) after the "Position %" header
+PNL_TABLE_SCRIPT = """
+const text = document.body ? document.body.innerText : '';
+const start = text.indexOf('Position %');
+if (start === -1) {
+    return 0;
+}
+const lines = text.slice(start).split('\\n').slice(1);
+let rows = 0;
+for (const line of lines) {
+    if (/^[+-]?\\$[0-9]/.test(line.trim())) {
+        rows += 1;
+    }
+}
+return rows;
+"""
+
+# Installs a MutationObserver once and returns ms since the last added / removed node.
+# Text changes are ignored: live prices and the "Updated Xs ago" label change every
+# second, so a quiet period including them would rarely happen.
+DOM_QUIET_SCRIPT = """
+if (window.__lastDomMutation === undefined) {
+    window.__lastDomMutation = Date.now();
+    new MutationObserver(function() {
+        window.__lastDomMutation = Date.now();
+    }).observe(document, {subtree: true, childList: true});
+}
+return Date.now() - window.__lastDomMutation;
+"""
+
+# Symbols and status words of the PnL table (lines without digits): changes when
+# rows are added, removed or replaced, but not when a price ticks
+PNL_TABLE_SIGNATURE_SCRIPT = """
+const text = document.body ? document.body.innerText : '';
+const start = text.indexOf('Position %');
+if (start === -1) {
+    return '';
+}
+return text.slice(start).split('\\n').slice(1)
+    .map(function(line) { return line.trim(); })
+    .filter(function(line) { return line && !/[0-9]/.test(line); })
+    .join('|');
+"""
+
+def record_wait(timings, name, start_time):
+    """
+    Store how long a wait took in the timings dict (if one was given)
+    """
+    elapsed = round(time.time() - start_time, 2)
+    if timings is not None:
+        timings[name] = elapsed
+    return elapsed
+
+def wait_for_condition(driver, script, timeout, poll_frequency=0.25):
+    """
+    Poll a JavaScript check until it returns something truthy
+
+    Returns the script result, or None if the timeout was hit.
+    """
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(
+            lambda d: d.execute_script(script)
+        )
+    except (TimeoutException, WebDriverException):
+        return None
+
+def wait_for_net_worth(driver, timeout=NET_WORTH_TIMEOUT, timings=None):
+    """
+    Wait until the "Net Worth" value is populated on the portfolio page
+    """
+    start_time = time.time()
+    net_worth = wait_for_condition(driver, NET_WORTH_SCRIPT, timeout)
+    elapsed = record_wait(timings, 'net_worth', start_time)
+
+    if net_worth is None:
+        print(f"   ⚠️ Net Worth not ready after {elapsed}s")
+        return False
+    return True
+
+def wait_for_pnl_table(driver, timeout=PNL_TABLE_TIMEOUT, min_rows=1, timings=None):
+    """
+    Wait until the Holdings PnL popup table has rendered rows
+    """
+    start_time = time.time()
+    rows = wait_for_condition(
+        driver,
+        f"const rows = (function() {{ {PNL_TABLE_SCRIPT} }})(); return rows >= {min_rows} ? rows : 0;",
+        timeout
+    )
+    elapsed = record_wait(timings, 'pnl_table', start_time)
+
+    if not rows:
+        print(f"   ⚠️ PnL table not ready after {elapsed}s")
+        return False
+    return True
+
+def wait_for_dom_stable(driver, quiet_period=DOM_QUIET_PERIOD, timeout=DOM_STABLE_TIMEOUT,
+                        timings=None, name='dom_stable'):
+    """
+    Wait until the DOM has not changed for quiet_period seconds
+    """
+    start_time = time.time()
+    quiet_ms = int(quiet_period * 1000)
+    stable = wait_for_condition(
+        driver,
+        f"const quiet = (function() {{ {DOM_QUIET_SCRIPT} }})(); return quiet >= {quiet_ms};",
+        timeout
+    )
+    elapsed = record_wait(timings, name, start_time)
+
+    if not stable:
+        print(f"   ⚠️ DOM still changing after {elapsed}s")
+        return False
+    return True
+
+def wait_for_table_stable(driver, quiet_period=DOM_QUIET_PERIOD, timeout=DOM_STABLE_TIMEOUT,
+                          timings=None, name='pnl_table_stable', poll_frequency=0.25):
+    """
+    Wait until the PnL table's rows have not changed for quiet_period seconds
+    """
+    start_time = time.time()
+    last = {'signature': None, 'changed': start_time}
+
+    def settled(d):
+        signature = d.execute_script(PNL_TABLE_SIGNATURE_SCRIPT)
+        now = time.time()
+        if signature != last['signature']:
+            last['signature'] = signature
+            last['changed'] = now
+        return now - last['changed'] >= quiet_period
+
+    try:
+        stable = WebDriverWait(driver, timeout, poll_frequency=poll_frequency).until(settled)
+    except (TimeoutException, WebDriverException):
+        stable = False
+    elapsed = record_wait(timings, name, start_time)
+
+    if not stable:
+        print(f"   ⚠️ PnL table still changing after {elapsed}s")
+        return False
+    return True
+
+def wait_for_portfolio_page(driver, timings=None):
+    """
+    Wait for the main portfolio page: Net Worth shown and DOM settled
+    """
+    ready = wait_for_net_worth(driver, timings=timings)
+    wait_for_dom_stable(driver, timings=timings)
+    return ready
+
+def wait_for_pnl_popup(driver, timings=None):
+    """
+    Wait for the Holdings PnL popup: table rows shown and no longer changing
+    """
+    ready = wait_for_pnl_table(driver, timings=timings)
+    wait_for_table_stable(driver, timings=timings)
+    return ready
+
+def total_wait_seconds(timings):
+    """
+    Sum of all recorded waits for one wallet
+    """
+    return round(sum(timings.values()), 2)
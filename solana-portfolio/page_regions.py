@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Find the Holdings PnL popup inside the page text once
+
+body.text after the click is the whole page: nav ("Swap Pro Perps Lend
+..."), header, wallet card and then the popup. Parsers only need the popup,
+so its boundaries are located once (anchor lines, or the difference to the
+text before the click) and only that slice is handed on. Python strings
+can't be shared as a memoryview, so the bounds are offsets and the region
+is copied exactly once.
+"""
+
+import re
+
+# First line of the popup summary and first line of the table area
+POPUP_ANCHOR = 'Trader PnL'
+TABLE_ANCHOR = 'Recently Traded'
+
+def line_pattern(label):
+    return re.compile(r'^[ \t]*' + re.escape(label) + r'[ \t]*\r?$', re.MULTILINE)
+
+POPUP_ANCHOR_PATTERN = line_pattern(POPUP_ANCHOR)
+TABLE_ANCHOR_PATTERN = line_pattern(TABLE_ANCHOR)
+
+def common_prefix_length(a, b):
+    """
+    Length of the common prefix, by binary search over slice compares (C speed)
+    """
+    low, high = 0, min(len(a), len(b))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if a[:middle] == b[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+def changed_bounds(page_text, basic_text):
+    """
+    (start, end) of the lines that are new compared to the page before the click
+    """
+    prefix = common_prefix_length(page_text, basic_text)
+    # The suffix may not overlap the prefix in either text
+    limit = min(len(page_text), len(basic_text)) - prefix
+    suffix = common_prefix_length(page_text[::-1][:limit], basic_text[::-1][:limit])
+
+    if prefix == len(page_text):
+        return prefix, prefix
+
+    # Widen to whole lines
+    if page_text.startswith('\n', prefix):
+        prefix += 1
+    start = page_text.rfind('\n', 0, prefix) + 1
+    end = len(page_text) - suffix
+    if suffix:
+        line_end = page_text.find('\n', max(end - 1, start))
+        end = line_end if line_end != -1 else len(page_text)
+    return start, max(start, end)
+
+def popup_bounds(page_text, basic_text=None):
+    """
+    (start, end) offsets of the popup in the page text
+
+    Starts at the "Trader PnL" line; without it, the part that changed
+    since basic_text (the page before the click) is used, otherwise the
+    whole text.
+    """
+    match = POPUP_ANCHOR_PATTERN.search(page_text)
+    if match:
+        return match.start(), len(page_text)
+    if basic_text:
+        return changed_bounds(page_text, basic_text)
+    return 0, len(page_text)
+
+def table_bounds(page_text, basic_text=None):
+    """
+    (start, end) offsets of the popup's table area ("Recently Traded" onwards)
+    """
+    start, end = popup_bounds(page_text, basic_text)
+    match = TABLE_ANCHOR_PATTERN.search(page_text, start, end)
+    return (match.start(), end) if match else (start, end)
+
+def popup_region(page_text, basic_text=None):
+    """
+    The popup part of the page text (summary stats + table)
+    """
+    start, end = popup_bounds(page_text, basic_text)
+    return page_text[start:end]
+
+def table_region(page_text, basic_text=None):
+    """
+    Only the table area of the popup
+    """
+    start, end = table_bounds(page_text, basic_text)
+    return page_text[start:end]
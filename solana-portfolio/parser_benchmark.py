@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Speed and correctness check for every popup text parser
+
+The corpus is the test_content fixture from test_clean_extraction.py, the
+raw popup snapshots in ../data/enhanced_portfolio_tracking_*.csv and a
+synthetic large wallet built from them (the same rows copied under new
+symbols). Every extractor runs on each corpus; the script reports lines/s
+and peak allocated memory (tracemalloc) and compares the outputs with
+parser_golden.json. Exits with code 1 if an output changed.
+
+    python parser_benchmark.py                  # benchmark + golden check
+    python parser_benchmark.py --rows 2000      # bigger synthetic wallet
+    python parser_benchmark.py --update-golden  # accept the current outputs
+"""
+
+import argparse
+import csv
+import glob
+import importlib
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from pnl_table_parser import ROW_FIELDS, STATUS_MARKERS, TABLE_HEADER_END, parse_pnl_table
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'parser_golden.json')
+
+# name -> (module, function); modules whose dependencies are missing are skipped
+EXTRACTORS = {
+    'current_holdings_only': ('current_holdings_only', 'extract_only_current_holdings'),
+    'precise_token_extractor': ('precise_token_extractor', 'extract_current_balances'),
+    'test_clean_extraction': ('test_clean_extraction', 'parse_popup_content'),
+    'fixed_token_extractor': ('fixed_token_extractor', 'extract_tokens_from_content'),
+    'portfolio_dashboard': ('portfolio_dashboard', 'extract_current_tokens'),
+    'pnl_table_parser': ('pnl_table_parser', 'parse_pnl_table'),
+}
+
+# Token rows of the synthetic large wallet
+DEFAULT_SYNTHETIC_ROWS = 500
+
+SYNTHETIC_CORPUS = 'large_wallet'
+
+def load_extractors():
+    extractors = {}
+    for name, (module_name, function_name) in EXTRACTORS.items():
+        try:
+            extractors[name] = getattr(importlib.import_module(module_name), function_name)
+        except ImportError as e:
+            print(f"⚠️ Skipping {name}: {e}")
+    return extractors
+
+def load_corpus(data_dir=DATA_DIR):
+    """
+    name -> popup text: the test fixture plus every archived popup snapshot
+    """
+    from test_clean_extraction import test_content
+
+    corpus = {'test_content': test_content}
+    csv.field_size_limit(2 ** 31 - 1)
+    for path in sorted(glob.glob(os.path.join(data_dir, 'enhanced_portfolio_tracking_*.csv'))):
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                page_text = row.get('detailed_pnl_data', '')
+                if row.get('status') == 'success' and page_text not in ('', 'N/A', 'ERROR'):
+                    corpus[f"snapshot_{row['wallet'][:8]}_{row['timestamp']}"] = page_text
+    return corpus
+
+def render_row(row, symbol):
+    """
+    A parsed table row back as popup lines
+    """
+    lines = [symbol, row['last_traded']]
+    # "Sold all" / "Holding" replace the first cell of a pair and the pair's second cell is left out
+    markers = {field: text for text, (status, field) in STATUS_MARKERS.items() if status == row['status']}
+
+    fields = iter(ROW_FIELDS)
+    for field in fields:
+        if field in markers:
+            lines.append(markers[field])
+            next(fields)
+        else:
+            lines.append(row[field])
+    return lines
+
+def build_large_wallet(popup_content, row_count):
+    """
+    Page text with row_count table rows: the original rows, then copies with numbered symbols
+    """
+    lines = popup_content.split('\n')
+    header = lines[:lines.index(TABLE_HEADER_END) + 1] if TABLE_HEADER_END in lines else []
+    rows = parse_pnl_table(popup_content)
+
+    table = []
+    for index in range(row_count):
+        row = rows[index % len(rows)]
+        copy = index // len(rows)
+        table.extend(render_row(row, row['symbol'] if copy == 0 else f"{row['symbol']}{copy}"))
+    return '\n'.join(header + table)
+
+def comparable(output):
+    """
+    JSON-safe output; order of plain string lists doesn't matter (some extractors use sets)
+    """
+    output = json.loads(json.dumps(output))
+    if isinstance(output, list) and all(isinstance(item, str) for item in output):
+        return sorted(output)
+    return output
+
+def measure(function, text, min_seconds=0.5):
+    """
+    Lines per second (repeating until min_seconds) and peak traced KiB of one call
+    """
+    line_count = text.count('\n') + 1
+    repeats = 0
+    start_time = time.perf_counter()
+    while True:
+        output = function(text)
+        repeats += 1
+        elapsed = time.perf_counter() - start_time
+        if elapsed >= min_seconds:
+            break
+
+    tracemalloc.start()
+    function(text)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return output, line_count * repeats / elapsed, peak / 1024
+
+def run_benchmark(row_count=DEFAULT_SYNTHETIC_ROWS, data_dir=DATA_DIR, min_seconds=0.5):
+    """
+    Run every extractor on every corpus entry; returns result rows with outputs
+    """
+    extractors = load_extractors()
+    corpus = load_corpus(data_dir)
+    largest = max(corpus.values(), key=lambda text: len(parse_pnl_table(text)))
+    corpus[SYNTHETIC_CORPUS] = build_large_wallet(largest, row_count)
+
+    results = []
+    for corpus_name, text in corpus.items():
+        for name, function in extractors.items():
+            output, lines_per_second, peak_kib = measure(function, text, min_seconds)
+            results.append({
+                'corpus': corpus_name,
+                'extractor': name,
+                'lines': text.count('\n') + 1,
+                'lines_per_second': lines_per_second,
+                'peak_kib': peak_kib,
+                'output': comparable(output),
+            })
+    return results
+
+def golden_entry(result):
+    # The synthetic wallet is too big to store in full; its size is what matters
+    if result['corpus'] == SYNTHETIC_CORPUS:
+        return {'count': len(result['output'])}
+    return result['output']
+
+def check_golden(results, golden):
+    """
+    Mismatch messages (empty list = all outputs as expected)
+    """
+    problems = []
+    for result in results:
+        expected = golden.get(result['corpus'], {}).get(result['extractor'])
+        if expected is None:
+            problems.append(f"{result['corpus']} / {result['extractor']}: no golden output yet")
+        elif golden_entry(result) != expected:
+            problems.append(f"{result['corpus']} / {result['extractor']}: output differs from golden")
+    return problems
+
+def print_report(results):
+    print(f"\n{'corpus':<40} {'extractor':<24} {'lines':>7} {'lines/s':>12} {'peak KiB':>9} {'out':>5}")
+    for result in results:
+        print(f"{result['corpus'][:40]:<40} {result['extractor']:<24} {result['lines']:>7} "
+              f"{result['lines_per_second']:>12,.0f} {result['peak_kib']:>9.1f} {len(result['output']):>5}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark the popup parsers against the golden corpus")
+    parser.add_argument('--rows', type=int, default=DEFAULT_SYNTHETIC_ROWS, help="token rows of the synthetic wallet")
+    parser.add_argument('--seconds', type=float, default=0.5, help="minimum timing per extractor and corpus")
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--update-golden', action='store_true', help="store the current outputs as golden")
+    args = parser.parse_args()
+
+    print(f"⏱️ Benchmarking popup parsers (synthetic wallet: {args.rows} rows)")
+    results = run_benchmark(args.rows, args.data_dir, args.seconds)
+    print_report(results)
+
+    if args.update_golden:
+        golden = {}
+        for result in results:
+            golden.setdefault(result['corpus'], {})[result['extractor']] = golden_entry(result)
+        with open(GOLDEN_PATH, 'w') as f:
+            json.dump(golden, f, indent=2, sort_keys=True)
+        print(f"\n💾 Golden outputs saved to {GOLDEN_PATH}")
+        sys.exit(0)
+
+    golden = {}
+    if os.path.exists(GOLDEN_PATH):
+        with open(GOLDEN_PATH) as f:
+            golden = json.load(f)
+
+    problems = check_golden(results, golden)
+    if problems:
+        print(f"\n❌ {len(problems)} golden mismatches:")
+        for problem in problems:
+            print(f"   {problem}")
+        sys.exit(1)
+    print("\n✅ All outputs match the golden corpus")
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Single-pass parser for the Holdings PnL table in Jupiter's popup text
+
+The table is rendered one cell per line. After the header
+("Price USD ... Position %") every row is the token symbol, its "last
+traded" age and 13 value cells:
+
+    Unrealised   PnL, %      (or "Sold all" when nothing is left)
+    Realised     PnL, %      (or "Holding" when nothing was sold)
+    Total PnL    PnL, %
+    Balance      USD, amount
+    Bought / Avg USD, price
+    Sold / Avg   USD, price
+    Position %
+
+The parser walks the lines once, keeps only the row being filled and
+never looks more than one line ahead.
+"""
+
+import re
+
+from value_parser import parse_value
+
+TABLE_HEADER_END = 'Position %'
+
+# "27d", "5h", "14m" ... the line right after a token symbol
+AGE_PATTERN = re.compile(r'^\d+[smhdwy]$')
+
+# The 13 value cells of a row, in table order
+ROW_FIELDS = (
+    'unrealised_pnl', 'unrealised_pct',
+    'realised_pnl', 'realised_pct',
+    'total_pnl', 'total_pct',
+    'balance_usd', 'balance_amount',
+    'bought_usd', 'avg_buy_price',
+    'sold_usd', 'avg_sell_price',
+    'position_pct',
+)
+TABLE_COLUMNS = ('symbol', 'last_traded', 'status') + ROW_FIELDS
+
+# A single marker cell that stands in for a pair of cells
+STATUS_MARKERS = {
+    'Sold all': ('sold', 'unrealised_pnl'),
+    'Holding': ('holding', 'realised_pnl'),
+}
+
+def new_row(symbol, age):
+    row = dict.fromkeys(TABLE_COLUMNS)
+    row['symbol'] = symbol
+    row['last_traded'] = age
+    row['status'] = 'traded'
+    return row
+
+def iter_pnl_rows(lines):
+    """
+    Yield one dict per complete table row (all values are the raw strings)
+
+    Works on popup text with or without the table header: rows seen
+    before a header are dropped once the header shows up.
+    """
+    rows_before_header = []
+    header_seen = False
+    row = None
+    field = len(ROW_FIELDS)
+    previous = None
+
+    for raw_line in lines:
+        line = raw_line.strip()
+        if not line:
+            continue
+
+        if line == TABLE_HEADER_END:
+            header_seen = True
+            rows_before_header = []
+            row, field, previous = None, len(ROW_FIELDS), None
+            continue
+
+        if row is not None and field < len(ROW_FIELDS):
+            # Filling the value cells of the current row
+            marker = STATUS_MARKERS.get(line)
+            if marker and ROW_FIELDS[field] == marker[1]:
+                row['status'] = marker[0]
+                field += 2
+            else:
+                row[ROW_FIELDS[field]] = line
+                field += 1
+
+            if field >= len(ROW_FIELDS):
+                if header_seen:
+                    yield row
+                else:
+                    rows_before_header.append(row)
+            continue
+
+        # Between rows: a symbol is recognised by the age line after it
+        if previous is not None and AGE_PATTERN.match(line):
+            row, field = new_row(previous, line), 0
+            previous = None
+        else:
+            previous = line
+
+    # Popup text without a header (e.g. just the table part)
+    if not header_seen:
+        for row in rows_before_header:
+            yield row
+
+def parse_pnl_table(popup_content):
+    """
+    All complete rows of the PnL table in popup text
+    """
+    return list(iter_pnl_rows(popup_content.split('\n')))
+
+def current_holdings(rows, min_balance=0):
+    """
+    Rows that still hold tokens worth more than min_balance USD
+    """
+    held = []
+    for row in rows:
+        balance = parse_value(row['balance_usd'])
+        if row['status'] != 'sold' and balance is not None and balance > min_balance:
+            held.append(row)
+    return held
+
+def format_holdings(rows, min_balance=0):
+    """
+    Holdings in the old "SYMBOL: $balance" string format
+    """
+    return [f"{row['symbol']}: {row['balance_usd']}" for row in current_holdings(rows, min_balance)]
+
+if __name__ == "__main__":
+    from test_clean_extraction import test_content
+
+    for row in parse_pnl_table(test_content):
+        print(f"{row['symbol']:<10} {row['status']:<8} balance {row['balance_usd']:<10} "
+              f"total {row['total_pnl']:<10} position {row['position_pct']}")
@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Extract the Holdings PnL popup with one execute_script call
+
+Instead of pulling the whole page text over WebDriver (twice), a small
+script runs inside the browser, finds the popup, and returns only the
+header values, summary stats and table rows as compact JSON.
+"""
+
+import re
+
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from page_readiness import wait_for_table_stable
+from click_strategies import click_with_learned_strategy
+from label_index import HEADER_LABELS, SUMMARY_LABELS
+
+# Period selectors at the top of the popup
+PNL_PERIODS = ['1d', '7d', '30d', 'All']
+
+# Seconds to wait for the popup to mark a clicked period as selected
+PERIOD_SWITCH_TIMEOUT = 3
+
+# The popup is the smallest element that holds both the summary and the table
+FIND_POPUP_SCRIPT = """
+let popup = document.querySelector('[role="dialog"]');
+if (!popup || !popup.innerText.includes('Position %')) {
+    popup = null;
+    for (const el of document.querySelectorAll('div, section')) {
+        // textContent doesn't force a layout like innerText does
+        const text = el.textContent || '';
+        if (text.includes('Trader PnL') && text.includes('Position')) {
+            if (!popup || popup.contains(el)) {
+                popup = el;
+            }
+        }
+    }
+}
+"""
+
+POPUP_SCRIPT = FIND_POPUP_SCRIPT + """
+const headerLabels = arguments[0];
+const summaryLabels = arguments[1];
+
+function linesOf(element) {
+    return element.innerText.split('\\n').map(l => l.trim()).filter(l => l.length > 0);
+}
+
+function valuesAfter(lines, labels) {
+    const values = {};
+    for (let i = 0; i < lines.length - 1; i++) {
+        if (labels.includes(lines[i]) && !(lines[i] in values)) {
+            values[lines[i]] = lines[i + 1];
+        }
+    }
+    return values;
+}
+
+const header = valuesAfter(linesOf(document.body), headerLabels);
+if (!popup) {
+    return {found: false, header: header, summary: {}, rows: []};
+}
+
+const lines = linesOf(popup);
+const summary = valuesAfter(lines, summaryLabels);
+
+// Txns is shown as "279", "49", "/", "230" (total, wins / losses)
+const txnsAt = lines.indexOf('Txns');
+if (txnsAt !== -1 && lines[txnsAt + 3] === '/') {
+    summary['Txns Wins'] = lines[txnsAt + 2];
+    summary['Txns Losses'] = lines[txnsAt + 4];
+}
+
+// Table rows: prefer real <tr> elements, fall back to the text layout where
+// every row starts with a token symbol followed by its "last traded" age
+let rows = [];
+const tableRows = popup.querySelectorAll('tbody tr');
+if (tableRows.length > 0) {
+    rows = Array.from(tableRows).map(tr =>
+        Array.from(tr.querySelectorAll('td')).map(td => td.innerText.trim().replace(/\\n+/g, ' '))
+    );
+} else {
+    const start = lines.indexOf('Position %');
+    const body = start === -1 ? [] : lines.slice(start + 1);
+    const age = /^\\d+[smhdwy]$/;
+    let current = null;
+    for (let i = 0; i < body.length; i++) {
+        if (i + 1 < body.length && age.test(body[i + 1]) && !/^[+-]?\\$/.test(body[i])) {
+            if (current) {
+                rows.push(current);
+            }
+            current = [body[i]];
+        } else if (current) {
+            current.push(body[i]);
+        }
+    }
+    if (current) {
+        rows.push(current);
+    }
+}
+
+return {found: true, header: header, summary: summary, rows: rows};
+"""
+
+# Buttons / tabs of the popup labelled exactly like a period. Table cells are
+# never candidates: the "Last Traded" column shows the same strings ("1d").
+PERIOD_SELECTORS_SCRIPT = FIND_POPUP_SCRIPT + """
+function periodSelectors(label) {
+    if (!popup) {
+        return [];
+    }
+    return Array.from(popup.querySelectorAll('button, [role="tab"]')).filter(function(el) {
+        return !el.closest('tbody, table, [role="row"]') && (el.textContent || '').trim() === label;
+    });
+}
+"""
+
+# Clicks the period selector with the given label inside the popup
+PERIOD_CLICK_SCRIPT = PERIOD_SELECTORS_SCRIPT + """
+const selectors = periodSelectors(arguments[0]);
+if (!selectors.length) {
+    return false;
+}
+selectors[0].click();
+return true;
+"""
+
+# Label of the period the popup marks as selected, or null if it marks none
+ACTIVE_PERIOD_SCRIPT = PERIOD_SELECTORS_SCRIPT + """
+function isActive(el) {
+    return el.getAttribute('aria-selected') === 'true' || el.getAttribute('aria-pressed') === 'true'
+        || el.getAttribute('data-state') === 'active' || el.getAttribute('data-active') === 'true'
+        || /(^|[\\s_-])(active|selected)([\\s_-]|$)/i.test(el.className || '');
+}
+for (const label of arguments[0]) {
+    if (periodSelectors(label).some(isActive)) {
+        return label;
+    }
+}
+return null;
+"""
+
+def click_holdings_pnl(driver):
+    """
+    Open the Holdings PnL popup, return True on success
+
+    Uses the selector and click method that worked best so far
+    (see click_strategies.py).
+    """
+    return click_with_learned_strategy(driver, 'holdings_pnl')
+
+def extract_popup_data(driver):
+    """
+    Run the popup script and return header values, summary stats and rows
+
+    rows is a list of cell lists, each starting with the token symbol.
+    """
+    return driver.execute_script(POPUP_SCRIPT, HEADER_LABELS, SUMMARY_LABELS)
+
+def wait_for_active_period(driver, period, timeout=PERIOD_SWITCH_TIMEOUT):
+    """
+    Wait until the popup marks period as the selected one
+
+    If the popup marks no period at all there is nothing to confirm and
+    this returns True right away.
+    """
+    try:
+        WebDriverWait(driver, timeout, poll_frequency=0.1).until(
+            lambda d: d.execute_script(ACTIVE_PERIOD_SCRIPT, PNL_PERIODS) in (period, None)
+        )
+        return True
+    except (TimeoutException, WebDriverException):
+        return False
+
+def select_pnl_period(driver, period, timings=None):
+    """
+    Switch the open popup to another period and wait for it to re-render
+    """
+    if not driver.execute_script(PERIOD_CLICK_SCRIPT, period):
+        return False
+    if not wait_for_active_period(driver, period):
+        print(f"   ⚠️ Popup didn't switch to period '{period}'")
+        return False
+    wait_for_table_stable(driver, timings=timings, name=f'period_{period}')
+    return True
+
+def extract_all_periods(driver, periods=PNL_PERIODS, timings=None):
+    """
+    Summary and rows for every period, switching tabs inside the open popup
+
+    Returns {period: {'summary': ..., 'rows': ...}}; periods whose selector
+    can't be found are left out.
+    """
+    period_data = {}
+    for period in periods:
+        if not select_pnl_period(driver, period, timings):
+            print(f"   ⚠️ Period '{period}' could not be selected")
+            continue
+        popup_data = extract_popup_data(driver)
+        period_data[period] = {'summary': popup_data['summary'], 'rows': popup_data['rows']}
+    return period_data
+
+def row_balance(row):
+    """
+    Current USD balance of a table row
+
+    The balance is the first unsigned dollar value followed by a token
+    amount. PnL columns are signed ("+$111.88") except a zero PnL, which
+    shows as "$0.00" followed by "0%".
+    """
+    for i, cell in enumerate(row[1:-1], 1):
+        if re.match(r'^\$[0-9,.]+[KMBT]?$', cell) and not row[i + 1].endswith('%'):
+            return cell
+    return None
+
+def row_is_sold(row):
+    """
+    Check if the row is marked "Sold all"
+    """
+    return any(cell.lower() == 'sold all' for cell in row)
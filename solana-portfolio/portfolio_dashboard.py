@@ -9,11 +9,25 @@ import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
 import re
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 import time
 
+from browser_setup import create_driver, portfolio_url
+from result_cache import cache_kind, cache_lookup, cache_store, get_result_cache, RESULT_CACHE_TTL
+from browser_daemon import daemon_available, get_daemon_stats, submit_wallet_job
+from fetch_retry import fetch_with_retry
+from history_store import append_history, history_available, read_snapshots
+from label_index import LabelIndex
+from snapshot_db import record_snapshots
+from page_readiness import wait_for_portfolio_page, wait_for_pnl_popup, total_wait_seconds
+from page_regions import popup_region
+from pnl_table_parser import parse_pnl_table, format_holdings
+from popup_extraction import click_holdings_pnl, extract_popup_data, row_balance, row_is_sold
+from value_parser import parse_value, parse_values
+
+# Columns filled with 'ERROR' when a wallet cannot be fetched
+ERROR_COLUMNS = ('net_worth', 'holdings_pnl', 'jup_holdings', 'win_rate', 'total_txns', 'avg_pnl_per_asset')
+
 # Set page configuration
 st.set_page_config(
     page_title="Solana Portfolio Dashboard",
@@ -22,15 +36,30 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-def get_wallet_data(wallet_address, driver):
+def get_wallet_data(wallet_address, driver, extraction_mode='text', base_url=None, max_age=None):
     """
     Get detailed portfolio data for a single wallet
+
+    extraction_mode='script' reads the popup with one execute_script call
+    instead of transferring the full page text twice. A cached result
+    younger than max_age seconds is reused (see result_cache.py).
     """
-    url = f"https://jup.ag/portfolio/{wallet_address}"
+    url = portfolio_url(wallet_address, base_url)
+
+    kind = cache_kind(f'dashboard_{extraction_mode}', base_url)
+    cached = cache_lookup(wallet_address, kind, max_age)
+    if cached is not None:
+        return cached
 
     try:
         driver.get(url)
-        time.sleep(8)
+        wait_timings = {}
+        wait_for_portfolio_page(driver, timings=wait_timings)
+
+        if extraction_mode == 'script':
+            portfolio_data = get_scripted_wallet_data(wallet_address, driver, wait_timings)
+            popup_read = portfolio_data['win_rate'] != 'N/A'
+            return cache_store(wallet_address, kind, portfolio_data, max_age, complete=popup_read)
 
         # Get basic page content
         basic_text = driver.find_element(By.TAG_NAME, "body").text
@@ -46,18 +75,15 @@ def get_wallet_data(wallet_address, driver):
             'avg_pnl_per_asset': 'N/A',
             'current_tokens': [],
             'token_count': 0,
+            'page_wait_seconds': 0,
             'status': 'success'
         }
 
         # Extract basic data
-        lines = basic_text.split('\n')
-        for i, line in enumerate(lines):
-            if 'Net Worth' in line and i+1 < len(lines):
-                portfolio_data['net_worth'] = lines[i+1].strip()
-            elif 'Holdings PnL' in line and i+1 < len(lines):
-                portfolio_data['holdings_pnl'] = lines[i+1].strip()
-            elif 'JUP Holdings' in line and i+1 < len(lines):
-                portfolio_data['jup_holdings'] = lines[i+1].strip()
+        labels = LabelIndex(basic_text)
+        portfolio_data['net_worth'] = labels.text('Net Worth')
+        portfolio_data['holdings_pnl'] = labels.text('Holdings PnL')
+        portfolio_data['jup_holdings'] = labels.text('JUP Holdings')
 
         # Extract current token holdings
         try:
@@ -86,81 +112,30 @@ def get_wallet_data(wallet_address, driver):
 
         # Try to click PnL popup for detailed data
         try:
-            pnl_elements = driver.find_elements(By.XPATH, "//*[contains(text(), 'Holdings PnL')]")
-            if pnl_elements:
-                for element in pnl_elements:
-                    if element.is_enabled() and element.is_displayed():
-                        driver.execute_script("arguments[0].click();", element)
-                        time.sleep(8)  # Give more time for popup
-
-                        # Get detailed popup content
-                        popup_content = driver.find_element(By.TAG_NAME, "body").text
-
-                        # Extract additional metrics from popup
-                        popup_lines = popup_content.split('\n')
-                        for i, line in enumerate(popup_lines):
-                            if 'Win Rate' in line and i+1 < len(popup_lines):
-                                portfolio_data['win_rate'] = popup_lines[i+1].strip()
-                            elif 'Txns' in line and i+1 < len(popup_lines):
-                                portfolio_data['total_txns'] = popup_lines[i+1].strip()
-                            elif 'Avg PnL per Asset' in line and i+1 < len(popup_lines):
-                                portfolio_data['avg_pnl_per_asset'] = popup_lines[i+1].strip()
-
-                        # Extract ONLY current token holdings - Trading Journal Precision
-                        current_holdings = []
-                        lines = popup_content.split('\n')
-
-                        i = 0
-                        while i < len(lines) - 15:
-                            line = lines[i].strip()
-
-                            # Look for token names
-                            if (line.isupper() and
-                                2 <= len(line) <= 10 and
-                                line.isalpha() and
-                                line not in ['USD', 'ALL', 'NEW', 'HOLDING', 'SOLD', 'PRICE', 'LAST', 'BALANCE', 'TOTAL']):
-
-                                token_name = line
-
-                                # The current balance is always at position +8 in Jupiter's table format
-                                if i + 8 < len(lines):
-                                    balance_line = lines[i + 8].strip()
-
-                                    # Check if it's a valid balance format
-                                    import re
-                                    if re.match(r'^\$[0-9,.]+[KMB]?$', balance_line):
-                                        amount_str = balance_line.replace('$', '').replace(',', '')
-
-                                        try:
-                                            # Convert to numeric for filtering
-                                            if 'K' in amount_str:
-                                                numeric_value = float(amount_str.replace('K', '')) * 1000
-                                                display_amount = amount_str
-                                            elif 'M' in amount_str:
-                                                numeric_value = float(amount_str.replace('M', '')) * 1000000
-                                                display_amount = amount_str
-                                            else:
-                                                numeric_value = float(amount_str)
-                                                display_amount = amount_str
-
-                                            # Only include meaningful current balances (> $50 to filter out dust)
-                                            if numeric_value > 50:
-                                                current_holdings.append(f"{token_name}: ${display_amount}")
-
-                                        except ValueError:
-                                            pass
-
-                            i += 1
-
-                        portfolio_data['current_tokens'] = current_holdings
-                        portfolio_data['token_count'] = len(portfolio_data['current_tokens'])
-
-                        break
+            if click_holdings_pnl(driver):
+                wait_for_pnl_popup(driver, timings=wait_timings)
+
+                # Get detailed popup content (only the popup, not the nav / header around it)
+                popup_content = popup_region(driver.find_element(By.TAG_NAME, "body").text, basic_text)
+
+                # Extract additional metrics from popup
+                popup_labels = LabelIndex(popup_content)
+                portfolio_data['win_rate'] = popup_labels.text('Win Rate')
+                portfolio_data['total_txns'] = popup_labels.text('Txns')
+                portfolio_data['avg_pnl_per_asset'] = popup_labels.text('Avg PnL per Asset')
+
+                # Extract ONLY current token holdings - Trading Journal Precision
+                portfolio_data['current_tokens'] = extract_current_tokens(popup_content)
+                portfolio_data['token_count'] = len(portfolio_data['current_tokens'])
         except Exception as e:
             portfolio_data['current_tokens'] = []
             portfolio_data['token_count'] = 0
 
-        return portfolio_data
+        portfolio_data['page_wait_seconds'] = total_wait_seconds(wait_timings)
+
+        # Without the popup stats the row is only partial: don't cache it
+        popup_read = portfolio_data['win_rate'] != 'N/A'
+        return cache_store(wallet_address, kind, portfolio_data, max_age, complete=popup_read)
 
     except Exception as e:
         return {
@@ -177,25 +152,56 @@ def get_wallet_data(wallet_address, driver):
             'status': f'error: {str(e)}'
         }
 
-def extract_numeric_value(value_str):
+def extract_current_tokens(popup_content):
     """
-    Extract numeric value from strings like '$2,232,456.59' or '+$1.22K'
+    Current token holdings from the popup text (> $50 to filter out dust)
     """
-    if pd.isna(value_str) or value_str in ['N/A', 'ERROR']:
-        return 0
+    return format_holdings(parse_pnl_table(popup_content), min_balance=50)
 
-    # Remove $ and + signs, handle K/M suffixes
-    clean_str = str(value_str).replace('$', '').replace('+', '').replace(',', '')
+def get_scripted_wallet_data(wallet_address, driver, wait_timings):
+    """
+    Dashboard row built from popup_extraction.py's compact popup data
+    """
+    if click_holdings_pnl(driver):
+        wait_for_pnl_popup(driver, timings=wait_timings)
+
+    popup_data = extract_popup_data(driver)
+    header = popup_data['header']
+    summary = popup_data['summary']
+
+    # Only meaningful current balances (> $50 to filter out dust)
+    current_holdings = []
+    for row in popup_data['rows']:
+        balance = row_balance(row)
+        if balance and not row_is_sold(row) and parse_value(balance, missing=0) > 50:
+            current_holdings.append(f"{row[0]}: {balance}")
+
+    return {
+        'wallet': wallet_address,
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'net_worth': header.get('Net Worth', 'N/A'),
+        'holdings_pnl': header.get('Holdings PnL', 'N/A'),
+        'jup_holdings': header.get('JUP Holdings', 'N/A'),
+        'win_rate': summary.get('Win Rate', 'N/A'),
+        'total_txns': summary.get('Txns', 'N/A'),
+        'avg_pnl_per_asset': summary.get('Avg PnL per Asset', 'N/A'),
+        'current_tokens': current_holdings,
+        'token_count': len(current_holdings),
+        'page_wait_seconds': total_wait_seconds(wait_timings),
+        'status': 'success'
+    }
 
-    if 'K' in clean_str:
-        return float(clean_str.replace('K', '')) * 1000
-    elif 'M' in clean_str:
-        return float(clean_str.replace('M', '')) * 1000000
-    else:
+def save_history(results, source):
+    """
+    Append fresh results to the Parquet history (cache hits are already in it)
+    and to the SQLite snapshot DB if WALLET_SNAPSHOT_DB is set
+    """
+    record_snapshots(results, source)
+    if history_available():
         try:
-            return float(clean_str)
-        except:
-            return 0
+            append_history(results)
+        except Exception as e:
+            st.warning(f"⚠️ Could not write history: {e}")
 
 def main():
     st.title("🚀 Solana Portfolio Dashboard")
@@ -245,6 +251,45 @@ def main():
                 st.session_state.wallets.append(address)
                 st.sidebar.success(f"Added {name}!")
 
+    # Browser daemon (keeps Chrome warm between clicks)
+    st.sidebar.subheader("🔥 Browser Daemon")
+    daemon_running = daemon_available()
+    use_daemon = False
+    if daemon_running:
+        use_daemon = st.sidebar.checkbox("Use warm browser daemon", value=True)
+        daemon_stats = get_daemon_stats()
+        st.sidebar.caption(
+            f"{daemon_stats['idle_drivers']}/{daemon_stats['drivers']} drivers idle · "
+            f"{daemon_stats['jobs_completed']} jobs · "
+            f"{daemon_stats['utilisation']:.0%} utilisation"
+        )
+    else:
+        st.sidebar.caption("Not running - start with `python solana-portfolio/browser_daemon.py`")
+
+    compact_extraction = st.sidebar.checkbox(
+        "Compact popup extraction",
+        value=True,
+        help="Read the PnL popup with one small script call instead of two full-page text dumps"
+    )
+    extraction_mode = 'script' if compact_extraction else 'text'
+
+    # Result cache (shared with the CLI trackers)
+    st.sidebar.subheader("🗄️ Result Cache")
+    cache_minutes = st.sidebar.number_input(
+        "Reuse results younger than (minutes)",
+        min_value=0, value=RESULT_CACHE_TTL // 60,
+        help="0 always loads fresh data from jup.ag"
+    )
+    max_age = cache_minutes * 60
+    cache_stats = get_result_cache().stats()
+    st.sidebar.caption(
+        f"{cache_stats['entries']} cached wallets · {cache_stats['bytes'] / 1024:.0f} KB · "
+        f"{cache_stats['hits']} hits / {cache_stats['misses']} misses"
+    )
+    if st.sidebar.button("🗑️ Clear cache"):
+        get_result_cache().clear()
+        st.sidebar.success("Cache cleared")
+
     # Main area
     if len(st.session_state.wallets) == 0:
         st.info("👆 Add some wallet addresses in the sidebar to get started!")
@@ -268,39 +313,58 @@ def main():
         if len(st.session_state.wallets) > 0:
             with st.spinner(f"Analyzing {len(st.session_state.wallets)} wallets..."):
 
-                # Set up Chrome driver
-                chrome_options = Options()
-                chrome_options.add_argument("--headless")
-                chrome_options.add_argument("--no-sandbox")
-                chrome_options.add_argument("--disable-dev-shm-usage")
-
                 results = []
                 progress_bar = st.progress(0)
 
-                try:
-                    driver = webdriver.Chrome(options=chrome_options)
-
+                if use_daemon:
                     for i, wallet in enumerate(st.session_state.wallets):
-                        st.write(f"Processing wallet {i+1}/{len(st.session_state.wallets)}: {wallet[:8]}...")
-
-                        wallet_data = get_wallet_data(wallet, driver)
+                        st.write(f"Processing wallet {i+1}/{len(st.session_state.wallets)}: {wallet[:8]}... (daemon)")
+
+                        daemon_mode = 'dashboard_script' if extraction_mode == 'script' else 'dashboard'
+                        wallet_data = cache_lookup(wallet, cache_kind(f'dashboard_{extraction_mode}'), max_age)
+                        if wallet_data is None:
+                            wallet_data = submit_wallet_job(wallet, daemon_mode, ERROR_COLUMNS, max_age=max_age)
+                        wallet_data.setdefault('current_tokens', [])
+                        wallet_data.setdefault('token_count', 0)
                         results.append(wallet_data)
 
                         progress_bar.progress((i + 1) / len(st.session_state.wallets))
-                        time.sleep(2)
 
-                    driver.quit()
-
-                    # Store results
                     st.session_state.results = pd.DataFrame(results)
+                    save_history(results, f'dashboard_{extraction_mode}')
                     st.success(f"✅ Successfully analyzed {len(results)} wallets!")
 
-                except Exception as e:
-                    st.error(f"❌ Error during analysis: {e}")
+                else:
                     try:
+                        driver_settings = {'block_resources': True, 'persistent_profile': True}
+                        driver = create_driver(**driver_settings)
+
+                        for i, wallet in enumerate(st.session_state.wallets):
+                            st.write(f"Processing wallet {i+1}/{len(st.session_state.wallets)}: {wallet[:8]}...")
+
+                            wallet_data, driver = fetch_with_retry(
+                                lambda w, d: get_wallet_data(w, d, extraction_mode, max_age=max_age),
+                                wallet, driver, driver_settings
+                            )
+                            results.append(wallet_data)
+
+                            progress_bar.progress((i + 1) / len(st.session_state.wallets))
+                            if wallet_data.get('cache') != 'hit':
+                                time.sleep(2)
+
                         driver.quit()
-                    except:
-                        pass
+
+                        # Store results
+                        st.session_state.results = pd.DataFrame(results)
+                        save_history(results, f'dashboard_{extraction_mode}')
+                        st.success(f"✅ Successfully analyzed {len(results)} wallets!")
+
+                    except Exception as e:
+                        st.error(f"❌ Error during analysis: {e}")
+                        try:
+                            driver.quit()
+                        except:
+                            pass
 
     # Display results
     if not st.session_state.results.empty:
@@ -318,11 +382,9 @@ def main():
             st.metric("Successful", successful)
 
         with col3:
-            # Calculate total PnL
-            total_pnl = 0
-            for _, row in st.session_state.results.iterrows():
-                pnl_value = extract_numeric_value(row['holdings_pnl'])
-                total_pnl += pnl_value
+            # Calculate total PnL (whole column at once, N/A / ERROR count as 0)
+            pnl_values = parse_values(st.session_state.results['holdings_pnl'], missing=0)
+            total_pnl = pnl_values.sum()
             st.metric("Total PnL", f"${total_pnl:,.0f}")
 
         with col4:
@@ -358,14 +420,9 @@ def main():
         st.subheader("📈 Portfolio Visualizations")
 
         # PnL Chart
-        pnl_data = []
-        wallet_labels = []
-
-        for _, row in st.session_state.results.iterrows():
-            if row['status'] == 'success':
-                pnl_value = extract_numeric_value(row['holdings_pnl'])
-                pnl_data.append(pnl_value)
-                wallet_labels.append(f"{row['wallet'][:8]}...")
+        successful_rows = st.session_state.results['status'] == 'success'
+        pnl_data = pnl_values[successful_rows].tolist()
+        wallet_labels = [f"{wallet[:8]}..." for wallet in st.session_state.results.loc[successful_rows, 'wallet']]
 
         if pnl_data:
             fig = px.bar(
@@ -377,6 +434,23 @@ def main():
             fig.update_layout(xaxis_tickangle=-45)
             st.plotly_chart(fig, use_container_width=True)
 
+        # History of the analyzed wallets (only these partitions and columns are read)
+        if history_available():
+            st.subheader("🗃️ PnL History")
+            history_days = st.slider("Days", min_value=1, max_value=365, value=30)
+            history = read_snapshots(
+                wallets=st.session_state.results['wallet'].unique(),
+                start=datetime.now() - pd.Timedelta(days=history_days),
+                columns=['timestamp', 'wallet', 'holdings_pnl']
+            )
+            if len(history):
+                history['wallet'] = history['wallet'].str[:8] + '...'
+                fig = px.line(history, x='timestamp', y='holdings_pnl', color='wallet', markers=True,
+                              title="Holdings PnL over Time", labels={'holdings_pnl': 'PnL ($)'})
+                st.plotly_chart(fig, use_container_width=True)
+            else:
+                st.caption("No stored history for these wallets yet")
+
         # Download data
         st.subheader("💾 Export Data")
         csv = st.session_state.results.to_csv(index=False)
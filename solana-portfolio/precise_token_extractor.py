@@ -3,126 +3,58 @@
 Precise token extractor for trading journal - gets actual current USD balances
 """
 
-from selenium import webdriver
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
-import time
-import re
+
+from browser_setup import create_driver, portfolio_url, print_page_load_stats
+from label_index import LabelIndex
+from page_readiness import wait_for_portfolio_page, wait_for_pnl_popup
+from page_regions import popup_region
+from pnl_table_parser import parse_pnl_table, format_holdings
+from popup_extraction import click_holdings_pnl
+
+# Trading journal metric -> popup label
+JOURNAL_METRICS = {
+    'total_holdings': 'Holdings',
+    'total_pnl': 'Total PnL',
+    'win_rate': 'Win Rate',
+    'realised_pnl': 'Realised PnL',
+}
 
 def extract_current_balances(popup_content):
     """
     Extract actual current USD balances from Jupiter popup
     Based on the table structure: Token -> Balance column
     """
-    current_holdings = []
-    lines = popup_content.split('\n')
-
-    # Find tokens that are NOT "Sold all" and have current balances
-    i = 0
-    while i < len(lines) - 10:
-        line = lines[i].strip()
-
-        # Look for token names
-        if (line.isupper() and
-            2 <= len(line) <= 10 and
-            line.isalpha() and
-            line not in ['USD', 'ALL', 'NEW', 'HOLDING', 'SOLD', 'PRICE', 'LAST', 'BALANCE']):
-
-            token_name = line
-
-            # Check if this token is sold (look for "Sold all" in next few lines)
-            is_sold = False
-            for check_j in range(1, 5):
-                if i + check_j < len(lines) and 'sold all' in lines[i + check_j].lower():
-                    is_sold = True
-                    break
-
-            if not is_sold:
-                # Look for the Balance column value
-                # In the table structure, balance appears after several fields
-                for j in range(1, 15):
-                    if i + j < len(lines):
-                        balance_line = lines[i + j].strip()
-
-                        # Look for USD balance format - typically $X.XXK or $XX.XX
-                        # Must be a standalone balance, not part of PnL calculation
-                        balance_match = re.match(r'^\$([0-9,.]+[KMB]?)$', balance_line)
-                        if balance_match:
-                            amount = balance_match.group(1)
-                            try:
-                                # Convert to float for validation
-                                if 'K' in amount:
-                                    num_val = float(amount.replace('K', '').replace(',', '')) * 1000
-                                elif 'M' in amount:
-                                    num_val = float(amount.replace('M', '').replace(',', '')) * 1000000
-                                else:
-                                    num_val = float(amount.replace(',', ''))
-
-                                # Only include meaningful balances (> $1)
-                                if num_val > 1:
-                                    current_holdings.append(f"{token_name}: ${amount}")
-                                    break
-                            except:
-                                continue
-
-                        # Also look for regular dollar amounts
-                        if balance_line.startswith('$') and len(balance_line) < 20:
-                            regular_match = re.match(r'^\$([0-9,.]+)$', balance_line)
-                            if regular_match:
-                                amount = regular_match.group(1)
-                                try:
-                                    if float(amount.replace(',', '')) > 10:  # > $10
-                                        current_holdings.append(f"{token_name}: ${amount}")
-                                        break
-                                except:
-                                    continue
-        i += 1
-
-    return current_holdings
-
-def test_trading_journal_extraction(wallet_address):
+    # Tokens that are NOT "Sold all" with a meaningful balance (> $1)
+    return format_holdings(parse_pnl_table(popup_content), min_balance=1)
+
+def test_trading_journal_extraction(wallet_address, base_url=None):
     """
     Test extraction for trading journal purposes
     """
-    url = f"https://jup.ag/portfolio/{wallet_address}"
-
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")
-    chrome_options.add_argument("--no-sandbox")
-    chrome_options.add_argument("--disable-dev-shm-usage")
+    url = portfolio_url(wallet_address, base_url)
 
     try:
-        driver = webdriver.Chrome(options=chrome_options)
+        driver = create_driver(block_resources=True)
         driver.get(url)
-        time.sleep(8)
+        wait_for_portfolio_page(driver)
+        print_page_load_stats(driver)
+        basic_text = driver.find_element(By.TAG_NAME, "body").text
 
         # Click Holdings PnL for detailed view
-        pnl_elements = driver.find_elements(By.XPATH, "//*[contains(text(), 'Holdings PnL')]")
-        if pnl_elements:
-            for element in pnl_elements:
-                if element.is_enabled() and element.is_displayed():
-                    driver.execute_script("arguments[0].click();", element)
-                    time.sleep(8)
-                    break
+        if click_holdings_pnl(driver):
+            wait_for_pnl_popup(driver)
 
-        # Get detailed content
-        popup_content = driver.find_element(By.TAG_NAME, "body").text
+        # Get detailed content (popup only)
+        popup_content = popup_region(driver.find_element(By.TAG_NAME, "body").text, basic_text)
 
         # Extract trading journal data
         holdings = extract_current_balances(popup_content)
 
         # Also extract key metrics for trading journal
-        metrics = {}
-        lines = popup_content.split('\n')
-        for i, line in enumerate(lines):
-            if 'Holdings' in line and i+1 < len(lines) and '$' in lines[i+1]:
-                metrics['total_holdings'] = lines[i+1].strip()
-            elif 'Total PnL' in line and i+1 < len(lines):
-                metrics['total_pnl'] = lines[i+1].strip()
-            elif 'Win Rate' in line and i+1 < len(lines):
-                metrics['win_rate'] = lines[i+1].strip()
-            elif 'Realised PnL' in line and i+1 < len(lines):
-                metrics['realised_pnl'] = lines[i+1].strip()
+        labels = LabelIndex(popup_content)
+        metrics = {key: labels.text(label) for key, label in JOURNAL_METRICS.items() if label in labels}
+        metrics['distribution'] = labels.distribution
 
         driver.quit()
 
@@ -0,0 +1,36 @@
+#!/usr/bin/env python3
+"""
+Per-process state used by the result cache, the snapshot DB and the click stats
+
+Each keeps one object per process, created on first use so importing the
+module stays cheap, and the SQLite-backed ones open their file the same way.
+"""
+
+import sqlite3
+import threading
+
+class ProcessSingleton:
+    """
+    One object per process, built by factory on the first get()
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.instance = None
+        self.lock = threading.Lock()
+
+    def get(self):
+        with self.lock:
+            if self.instance is None:
+                self.instance = self.factory()
+            return self.instance
+
+def connect_sqlite(path):
+    """
+    Open a short-lived WAL connection (one per call, so threads and processes never share one)
+    """
+    connection = sqlite3.connect(path, timeout=10)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+    connection.row_factory = sqlite3.Row
+    return connection
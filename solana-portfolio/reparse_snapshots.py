@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+Re-parse archived popup snapshots without scraping again
+
+enhanced_wallet_tracker keeps the full page text in the detailed_pnl_data
+column of its CSV exports. When a parser improves, this script streams
+those files, parses the snapshots in chunks on a process pool and appends
+the results to two CSVs as the chunks come back: one row per snapshot
+(typed summary values) and one row per token (the PnL table).
+
+    python reparse_snapshots.py                          # ../data/enhanced_portfolio_tracking_*.csv
+    python reparse_snapshots.py archive/*.csv --workers 8 --output-dir reparsed
+"""
+
+import argparse
+import csv
+import glob
+import multiprocessing
+import os
+import time
+from collections import deque
+from datetime import datetime
+from itertools import islice
+
+from label_index import LabelIndex
+from page_regions import table_region
+from pnl_table_parser import ROW_FIELDS
+from token_rows import token_rows_from_text
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data')
+DEFAULT_PATTERN = os.path.join(DATA_DIR, 'enhanced_portfolio_tracking_*.csv')
+
+# Snapshots per task: big enough to hide the pickling overhead
+CHUNK_SIZE = 25
+
+# Chunks queued per worker, so reading never runs far ahead of parsing
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+# Summary label -> snapshot column
+SNAPSHOT_LABELS = {
+    'Net Worth': 'net_worth',
+    'Holdings PnL': 'holdings_pnl',
+    'JUP Holdings': 'jup_holdings',
+    'Holdings': 'holdings',
+    'Unrealised PnL': 'unrealised_pnl',
+    'Realised PnL': 'realised_pnl',
+    'Total PnL': 'total_pnl',
+    'Win Rate': 'win_rate',
+    'Txns': 'txns',
+    'Avg PnL per Asset': 'avg_pnl_per_asset',
+    'Avg Buy Value': 'avg_buy_value',
+}
+SNAPSHOT_COLUMNS = (['wallet', 'timestamp', 'source'] + list(SNAPSHOT_LABELS.values())
+                    + ['token_rows', 'held_tokens', 'held_value'])
+TOKEN_COLUMNS = ['wallet', 'timestamp', 'symbol', 'last_traded', 'status'] + list(ROW_FIELDS)
+
+def iter_snapshots(paths):
+    """
+    Stream (source, wallet, timestamp, page text) of every successful snapshot
+    """
+    csv.field_size_limit(2 ** 31 - 1)
+    for path in paths:
+        with open(path, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                page_text = row.get('detailed_pnl_data', '')
+                if row.get('status') == 'success' and page_text not in ('', 'N/A', 'ERROR'):
+                    yield os.path.basename(path), row['wallet'], row['timestamp'], page_text
+
+def iter_chunks(items, chunk_size):
+    items = iter(items)
+    while True:
+        chunk = list(islice(items, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def parse_snapshot(source, wallet, timestamp, page_text):
+    """
+    One snapshot row and its token rows
+    """
+    labels = LabelIndex(page_text)
+    token_rows = token_rows_from_text(table_region(page_text), wallet)
+    held = [token for token in token_rows if token.is_held()]
+
+    snapshot = {'wallet': wallet, 'timestamp': timestamp, 'source': source}
+    for label, column in SNAPSHOT_LABELS.items():
+        snapshot[column] = labels.value(label)
+    snapshot['token_rows'] = len(token_rows)
+    snapshot['held_tokens'] = len(held)
+    snapshot['held_value'] = sum(token.balance_usd for token in held)
+
+    tokens = []
+    for token in token_rows:
+        token_row = token.as_dict()
+        token_row['timestamp'] = timestamp
+        tokens.append(token_row)
+    return snapshot, tokens
+
+def parse_chunk(chunk):
+    """
+    Worker task: parse a list of snapshots
+    """
+    snapshots, tokens = [], []
+    for snapshot in chunk:
+        snapshot_row, token_rows = parse_snapshot(*snapshot)
+        snapshots.append(snapshot_row)
+        tokens.extend(token_rows)
+    return snapshots, tokens
+
+def reparse_snapshots(paths, output_dir='.', workers=None, chunk_size=CHUNK_SIZE, progress_every=10):
+    """
+    Parse every snapshot in paths on a process pool, writing results as chunks finish
+
+    Returns the two output paths and the counts.
+    """
+    workers = workers or os.cpu_count() or 1
+    os.makedirs(output_dir, exist_ok=True)
+    stamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+    snapshots_path = os.path.join(output_dir, f"reparsed_snapshots_{stamp}.csv")
+    tokens_path = os.path.join(output_dir, f"reparsed_tokens_{stamp}.csv")
+
+    snapshot_count = token_count = chunk_count = 0
+    start_time = time.time()
+
+    with open(snapshots_path, 'w', newline='') as snapshots_file, \
+            open(tokens_path, 'w', newline='') as tokens_file, \
+            multiprocessing.Pool(processes=workers) as pool:
+        snapshot_writer = csv.DictWriter(snapshots_file, fieldnames=SNAPSHOT_COLUMNS)
+        token_writer = csv.DictWriter(tokens_file, fieldnames=TOKEN_COLUMNS)
+        snapshot_writer.writeheader()
+        token_writer.writeheader()
+
+        def write_result(result):
+            nonlocal snapshot_count, token_count, chunk_count
+            snapshots, tokens = result
+            snapshot_writer.writerows(snapshots)
+            token_writer.writerows(tokens)
+            snapshot_count += len(snapshots)
+            token_count += len(tokens)
+            chunk_count += 1
+            if chunk_count % progress_every == 0:
+                snapshots_file.flush()
+                tokens_file.flush()
+                elapsed = time.time() - start_time
+                print(f"   📦 {snapshot_count:,} snapshots, {token_count:,} token rows "
+                      f"({snapshot_count / elapsed:,.0f} snapshots/s)")
+
+        # Keep a bounded number of chunks in flight and write them in input order
+        in_flight = deque()
+        for chunk in iter_chunks(iter_snapshots(paths), chunk_size):
+            in_flight.append(pool.apply_async(parse_chunk, (chunk,)))
+            if len(in_flight) >= workers * CHUNKS_IN_FLIGHT_PER_WORKER:
+                write_result(in_flight.popleft().get())
+        while in_flight:
+            write_result(in_flight.popleft().get())
+
+    elapsed = time.time() - start_time
+    return {
+        'snapshots_path': snapshots_path,
+        'tokens_path': tokens_path,
+        'snapshots': snapshot_count,
+        'tokens': token_count,
+        'seconds': round(elapsed, 2),
+        'snapshots_per_second': round(snapshot_count / elapsed, 1) if elapsed else None,
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-parse archived popup snapshots in parallel")
+    parser.add_argument('files', nargs='*', help="CSV exports with a detailed_pnl_data column")
+    parser.add_argument('--workers', type=int, default=None, help="parser processes (default: CPU count)")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--output-dir', default='.')
+    args = parser.parse_args()
+
+    paths = []
+    for pattern in args.files or [DEFAULT_PATTERN]:
+        paths.extend(sorted(glob.glob(pattern)))
+    if not paths:
+        print("❌ No snapshot files found")
+        raise SystemExit(1)
+
+    print(f"🔁 Re-parsing snapshots from {len(paths)} files")
+    summary = reparse_snapshots(paths, args.output_dir, args.workers, args.chunk_size)
+    print(f"✅ {summary['snapshots']:,} snapshots and {summary['tokens']:,} token rows "
+          f"in {summary['seconds']}s ({summary['snapshots_per_second']} snapshots/s)")
+    print(f"💾 {summary['snapshots_path']}")
+    print(f"💾 {summary['tokens_path']}")
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Persistent cache of parsed wallet results, shared by the CLI and the dashboard
+
+Rows are stored per wallet (and per kind of fetch) in a small SQLite file,
+so pool workers, the browser daemon and Streamlit all see the same cache.
+A row younger than the TTL is returned without loading the page; the least
+recently used rows are evicted when the cache grows past its limits.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from browser_setup import portfolio_url
+from process_local import ProcessSingleton, connect_sqlite
+
+CACHE_PATH = os.environ.get(
+    'WALLET_CACHE_PATH',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'wallet_result_cache.sqlite')
+)
+
+# Default max age (seconds) of a cached row; 0 turns the cache off
+RESULT_CACHE_TTL = int(os.environ.get('WALLET_CACHE_TTL', 300))
+
+# Eviction limits (least recently used rows go first)
+MAX_CACHE_ENTRIES = 5000
+MAX_CACHE_BYTES = 50 * 1024 * 1024
+
+# Rows older than this are deleted on eviction no matter how often they are used
+MAX_CACHE_AGE = 24 * 60 * 60
+
+class ResultCache:
+    """
+    SQLite-backed TTL + LRU cache of result rows
+    """
+
+    def __init__(self, path=CACHE_PATH, max_entries=MAX_CACHE_ENTRIES, max_bytes=MAX_CACHE_BYTES,
+                 max_age=MAX_CACHE_AGE):
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0
+        self.misses = 0
+        self.stats_lock = threading.Lock()
+
+        with self.connect() as connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS results (
+                    wallet TEXT NOT NULL,
+                    kind TEXT NOT NULL,
+                    stored_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    row TEXT NOT NULL,
+                    PRIMARY KEY (wallet, kind)
+                )
+            """)
+            connection.execute("CREATE INDEX IF NOT EXISTS results_last_access ON results (last_access)")
+
+    def connect(self):
+        return connect_sqlite(self.path)
+
+    def count(self, hit):
+        with self.stats_lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, wallet_address, kind, ttl=RESULT_CACHE_TTL):
+        """
+        Cached row and its age in seconds, or None if missing or older than ttl
+        """
+        now = time.time()
+        with self.connect() as connection:
+            found = connection.execute(
+                "SELECT stored_at, row FROM results WHERE wallet = ? AND kind = ?",
+                (wallet_address, kind)
+            ).fetchone()
+
+            if found is None or now - found[0] > ttl:
+                self.count(hit=False)
+                return None
+
+            connection.execute(
+                "UPDATE results SET last_access = ? WHERE wallet = ? AND kind = ?",
+                (now, wallet_address, kind)
+            )
+
+        self.count(hit=True)
+        return json.loads(found[1]), now - found[0]
+
+    def put(self, wallet_address, kind, row):
+        """
+        Store a row and evict old / least recently used rows if needed
+        """
+        payload = json.dumps(row, default=str)
+        now = time.time()
+        with self.connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?)",
+                (wallet_address, kind, now, now, len(payload), payload)
+            )
+            self.evict(connection, now)
+
+    def evict(self, connection, now):
+        connection.execute("DELETE FROM results WHERE stored_at < ?", (now - self.max_age,))
+        connection.execute("""
+            DELETE FROM results WHERE rowid IN (
+                SELECT rowid FROM results ORDER BY last_access DESC LIMIT -1 OFFSET ?
+            )
+        """, (self.max_entries,))
+        connection.execute("""
+            DELETE FROM results WHERE rowid IN (
+                SELECT rowid FROM (
+                    SELECT rowid, SUM(size) OVER (ORDER BY last_access DESC) AS running FROM results
+                ) WHERE running > ?
+            )
+        """, (self.max_bytes,))
+
+    def invalidate(self, wallet_address):
+        """
+        Forget every cached row of a wallet
+        """
+        with self.connect() as connection:
+            connection.execute("DELETE FROM results WHERE wallet = ?", (wallet_address,))
+
+    def clear(self):
+        with self.connect() as connection:
+            connection.execute("DELETE FROM results")
+
+    def stats(self):
+        """
+        Entries, size and this process's hit rate
+        """
+        with self.connect() as connection:
+            entries, size = connection.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM results").fetchone()
+        lookups = self.hits + self.misses
+        return {
+            'entries': entries,
+            'bytes': size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / lookups, 3) if lookups else None,
+        }
+
+shared_cache = ProcessSingleton(ResultCache)
+
+def get_result_cache():
+    """
+    The process-wide cache (same file for every process)
+    """
+    return shared_cache.get()
+
+def cache_lookup(wallet_address, kind, ttl=None):
+    """
+    Return a cached row marked as a hit, or None
+
+    ttl=None uses RESULT_CACHE_TTL; ttl=0 always misses.
+    """
+    ttl = RESULT_CACHE_TTL if ttl is None else ttl
+    if ttl <= 0:
+        return None
+
+    try:
+        cached = get_result_cache().get(wallet_address, kind, ttl)
+    except sqlite3.Error as e:
+        print(f"⚠️ Result cache unavailable: {e}")
+        return None
+
+    if cached is None:
+        return None
+
+    row, age = cached
+    row['cache'] = 'hit'
+    row['cache_age_seconds'] = round(age, 1)
+    print(f"💨 Cache hit for {wallet_address[:8]} ({age:.0f}s old)")
+    return row
+
+def cache_store(wallet_address, kind, row, ttl=None, complete=True):
+    """
+    Store a freshly fetched row (successes only) and mark it as a miss
+
+    complete=False (e.g. the popup didn't open) returns the row without
+    caching it, so the next run tries again instead of reusing a partial row.
+    """
+    row['cache'] = 'miss'
+    row['cache_age_seconds'] = 0.0
+
+    ttl = RESULT_CACHE_TTL if ttl is None else ttl
+    if ttl > 0 and complete and row.get('status') == 'success':
+        try:
+            get_result_cache().put(wallet_address, kind, row)
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not cache {wallet_address[:8]}: {e}")
+    return row
+
+def cache_kind(name, base_url=None):
+    """
+    Cache key part for a fetch: pages from the stand-in never mix with jup.ag
+    """
+    return f"{name}@{portfolio_url('', base_url)}"
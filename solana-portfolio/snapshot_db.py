@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Optional SQLite time series of wallet snapshots and token rows
+
+For point questions ("latest snapshot of X", "net worth of X over 90
+days") the CSV exports have to be loaded completely. When
+WALLET_SNAPSHOT_DB points to a file, the trackers and the dashboard also
+insert their results here: typed values, one transaction per batch, WAL
+journal, indexed by (wallet, timestamp) and (token, timestamp).
+
+    python snapshot_db.py --import "../data/*.csv"       # old CSV exports
+    python snapshot_db.py --latest
+    python snapshot_db.py --wallet <address> --days 90
+    python snapshot_db.py --token SOL --days 30
+"""
+
+import argparse
+import glob
+import math
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+
+from history_store import new_records
+from process_local import ProcessSingleton, connect_sqlite
+from token_rows import token_table_from_results
+from value_parser import parse_value
+
+# Unset = tracker results are not written to SQLite
+SNAPSHOT_DB_PATH = os.environ.get('WALLET_SNAPSHOT_DB')
+
+# Snapshot values stored as REAL (parsed from the page strings)
+SNAPSHOT_VALUE_COLUMNS = ['net_worth', 'holdings_pnl', 'jup_holdings', 'win_rate', 'total_txns',
+                          'avg_pnl_per_asset', 'page_wait_seconds']
+
+# Token row values stored as REAL
+TOKEN_VALUE_COLUMNS = ['balance_usd', 'balance_amount', 'unrealised_pnl', 'realised_pnl', 'total_pnl',
+                       'position_pct']
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+def sql_value(value):
+    # NaN from the token columns -> NULL
+    return None if isinstance(value, float) and math.isnan(value) else value
+
+def timestamp_text(value):
+    """
+    Timestamps are stored as sortable 'YYYY-MM-DD HH:MM:SS' text (like the CSVs)
+    """
+    return pd.Timestamp(value).strftime(TIMESTAMP_FORMAT)
+
+class SnapshotStore:
+    """
+    SQLite tables of snapshots and token rows with range and latest-per-wallet queries
+    """
+
+    def __init__(self, path):
+        self.path = path
+        value_columns = ''.join(f"{column} REAL, " for column in SNAPSHOT_VALUE_COLUMNS)
+        token_columns = ''.join(f"{column} REAL, " for column in TOKEN_VALUE_COLUMNS)
+
+        with self.connect() as connection:
+            connection.execute(f"""
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    wallet TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    {value_columns}
+                    token_count INTEGER,
+                    PRIMARY KEY (wallet, timestamp, source)
+                )
+            """)
+            token_layout = [row[1] for row in connection.execute("PRAGMA table_info(tokens)")]
+            if token_layout and 'source' not in token_layout:
+                connection.execute("ALTER TABLE tokens RENAME TO tokens_old")
+            # row_number is the row's position in its snapshot: a symbol can appear twice
+            connection.execute(f"""
+                CREATE TABLE IF NOT EXISTS tokens (
+                    wallet TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    source TEXT NOT NULL,
+                    row_number INTEGER NOT NULL,
+                    token TEXT NOT NULL,
+                    status TEXT,
+                    {token_columns}
+                    PRIMARY KEY (wallet, timestamp, source, row_number)
+                )
+            """)
+            if token_layout and 'source' not in token_layout:
+                # Databases from before the source column: take the snapshot's source
+                old_columns = ', '.join(['token', 'status'] + TOKEN_VALUE_COLUMNS)
+                connection.execute(f"""
+                    INSERT INTO tokens
+                    SELECT wallet, timestamp,
+                           COALESCE((SELECT MIN(s.source) FROM snapshots s
+                                     WHERE s.wallet = t.wallet AND s.timestamp = t.timestamp), 'basic'),
+                           rowid, {old_columns}
+                    FROM tokens_old t
+                """)
+                connection.execute("DROP TABLE tokens_old")
+            # (wallet, timestamp) lookups use the primary keys; token series need their own index
+            connection.execute("CREATE INDEX IF NOT EXISTS tokens_token_time ON tokens (token, timestamp)")
+
+    def connect(self):
+        return connect_sqlite(self.path)
+
+    def insert_results(self, results, source):
+        """
+        Insert new successful results (and their token rows) in one transaction
+
+        Rows already stored (same wallet, timestamp and source) are skipped.
+        Returns how many snapshot and token rows were inserted and how many
+        of each were skipped.
+        """
+        records = new_records(results)
+        if not records:
+            return {'snapshots': 0, 'tokens': 0, 'skipped_snapshots': 0, 'skipped_tokens': 0}
+
+        snapshot_rows = []
+        timestamps = []
+        for record in records:
+            timestamp = timestamp_text(record['timestamp'])
+            timestamps.append(timestamp)
+            values = [parse_value(str(record.get(column, '')), None) for column in SNAPSHOT_VALUE_COLUMNS]
+            token_count = parse_value(str(record.get('token_count', '')), None)
+            snapshot_rows.append([record['wallet'], timestamp, source] + values
+                                 + [int(token_count) if token_count is not None else None])
+
+        # Token rows take the timestamp of their own record (a wallet can appear twice)
+        token_rows = []
+        record_numbers = []
+        tokens = token_table_from_results(records, record_numbers)
+        if len(tokens):
+            frame = tokens.to_frame()
+            columns = frame[['wallet', 'symbol', 'status'] + TOKEN_VALUE_COLUMNS].itertuples(index=False)
+            row_numbers = {}
+            for number, row in zip(record_numbers, columns):
+                row_numbers[number] = row_numbers.get(number, -1) + 1
+                token_rows.append([row[0], timestamps[number], source, row_numbers[number], row[1], row[2]]
+                                  + [sql_value(v) for v in row[3:]])
+
+        with self.connect() as connection:
+            before = connection.total_changes
+            connection.executemany(
+                f"INSERT OR IGNORE INTO snapshots VALUES ({', '.join('?' * len(snapshot_rows[0]))})",
+                snapshot_rows
+            )
+            snapshot_count = connection.total_changes - before
+            if token_rows:
+                connection.executemany(
+                    f"INSERT OR IGNORE INTO tokens VALUES ({', '.join('?' * len(token_rows[0]))})",
+                    token_rows
+                )
+            token_count = connection.total_changes - before - snapshot_count
+        return {
+            'snapshots': snapshot_count,
+            'tokens': token_count,
+            'skipped_snapshots': len(snapshot_rows) - snapshot_count,
+            'skipped_tokens': len(token_rows) - token_count,
+        }
+
+    def latest_snapshots(self, wallets=None):
+        """
+        The newest snapshot of every wallet (or of the given wallets)
+        """
+        query = """
+            SELECT s.* FROM snapshots s
+            JOIN (SELECT wallet, MAX(timestamp) AS newest FROM snapshots GROUP BY wallet) latest
+              ON s.wallet = latest.wallet AND s.timestamp = latest.newest
+        """
+        parameters = []
+        if wallets is not None:
+            wallets = list(wallets)
+            query += f" WHERE s.wallet IN ({', '.join('?' * len(wallets))})"
+            parameters = wallets
+        with self.connect() as connection:
+            return [dict(row) for row in connection.execute(query + " ORDER BY s.wallet", parameters)]
+
+    def snapshot_range(self, wallet, start=None, end=None, columns=None):
+        """
+        Snapshots of one wallet between start and end (inclusive), oldest first
+        """
+        return self.range_query('snapshots', 'wallet', wallet, start, end, columns)
+
+    def token_range(self, token, start=None, end=None, wallets=None, columns=None):
+        """
+        Rows of one token between start and end, optionally only for some wallets
+        """
+        return self.range_query('tokens', 'token', token, start, end, columns, wallets)
+
+    def range_query(self, table, key_column, key, start, end, columns, wallets=None):
+        # key = ? AND timestamp BETWEEN ... is answered from the (key, timestamp) index
+        selected = ', '.join(columns) if columns else '*'
+        query = f"SELECT {selected} FROM {table} WHERE {key_column} = ?"
+        parameters = [key]
+        if start is not None:
+            query += " AND timestamp >= ?"
+            parameters.append(timestamp_text(start))
+        if end is not None:
+            query += " AND timestamp <= ?"
+            parameters.append(timestamp_text(end))
+        if wallets is not None:
+            wallets = list(wallets)
+            query += f" AND wallet IN ({', '.join('?' * len(wallets))})"
+            parameters.extend(wallets)
+        with self.connect() as connection:
+            return [dict(row) for row in connection.execute(query + " ORDER BY timestamp", parameters)]
+
+    def stats(self):
+        with self.connect() as connection:
+            snapshots, wallets = connection.execute(
+                "SELECT COUNT(*), COUNT(DISTINCT wallet) FROM snapshots"
+            ).fetchone()
+            tokens = connection.execute("SELECT COUNT(*) FROM tokens").fetchone()[0]
+        return {'snapshots': snapshots, 'wallets': wallets, 'tokens': tokens}
+
+shared_store = ProcessSingleton(lambda: SnapshotStore(SNAPSHOT_DB_PATH))
+
+def snapshot_db_enabled():
+    return bool(SNAPSHOT_DB_PATH)
+
+def get_snapshot_store(path=None):
+    """
+    The process-wide store (SNAPSHOT_DB_PATH unless another path is given)
+    """
+    if path is not None:
+        return SnapshotStore(path)
+    return shared_store.get()
+
+def record_snapshots(results, source):
+    """
+    Insert tracker results if WALLET_SNAPSHOT_DB is set; returns results unchanged
+    """
+    if not snapshot_db_enabled():
+        return results
+    try:
+        inserted = get_snapshot_store().insert_results(results, source)
+        print(f"🗄️ Snapshot DB: {inserted['snapshots']} snapshots, {inserted['tokens']} token rows")
+        if inserted['skipped_snapshots'] or inserted['skipped_tokens']:
+            print(f"   ⚠️ Already stored, skipped: {inserted['skipped_snapshots']} snapshots, "
+                  f"{inserted['skipped_tokens']} token rows")
+    except Exception as e:
+        # Optional backend: never abort the tracker run
+        print(f"⚠️ Could not write snapshot DB: {e}")
+    return results
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Query the SQLite snapshot time series")
+    parser.add_argument('--db', default=SNAPSHOT_DB_PATH, help="database file (default: $WALLET_SNAPSHOT_DB)")
+    parser.add_argument('--import', dest='import_files', nargs='+', metavar='CSV',
+                        help="insert old tracker CSV exports")
+    parser.add_argument('--latest', action='store_true', help="newest snapshot per wallet")
+    parser.add_argument('--wallet', help="net worth / PnL of a wallet over --days")
+    parser.add_argument('--token', help="rows of a token over --days")
+    parser.add_argument('--days', type=int, default=90)
+    args = parser.parse_args()
+
+    if not args.db:
+        print("❌ No database: set WALLET_SNAPSHOT_DB or pass --db")
+        raise SystemExit(1)
+    store = get_snapshot_store(args.db)
+    since = datetime.now() - timedelta(days=args.days)
+
+    for pattern in args.import_files or []:
+        for path in sorted(glob.glob(pattern)):
+            source = 'enhanced' if os.path.basename(path).startswith('enhanced_') else 'basic'
+            inserted = store.insert_results(pd.read_csv(path, dtype=str, keep_default_na=False), source)
+            print(f"   📥 {os.path.basename(path)}: {inserted['snapshots']} snapshots, {inserted['tokens']} token rows"
+                  f" ({inserted['skipped_snapshots']} snapshots already stored)")
+
+    if args.latest:
+        for row in store.latest_snapshots():
+            print(f"🔹 {row['wallet'][:8]}... {row['timestamp']}  net worth {row['net_worth']}  "
+                  f"PnL {row['holdings_pnl']}")
+
+    if args.wallet:
+        for row in store.snapshot_range(args.wallet, since, columns=['timestamp', 'net_worth', 'holdings_pnl']):
+            print(f"   {row['timestamp']}  net worth {row['net_worth']}  PnL {row['holdings_pnl']}")
+
+    if args.token:
+        for row in store.token_range(args.token, since, columns=['timestamp', 'wallet', 'status', 'balance_usd']):
+            print(f"   {row['timestamp']}  {row['wallet'][:8]}...  {row['status']}  ${row['balance_usd']}")
+
+    stats = store.stats()
+    print(f"📊 {stats['snapshots']} snapshots of {stats['wallets']} wallets, {stats['tokens']} token rows in {args.db}")
@@ -3,63 +3,14 @@
 Test clean token extraction based on the actual popup structure
 """
 
+from pnl_table_parser import parse_pnl_table, format_holdings
+
 def parse_popup_content(popup_content):
     """
     Parse the popup content to extract clean token holdings
     """
-    lines = popup_content.split('\n')
-
-    # Find the table section with token data
-    current_holdings = []
-
-    # Look for the pattern in the popup data
-    # From our debug output, we know the structure includes lines like:
-    # GIGA
-    # 27d
-    # +$0.083489...
-    # $2.62K...
-
-    i = 0
-    while i < len(lines) - 3:
-        line = lines[i].strip()
-
-        # Look for token names (uppercase, 2-10 chars)
-        if (line.isupper() and
-            2 <= len(line) <= 10 and
-            line.isalpha() and
-            line not in ['USD', 'ALL', 'NEW']):  # Filter out common non-tokens
-
-            token_name = line
-
-            # Look ahead for balance information
-            # Typically 3-4 lines down we find the balance
-            for j in range(1, 8):  # Check next few lines
-                if i + j < len(lines):
-                    balance_line = lines[i + j].strip()
-
-                    # Look for current balance (not sold all, not 0.00)
-                    if ('$' in balance_line and
-                        'sold all' not in balance_line.lower() and
-                        not balance_line.startswith('$0.00') and
-                        not balance_line.startswith('0.00')):
-
-                        # Extract the dollar amount
-                        import re
-                        dollar_match = re.search(r'\$([0-9,.]+[KMB]?)', balance_line)
-                        if dollar_match:
-                            amount = dollar_match.group(1)
-
-                            # Convert to float for filtering
-                            try:
-                                numeric_value = float(amount.replace('K', '000').replace('M', '000000').replace(',', ''))
-                                if numeric_value > 0.01:  # Only meaningful balances
-                                    current_holdings.append(f"{token_name}: ${amount}")
-                                    break
-                            except:
-                                continue
-        i += 1
-
-    return current_holdings
+    # Current balance (not sold all, not $0.00) above one cent
+    return format_holdings(parse_pnl_table(popup_content), min_balance=0.01)
 
 # Test with the actual popup content from our debug
 test_content = """
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Compact typed token rows for parsed PnL tables
+
+Holdings used to travel as "GIGA: $2.62K" strings that had to be parsed
+again whenever a number was needed. TokenRow holds one parsed row in
+__slots__ (floats, interned symbol). TokenTable stores many rows column by
+column in NumPy arrays, which pandas and pyarrow take over without copying
+the numbers, so tens of thousands of rows stay cheap to keep and aggregate.
+"""
+
+import math
+import sys
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+from pnl_table_parser import ROW_FIELDS, iter_pnl_rows
+from value_parser import parse_value
+
+# Text columns stored once per distinct value (codes + vocabulary)
+CODED_FIELDS = ('wallet', 'symbol', 'last_traded', 'status')
+
+def intern_text(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+class TokenRow:
+    """
+    One token of the PnL table with numeric values (NaN when a cell is empty)
+    """
+
+    __slots__ = CODED_FIELDS + ROW_FIELDS
+
+    def __init__(self, symbol, status='traded', last_traded=None, wallet=None, **values):
+        self.wallet = intern_text(wallet)
+        self.symbol = intern_text(symbol)
+        self.last_traded = intern_text(last_traded)
+        self.status = intern_text(status)
+        for field in ROW_FIELDS:
+            value = values.get(field)
+            setattr(self, field, math.nan if value is None else float(value))
+
+    @classmethod
+    def from_table_row(cls, row, wallet=None):
+        """
+        Build from a pnl_table_parser row (raw strings)
+        """
+        values = {field: parse_value(row[field]) for field in ROW_FIELDS}
+        return cls(row['symbol'], row['status'], row['last_traded'], wallet, **values)
+
+    @classmethod
+    def from_cells(cls, cells, wallet=None):
+        """
+        Build from one row of popup_extraction's script (list of cells), None if incomplete
+        """
+        for row in iter_pnl_rows(cells):
+            return cls.from_table_row(row, wallet)
+        return None
+
+    def is_held(self, min_balance=0):
+        return self.status != 'sold' and self.balance_usd > min_balance
+
+    def as_dict(self):
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def __repr__(self):
+        return f"TokenRow({self.symbol!r}, {self.status!r}, balance_usd={self.balance_usd}, total_pnl={self.total_pnl})"
+
+def token_rows_from_text(popup_content, wallet=None):
+    """
+    TokenRows of every complete row in popup text
+    """
+    return [TokenRow.from_table_row(row, wallet) for row in iter_pnl_rows(popup_content.split('\n'))]
+
+class TokenTable:
+    """
+    Column store of TokenRows: one float64 array per value, codes for text columns
+    """
+
+    def __init__(self, capacity=1024):
+        self.size = 0
+        self.capacity = capacity
+        self.values = {field: np.full(capacity, np.nan) for field in ROW_FIELDS}
+        self.codes = {field: np.zeros(capacity, dtype=np.int32) for field in CODED_FIELDS}
+        # Distinct values per text column; index = code
+        self.vocabulary = {field: [] for field in CODED_FIELDS}
+        self.lookup = {field: {} for field in CODED_FIELDS}
+
+    def __len__(self):
+        return self.size
+
+    def code(self, field, value):
+        lookup = self.lookup[field]
+        if value not in lookup:
+            lookup[value] = len(self.vocabulary[field])
+            self.vocabulary[field].append(value)
+        return lookup[value]
+
+    def grow(self):
+        # Double the capacity, so appends stay amortised O(1)
+        self.capacity *= 2
+        for field, array in self.values.items():
+            grown = np.full(self.capacity, np.nan)
+            grown[:self.size] = array[:self.size]
+            self.values[field] = grown
+        for field, array in self.codes.items():
+            grown = np.zeros(self.capacity, dtype=np.int32)
+            grown[:self.size] = array[:self.size]
+            self.codes[field] = grown
+
+    def append(self, token_row):
+        if self.size == self.capacity:
+            self.grow()
+        for field in CODED_FIELDS:
+            self.codes[field][self.size] = self.code(field, getattr(token_row, field))
+        for field in ROW_FIELDS:
+            self.values[field][self.size] = getattr(token_row, field)
+        self.size += 1
+
+    def extend(self, token_rows):
+        for token_row in token_rows:
+            self.append(token_row)
+        return self
+
+    def column(self, field):
+        """
+        Values of one column (a view, no copy); text columns are decoded
+        """
+        if field in self.values:
+            return self.values[field][:self.size]
+        vocabulary = self.vocabulary[field]
+        return [vocabulary[code] for code in self.codes[field][:self.size]]
+
+    def __iter__(self):
+        for index in range(self.size):
+            text = {field: self.vocabulary[field][self.codes[field][index]] for field in CODED_FIELDS}
+            yield TokenRow(**text, **{field: self.values[field][index] for field in ROW_FIELDS})
+
+    def to_frame(self):
+        """
+        DataFrame sharing the value arrays; text columns become categoricals
+        """
+        data = {}
+        for field in CODED_FIELDS:
+            data[field] = pd.Categorical.from_codes(self.codes[field][:self.size],
+                                                    categories=pd.Index(self.vocabulary[field], dtype=object))
+        for field in ROW_FIELDS:
+            data[field] = self.values[field][:self.size]
+        return pd.DataFrame(data, copy=False)
+
+    def to_arrow(self):
+        """
+        pyarrow Table; value columns are zero-copy, text columns dictionary encoded
+        """
+        if pa is None:
+            raise ImportError("pyarrow is not installed (pip install pyarrow)")
+        columns = {}
+        for field in CODED_FIELDS:
+            columns[field] = pa.DictionaryArray.from_arrays(
+                pa.array(self.codes[field][:self.size]),
+                pa.array(self.vocabulary[field], type=pa.string())
+            )
+        for field in ROW_FIELDS:
+            columns[field] = pa.array(self.values[field][:self.size])
+        return pa.table(columns)
+
+def token_table_from_results(results, record_numbers=None):
+    """
+    TokenTable of every successful tracker result (DataFrame or list of dicts)
+
+    Uses the script rows ('pnl_rows') when present, otherwise parses the
+    raw popup text in 'detailed_pnl_data'. If a list is passed as
+    record_numbers, the position of each token row's record is appended to
+    it (a wallet can appear in several records, e.g. at different times).
+    """
+    records = results.to_dict('records') if isinstance(results, pd.DataFrame) else results
+    table = TokenTable()
+    for number, record in enumerate(records):
+        if record.get('status') != 'success':
+            continue
+        wallet = record.get('wallet')
+        before = len(table)
+        if isinstance(record.get('pnl_rows'), list):
+            token_rows = [TokenRow.from_cells(cells, wallet) for cells in record['pnl_rows']]
+            table.extend(row for row in token_rows if row is not None)
+        elif isinstance(record.get('detailed_pnl_data'), str) and record['detailed_pnl_data'] not in ('N/A', 'ERROR'):
+            table.extend(token_rows_from_text(record['detailed_pnl_data'], wallet))
+        if record_numbers is not None:
+            record_numbers.extend([number] * (len(table) - before))
+    return table
+
+if __name__ == "__main__":
+    from test_clean_extraction import test_content
+
+    table = TokenTable().extend(token_rows_from_text(test_content, wallet='example'))
+    print(table.to_frame()[['symbol', 'status', 'balance_usd', 'total_pnl', 'position_pct']])
@@ -0,0 +1,314 @@
+#!/usr/bin/env python3
+"""
+Long-running scheduler that keeps a large watchlist of wallets fresh
+
+Every wallet gets its own refresh interval: big wallets and wallets whose
+PnL moves a lot are refreshed more often, small quiet ones only every
+MAX_REFRESH_INTERVAL. A heap ordered by due time picks the next batch, so
+the scrape cost follows the value of the watchlist rather than its length.
+The queue state is saved to JSON after every batch and survives restarts.
+"""
+
+import argparse
+import csv
+import heapq
+import json
+import math
+import os
+import time
+from collections import deque
+from datetime import datetime
+
+from fetch_retry import is_error_row
+from multi_wallet_tracker import track_multiple_wallets
+from value_parser import parse_value
+
+# Refresh interval bounds (seconds); no wallet waits longer than the maximum
+MIN_REFRESH_INTERVAL = 5 * 60
+MAX_REFRESH_INTERVAL = 6 * 60 * 60
+
+# A wallet worth VALUE_REFERENCE gets the full value boost (log scale)
+VALUE_REFERENCE = 1_000_000
+VALUE_WEIGHT = 4
+
+# PnL moving by VOLATILITY_REFERENCE of the wallet's size per check gets the full boost
+VOLATILITY_REFERENCE = 0.05
+VOLATILITY_WEIGHT = 6
+
+# PnL values remembered per wallet for the volatility estimate
+PNL_HISTORY_LENGTH = 10
+
+DEFAULT_STATE_PATH = "tracking_state.json"
+
+def fetch_with_tracker(wallet_addresses, workers=1, tabs=1):
+    """
+    Default batch fetcher: the normal multi-wallet tracker
+    """
+    return track_multiple_wallets(wallet_addresses, workers=workers, tabs=tabs).to_dict('records')
+
+class TrackingScheduler:
+    """
+    Priority queue of wallets ordered by when they are due for a refresh
+    """
+
+    def __init__(self, state_path=DEFAULT_STATE_PATH, fetch_batch=None, batch_size=20,
+                 min_interval=MIN_REFRESH_INTERVAL, max_interval=MAX_REFRESH_INTERVAL,
+                 results_path=None):
+        self.state_path = state_path
+        self.fetch_batch = fetch_batch or fetch_with_tracker
+        self.batch_size = batch_size
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.results_path = results_path
+
+        self.wallets = {}
+        self.heap = []
+        self.refresh_times = deque()
+        self.totals = {'refreshes': 0, 'errors': 0, 'batches': 0, 'fetch_seconds': 0.0,
+                       'staleness_seconds': 0.0}
+
+        if os.path.exists(state_path):
+            self.load_state()
+
+    def add_wallets(self, wallet_addresses):
+        """
+        Add wallets to the watchlist; new wallets are due immediately
+        """
+        now = time.time()
+        added = 0
+        for wallet in wallet_addresses:
+            if wallet not in self.wallets:
+                self.wallets[wallet] = {
+                    'last_refresh': None,
+                    'next_due': now,
+                    'net_worth': None,
+                    'pnl_history': [],
+                    'failures': 0,
+                }
+                heapq.heappush(self.heap, (now, wallet))
+                added += 1
+        return added
+
+    def remove_wallet(self, wallet_address):
+        """
+        Drop a wallet (its heap entry is skipped when it comes up)
+        """
+        self.wallets.pop(wallet_address, None)
+
+    def pnl_volatility(self, entry):
+        """
+        Average PnL change between checks, relative to the wallet's size
+        """
+        history = entry['pnl_history']
+        if len(history) < 2:
+            return 0.0
+        changes = [abs(b - a) for a, b in zip(history, history[1:])]
+        size = max(abs(entry['net_worth'] or 0), max(abs(v) for v in history), 1)
+        return sum(changes) / len(changes) / size
+
+    def refresh_interval(self, entry):
+        """
+        Seconds until the next refresh of a wallet
+
+        Starts at the maximum interval and shrinks with net worth (log
+        scale) and PnL volatility, never below the minimum interval.
+        """
+        net_worth = entry['net_worth'] or 0
+        value_score = 0.0
+        if net_worth > 1:
+            value_score = min(1.0, math.log10(net_worth) / math.log10(VALUE_REFERENCE))
+
+        volatility_score = min(1.0, self.pnl_volatility(entry) / VOLATILITY_REFERENCE)
+
+        interval = self.max_interval / (1 + VALUE_WEIGHT * value_score + VOLATILITY_WEIGHT * volatility_score)
+        return max(self.min_interval, min(self.max_interval, interval))
+
+    def pop_due(self, now):
+        """
+        Take up to batch_size wallets whose due time has passed (most overdue first)
+        """
+        due = []
+        while self.heap and len(due) < self.batch_size and self.heap[0][0] <= now:
+            next_due, wallet = heapq.heappop(self.heap)
+            entry = self.wallets.get(wallet)
+            # Skip removed wallets and outdated heap entries
+            if entry is None or entry['next_due'] != next_due:
+                continue
+            due.append(wallet)
+        return due
+
+    def record_result(self, wallet, row, now):
+        """
+        Update a wallet's state from a fetched row and schedule its next refresh
+        """
+        entry = self.wallets[wallet]
+
+        if row is None or is_error_row(row):
+            entry['failures'] += 1
+            self.totals['errors'] += 1
+            # Retry failures sooner than the regular interval, but back off
+            interval = min(self.max_interval, self.min_interval * 2 ** (entry['failures'] - 1))
+        else:
+            if entry['last_refresh'] is not None:
+                self.totals['staleness_seconds'] += now - entry['last_refresh']
+            entry['failures'] = 0
+            entry['last_refresh'] = now
+            entry['net_worth'] = parse_value(row.get('net_worth'))
+            pnl = parse_value(row.get('holdings_pnl'))
+            if pnl is not None:
+                entry['pnl_history'] = (entry['pnl_history'] + [pnl])[-PNL_HISTORY_LENGTH:]
+            interval = self.refresh_interval(entry)
+
+        entry['next_due'] = now + interval
+        heapq.heappush(self.heap, (entry['next_due'], wallet))
+        self.totals['refreshes'] += 1
+        self.refresh_times.append(now)
+
+    def run_once(self):
+        """
+        Fetch one batch of due wallets; returns the fetched rows
+        """
+        now = time.time()
+        due = self.pop_due(now)
+        if not due:
+            return []
+
+        start_time = time.time()
+        rows = self.fetch_batch(due)
+        fetch_seconds = time.time() - start_time
+
+        rows_by_wallet = {row.get('wallet'): row for row in rows}
+        finished = time.time()
+        for wallet in due:
+            if wallet in self.wallets:
+                self.record_result(wallet, rows_by_wallet.get(wallet), finished)
+
+        self.totals['batches'] += 1
+        self.totals['fetch_seconds'] += fetch_seconds
+
+        if self.results_path:
+            self.append_results(rows)
+        self.save_state()
+        return rows
+
+    def run_forever(self, idle_sleep=5):
+        """
+        Keep refreshing due wallets until interrupted
+        """
+        print(f"🗓️ Scheduling {len(self.wallets)} wallets "
+              f"(refresh every {self.min_interval / 60:.0f}-{self.max_interval / 60:.0f} min)")
+        try:
+            while True:
+                rows = self.run_once()
+                if rows:
+                    self.print_metrics()
+                else:
+                    time.sleep(idle_sleep)
+        except KeyboardInterrupt:
+            self.save_state()
+            print("\n👋 Scheduler stopped, queue saved")
+
+    def metrics(self, window=3600):
+        """
+        Throughput and freshness numbers for monitoring
+        """
+        now = time.time()
+        while self.refresh_times and self.refresh_times[0] < now - window:
+            self.refresh_times.popleft()
+
+        entries = self.wallets.values()
+        overdue = [now - e['next_due'] for e in entries if e['next_due'] < now]
+        stale_past_max = [
+            e for e in entries
+            if e['last_refresh'] is None or now - e['last_refresh'] > self.max_interval
+        ]
+        refreshed = self.totals['refreshes'] - self.totals['errors']
+
+        return {
+            'wallets': len(self.wallets),
+            'due_now': len(overdue),
+            'max_overdue_seconds': round(max(overdue), 1) if overdue else 0,
+            'past_max_interval': len(stale_past_max),
+            'refreshes_total': self.totals['refreshes'],
+            'errors_total': self.totals['errors'],
+            'wallets_per_min': round(len(self.refresh_times) / (window / 60), 2),
+            'avg_fetch_seconds_per_wallet': round(self.totals['fetch_seconds'] / max(self.totals['refreshes'], 1), 2),
+            'avg_staleness_at_refresh': round(self.totals['staleness_seconds'] / max(refreshed, 1), 1),
+        }
+
+    def print_metrics(self):
+        stats = self.metrics()
+        print(f"📈 {stats['refreshes_total']} refreshes ({stats['errors_total']} errors), "
+              f"{stats['wallets_per_min']} wallets/min, {stats['due_now']} due, "
+              f"max overdue {stats['max_overdue_seconds']:.0f}s")
+        if stats['past_max_interval']:
+            print(f"   ⚠️ {stats['past_max_interval']} wallets older than the max refresh interval "
+                  f"- add workers or raise the batch size")
+
+    def append_results(self, rows):
+        """
+        Append fetched rows to the results CSV
+        """
+        columns = ['wallet', 'timestamp', 'net_worth', 'holdings_pnl', 'jup_holdings', 'status']
+        new_file = not os.path.exists(self.results_path)
+        with open(self.results_path, 'a', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=columns, extrasaction='ignore')
+            if new_file:
+                writer.writeheader()
+            writer.writerows(rows)
+
+    def save_state(self):
+        """
+        Write the watchlist and counters to JSON (atomically)
+        """
+        state = {
+            'saved_at': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'wallets': self.wallets,
+            'totals': self.totals,
+        }
+        temp_path = f"{self.state_path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(temp_path, self.state_path)
+
+    def load_state(self):
+        """
+        Restore the watchlist from JSON and rebuild the heap
+        """
+        with open(self.state_path) as f:
+            state = json.load(f)
+        self.wallets = state['wallets']
+        self.totals.update(state.get('totals', {}))
+        self.heap = [(entry['next_due'], wallet) for wallet, entry in self.wallets.items()]
+        heapq.heapify(self.heap)
+        print(f"📂 Restored {len(self.wallets)} wallets from {self.state_path}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Keep a watchlist of wallets fresh")
+    parser.add_argument('--wallets', help="text file with one wallet address per line")
+    parser.add_argument('--state', default=DEFAULT_STATE_PATH, help="queue state file (JSON)")
+    parser.add_argument('--results', help="append every fetched row to this CSV")
+    parser.add_argument('--batch-size', type=int, default=20)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--tabs', type=int, default=1)
+    parser.add_argument('--once', action='store_true', help="fetch one batch and exit")
+    args = parser.parse_args()
+
+    scheduler = TrackingScheduler(
+        args.state,
+        fetch_batch=lambda wallets: fetch_with_tracker(wallets, workers=args.workers, tabs=args.tabs),
+        batch_size=args.batch_size,
+        results_path=args.results
+    )
+
+    if args.wallets:
+        with open(args.wallets) as f:
+            wallets = [line.strip() for line in f if line.strip() and not line.startswith('#')]
+        print(f"➕ Added {scheduler.add_wallets(wallets)} new wallets")
+        scheduler.save_state()
+
+    if args.once:
+        scheduler.run_once()
+        scheduler.print_metrics()
+    else:
+        scheduler.run_forever()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Parse Jupiter-formatted amounts and percentages, one value or whole columns
+
+Understands everything the portfolio page shows: '$2,232,456.59',
+'+$1.22K', '-$50.1K', '$1.88M', '$3B', '1.86e-11%', '(+109.33%)' and
+multiples like '+14x' (= +1400%). 'N/A', 'ERROR', '-' and empty cells
+become the missing value. parse_values() works on a pandas Series or NumPy
+array with vectorized string operations instead of a Python loop per row.
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# Optional brackets, sign before or after '$', number (with exponent), suffix, '%'
+VALUE_PATTERN = r'^\(?([+-]?)\$?([+-]?)(\d*\.?\d+(?:[eE][+-]?\d+)?)([KMBTx]?)%?\)?$'
+VALUE_REGEX = re.compile(VALUE_PATTERN)
+
+SUFFIX_FACTORS = {'': 1.0, 'K': 1e3, 'M': 1e6, 'B': 1e9, 'T': 1e12, 'x': 100.0}
+
+def parse_value(text, missing=None):
+    """
+    One value as float: '+$1.22K' -> 1220.0, '(+109.33%)' -> 109.33
+
+    Returns missing for sentinels ('N/A', 'ERROR', '-', ...) and anything
+    that isn't a number.
+    """
+    if text is None or isinstance(text, float) and np.isnan(text):
+        return missing
+    if isinstance(text, (int, float)):
+        return float(text)
+    match = VALUE_REGEX.match(str(text).replace(',', '').replace(' ', ''))
+    if not match:
+        return missing
+    sign_before, sign_after, number, suffix = match.groups()
+    value = float(number) * SUFFIX_FACTORS[suffix]
+    return -value if '-' in (sign_before, sign_after) else value
+
+def parse_distinct(series, missing):
+    """
+    String-column version of parse_value (plain literal string ops, no per-row Python)
+    """
+    text = series.astype(str).str.replace(',', '', regex=False).str.replace(' ', '', regex=False)
+    valid = text.str.fullmatch(VALUE_PATTERN).to_numpy(dtype=bool, na_value=False)
+    negative = text.str.match(r'\(?\$?-').to_numpy(dtype=bool, na_value=False)
+
+    body = text.str.rstrip('%)')
+    factors = body.str[-1].map(SUFFIX_FACTORS).fillna(1.0).to_numpy(dtype=float)
+    numbers = body.str.lstrip('(+-$').str.rstrip('KMBTx').where(valid).astype('float64').to_numpy()
+
+    result = np.where(negative, -numbers, numbers) * factors
+    return np.where(valid, result, missing)
+
+def parse_values(values, missing=np.nan):
+    """
+    Vectorized parse_value for a Series (keeps its index) or array / list (returns an array)
+    """
+    series = values if isinstance(values, pd.Series) else pd.Series(np.asarray(values, dtype=object))
+
+    # Histories repeat values a lot ('N/A', unchanged balances): parse each distinct one once
+    codes, uniques = pd.factorize(series, use_na_sentinel=True)
+    if len(uniques) < len(series) // 2:
+        parsed = parse_distinct(pd.Series(uniques, dtype=object), missing)
+        # Only index with real codes: -1 (NaN) would wrap around, or fail if all are NaN
+        known = codes >= 0
+        result = np.full(len(series), missing, dtype='float64')
+        result[known] = parsed[codes[known]]
+    else:
+        result = parse_distinct(series, missing)
+
+    if isinstance(values, pd.Series):
+        return pd.Series(result, index=values.index, name=values.name)
+    return result
+
+if __name__ == "__main__":
+    import time
+
+    samples = ['$2,232,456.59', '+$1.22K', '-$50.1K', '$1.88M', '$3B', '1.86e-11%',
+               '(+109.33%)', '+14x', 'N/A', 'ERROR', '-']
+    for sample, value in zip(samples, parse_values(samples)):
+        print(f"{sample:>15} -> {value}")
+
+    column = pd.Series(samples * 100_000)
+    start_time = time.time()
+    parse_values(column)
+    vectorized = time.time() - start_time
+    start_time = time.time()
+    [parse_value(sample) for sample in column]
+    per_row = time.time() - start_time
+    print(f"\n{len(column):,} values: vectorized {vectorized:.2f}s, per row {per_row:.2f}s")
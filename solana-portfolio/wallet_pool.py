@@ -0,0 +1,203 @@
+#!/usr/bin/env python3
+"""
+Process pool of headless Chrome workers for tracking many wallets in parallel
+"""
+
+import math
+import multiprocessing
+import os
+import shutil
+import signal
+import time
+from multiprocessing.util import Finalize
+
+from browser_setup import create_driver
+from browser_profiles import remove_temp_profiles, temp_profiles
+from click_strategies import flush_strategy_stats
+from fetch_retry import make_error_row, fetch_with_retry
+from driver_recycling import DriverRecycler, browser_pids, export_memory_samples
+
+# Each worker process owns exactly one driver (recycled when it grows too big)
+worker_driver = None
+worker_recycler = None
+
+# Shared dict {worker pid: (browser pids, temp profile dirs)}; pool.terminate()
+# skips the workers' Finalize, so the parent cleans up from this
+worker_browsers = None
+reported_driver = None
+
+def init_worker(driver_settings, browsers=None):
+    """
+    Start the Chrome driver for this worker process
+    """
+    global worker_driver, worker_recycler, worker_browsers
+    worker_recycler = DriverRecycler(driver_settings, worker=f"pool-{os.getpid()}")
+    worker_browsers = browsers
+
+    # Quit Chrome when the pool shuts the worker down
+    Finalize(None, quit_worker_driver, exitpriority=16)
+
+    # An initializer that raises makes the pool respawn the worker forever;
+    # fetch_in_worker creates the driver lazily and reports the error per wallet
+    try:
+        worker_driver = create_driver(**driver_settings)
+    except Exception as e:
+        print(f"⚠️ Worker could not start Chrome: {e}")
+        worker_driver = None
+    report_worker_browser()
+
+def report_worker_browser():
+    """
+    Tell the parent which Chrome processes and temp profiles this worker has now
+    """
+    global reported_driver
+    if worker_browsers is None or worker_driver is reported_driver:
+        return
+    pids = browser_pids(worker_driver) if worker_driver is not None else []
+    worker_browsers[os.getpid()] = (pids, sorted(temp_profiles))
+    reported_driver = worker_driver
+
+def quit_worker_driver():
+    """
+    Close the worker's driver, ignoring errors from an already dead browser
+    """
+    global worker_driver
+    if worker_driver is not None:
+        try:
+            worker_driver.quit()
+        except Exception:
+            pass
+        worker_driver = None
+    # Pool workers skip atexit handlers, so temp profiles are removed and
+    # click stats saved here
+    remove_temp_profiles()
+    flush_strategy_stats()
+    report_worker_browser()
+
+def fetch_in_worker(fetch_function, wallet_address, driver_settings, error_columns):
+    """
+    Run one wallet fetch inside a worker, restarting the driver if it died
+
+    Returns the row and the worker's new memory samples (see driver_recycling.py).
+    """
+    global worker_driver
+
+    try:
+        if worker_driver is None:
+            worker_driver = create_driver(**driver_settings)
+        row, worker_driver = fetch_with_retry(fetch_function, wallet_address, worker_driver, driver_settings)
+        # Cache hits didn't load a page
+        if worker_recycler is not None and row.get('cache') != 'hit':
+            worker_driver = worker_recycler.check(worker_driver)
+        report_worker_browser()
+        return row, take_worker_samples()
+
+    except Exception as e:
+        # Don't let one broken browser take the whole worker down
+        quit_worker_driver()
+        return make_error_row(wallet_address, e, error_columns), take_worker_samples()
+
+def take_worker_samples():
+    return worker_recycler.take_samples() if worker_recycler is not None else []
+
+def kill_worker_browsers(browsers):
+    """
+    Kill the Chrome processes and delete the temp profiles of terminated workers
+    """
+    kill_signal = getattr(signal, 'SIGKILL', signal.SIGTERM)
+    for pids, profile_dirs in browsers.values():
+        for pid in pids:
+            try:
+                os.kill(pid, kill_signal)
+            except OSError:
+                pass
+        for profile_dir in profile_dirs:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+
+def terminate_pool(pool, browsers):
+    """
+    Stop all workers now, without leaving their Chrome processes behind
+    """
+    pool.terminate()
+    pool.join()
+    try:
+        kill_worker_browsers(dict(browsers))
+    except (OSError, EOFError):
+        print("⚠️ Could not read the workers' browser PIDs, Chrome may be left running")
+
+def track_wallets_in_pool(wallet_addresses, fetch_function, workers=4,
+                          driver_settings=None, error_columns=(), task_timeout=300,
+                          memory_log_path=None):
+    """
+    Fetch wallets with a pool of browser processes
+
+    driver_settings are keyword arguments for browser_setup.create_driver.
+    Results come back in the same order as wallet_addresses. A wallet that
+    fails or is still unfinished when the batch deadline (task_timeout per
+    round of `workers` wallets) is over gets an error row instead of stopping
+    the rest of the batch. Every worker recycles its driver when
+    it gets too big; memory_log_path saves all workers' RSS over time as CSV.
+    """
+    driver_settings = driver_settings or {}
+    workers = max(1, min(workers, len(wallet_addresses)))
+    print(f"🧵 Starting {workers} browser workers for {len(wallet_addresses)} wallets...")
+
+    manager = multiprocessing.Manager()
+    browsers = manager.dict()
+    pool = multiprocessing.Pool(
+        processes=workers,
+        initializer=init_worker,
+        initargs=(driver_settings, browsers)
+    )
+    terminated = False
+
+    try:
+        pending = [
+            pool.apply_async(
+                fetch_in_worker,
+                (fetch_function, wallet, driver_settings, error_columns)
+            )
+            for wallet in wallet_addresses
+        ]
+
+        # One deadline for the batch: a hung wallet doesn't add its timeout to every later one
+        deadline = time.time() + task_timeout * math.ceil(len(wallet_addresses) / workers)
+        results = []
+        memory_samples = []
+        timed_out = False
+        for i, (wallet, task) in enumerate(zip(wallet_addresses, pending), 1):
+            try:
+                row, samples = task.get(timeout=max(0, deadline - time.time()))
+                results.append(row)
+                memory_samples.extend(samples)
+            except multiprocessing.TimeoutError:
+                print(f"❌ Worker timed out on wallet {wallet[:8]}")
+                results.append(make_error_row(wallet, 'worker timeout', error_columns))
+                timed_out = True
+            except Exception as e:
+                print(f"❌ Worker failed on wallet {wallet[:8]}: {e}")
+                results.append(make_error_row(wallet, e, error_columns))
+
+            print(f"[{i}/{len(wallet_addresses)}] Collected wallet {wallet[:8]}...")
+
+        # A hung worker would block close() forever
+        if timed_out:
+            terminate_pool(pool, browsers)
+            terminated = True
+        else:
+            pool.close()
+
+    except BaseException:
+        terminate_pool(pool, browsers)
+        terminated = True
+        raise
+
+    finally:
+        if not terminated:
+            pool.join()
+        manager.shutdown()
+
+    if memory_log_path:
+        export_memory_samples(memory_samples, memory_log_path)
+
+    return results